@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from .models import User
+from .tokens import InvalidToken, verify_access_token
+
+PRINCIPAL_QUERY_RELATED = ("jobseekerprofile", "employerprofile")
+
+
+class Principal:
+    """
+    The authenticated caller: user plus the ids views need to scope queries.
+
+    ``seeker_id``/``employer_id`` are the JobSeekerProfile/EmployerProfile
+    primary keys, ``company_id`` the employer's company. Any of them is None
+    when the user has no such profile.
+    """
+
+    def __init__(self, user=None, seeker_id=None, employer_id=None, company_id=None):
+        self.user = user
+        self.seeker_id = seeker_id
+        self.employer_id = employer_id
+        self.company_id = company_id
+
+    @property
+    def role(self):
+        return self.user.role if self.user is not None else None
+
+    @classmethod
+    def for_user(cls, user):
+        # Reads the reverse one-to-ones, so load user with PRINCIPAL_QUERY_RELATED
+        seeker = getattr(user, "jobseekerprofile", None)
+        employer = getattr(user, "employerprofile", None)
+        return cls(
+            user=user,
+            seeker_id=seeker.pk if seeker else None,
+            employer_id=employer.pk if employer else None,
+            company_id=employer.company_id if employer else None,
+        )
+
+
+ANONYMOUS = Principal()
+
+
+class PrincipalCache:
+    """Bounded LRU of Principal by user id, entries expire after ``timeout`` seconds."""
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            principal, expires = entry
+            if expires < time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return principal
+
+    def set(self, user_id, principal):
+        with self.lock:
+            self.entries[user_id] = (principal, time.monotonic() + self.timeout)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+principal_cache = PrincipalCache(
+    getattr(settings, "PRINCIPAL_CACHE_SIZE", 10000),
+    getattr(settings, "PRINCIPAL_CACHE_TIMEOUT", 60),
+)
+
+
+def resolve_principal(user_id):
+    """Return the cached Principal of an active user, loading it with one query on a miss."""
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = User.objects.select_related(*PRINCIPAL_QUERY_RELATED).filter(pk=user_id, is_active=True).first()
+        if user is None:
+            return None
+        principal = Principal.for_user(user)
+        principal_cache.set(user_id, principal)
+    return principal
+
+
+async def aresolve_principal(user_id):
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = await User.objects.select_related(*PRINCIPAL_QUERY_RELATED).filter(pk=user_id, is_active=True).afirst()
+        if user is None:
+            return None
+        principal = Principal.for_user(user)
+        principal_cache.set(user_id, principal)
+    return principal
+
+
+def get_principal(request):
+    """
+    Principal of a DRF request: the one TokenAuthentication attached, or the
+    cached one for users authenticated another way (session, basic auth).
+    """
+    if isinstance(request.auth, Principal):
+        return request.auth
+    if not request.user.is_authenticated:
+        return ANONYMOUS
+    return resolve_principal(request.user.pk) or ANONYMOUS
+
+
+class TokenAuthentication(BaseAuthentication):
+    """
+    ``Authorization: Bearer <access token>`` authentication.
+
+    Sets ``request.user`` to the token's user and ``request.auth`` to its
+    Principal; neither costs a query while the principal is cached.
+    """
+    keyword = "Bearer"
+
+    def get_token(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed("Invalid token header")
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed("Invalid token header")
+
+    def user_id(self, token):
+        try:
+            return verify_access_token(token)
+        except InvalidToken as exc:
+            raise exceptions.AuthenticationFailed(str(exc))
+
+    def authenticate(self, request):
+        token = self.get_token(request)
+        if token is None:
+            return None
+        principal = resolve_principal(self.user_id(token))
+        if principal is None:
+            raise exceptions.AuthenticationFailed("User inactive or deleted")
+        return principal.user, principal
+
+    async def aauthenticate(self, request):
+        token = self.get_token(request)
+        if token is None:
+            return None
+        principal = await aresolve_principal(self.user_id(token))
+        if principal is None:
+            raise exceptions.AuthenticationFailed("User inactive or deleted")
+        return principal.user, principal
+
+    def authenticate_header(self, request):
+        return self.keyword
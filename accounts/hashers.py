@@ -0,0 +1,82 @@
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.contrib.auth.hashers import must_update_salt
+
+# Work factors per hasher profile (PASSWORD_HASHER_PROFILE). Parameters not
+# listed keep Django's defaults. Raising a profile makes check_password()
+# rehash each stored password with the new parameters at its next login;
+# lowering one leaves stronger hashes alone.
+HASHER_PROFILES = {
+    "default": {},
+    # Never below Django 5.2's defaults
+    "interactive": {
+        "argon2": {"time_cost": 2, "memory_cost": 102400, "parallelism": 8},
+        "bcrypt_sha256": {"rounds": 12},
+        "pbkdf2_sha256": {"iterations": 1000000},
+    },
+    # Never in production: for tests and local fixtures
+    "fast": {
+        "argon2": {"time_cost": 1, "memory_cost": 1024, "parallelism": 1},
+        "bcrypt_sha256": {"rounds": 4},
+        "pbkdf2_sha256": {"iterations": 1000},
+    },
+}
+
+
+class ProfiledHasherMixin:
+    def cost(self, name):
+        profile = HASHER_PROFILES[getattr(settings, "PASSWORD_HASHER_PROFILE", "default")]
+        return profile.get(self.algorithm, {}).get(name, getattr(super(), name))
+
+
+class Argon2PasswordHasher(ProfiledHasherMixin, hashers.Argon2PasswordHasher):
+    time_cost = property(lambda self: self.cost("time_cost"))
+    memory_cost = property(lambda self: self.cost("memory_cost"))
+    parallelism = property(lambda self: self.cost("parallelism"))
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        current, target = decoded["params"], self.params()
+        if (current.type, current.version, current.hash_len) != (target.type, target.version, target.hash_len):
+            return True
+        weaker = current.time_cost < target.time_cost or current.memory_cost < target.memory_cost
+        return weaker or must_update_salt(decoded["salt"], self.salt_entropy)
+
+
+class BCryptSHA256PasswordHasher(ProfiledHasherMixin, hashers.BCryptSHA256PasswordHasher):
+    rounds = property(lambda self: self.cost("rounds"))
+
+    def must_update(self, encoded):
+        return self.decode(encoded)["work_factor"] < self.rounds
+
+
+class PBKDF2PasswordHasher(ProfiledHasherMixin, hashers.PBKDF2PasswordHasher):
+    iterations = property(lambda self: self.cost("iterations"))
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return decoded["iterations"] < self.iterations or must_update_salt(decoded["salt"], self.salt_entropy)
+
+
+# Preferred first; hashers whose library is missing are left out
+PREFERRED_HASHERS = (
+    ("accounts.hashers.Argon2PasswordHasher", "argon2"),
+    ("accounts.hashers.BCryptSHA256PasswordHasher", "bcrypt"),
+    ("accounts.hashers.PBKDF2PasswordHasher", None),
+)
+# Still verify (and upgrade on login) hashes made by Django's other defaults
+LEGACY_HASHERS = (
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+)
+
+
+def password_hashers():
+    """
+    Value for the PASSWORD_HASHERS setting: Argon2, else bcrypt, else PBKDF2
+    for new hashes, depending on which libraries are installed.
+    """
+    available = [path for path, library in PREFERRED_HASHERS if library is None or find_spec(library)]
+    return available + list(LEGACY_HASHERS)
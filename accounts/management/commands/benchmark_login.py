@@ -0,0 +1,89 @@
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import User
+from accounts.throttling import login_limiter
+from accounts.views import LoginView
+
+BENCHMARK_EMAIL = "benchmark-login@example.com"
+
+
+class Command(BaseCommand):
+    help = (
+        "Time legitimate logins on their own and during a credential stuffing "
+        "flood, with and without the login throttle"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=20, help="Legitimate logins timed per scenario")
+        parser.add_argument("--attackers", type=int, default=8, help="Threads sending bad credentials")
+        parser.add_argument("--attacker-ips", type=int, default=4)
+        parser.add_argument("--warmup", type=float, default=10.0,
+                            help="Seconds the flood runs before timing starts, past the throttle burst")
+
+    def handle(self, *args, **options):
+        self.factory = APIRequestFactory()
+        self.view = LoginView.as_view()
+        user = User.objects.create_user(username=BENCHMARK_EMAIL, email=BENCHMARK_EMAIL, password="benchmark")
+        try:
+            self.stdout.write("hashers: %s, profile %s" % (
+                settings.PASSWORD_HASHERS[0].rsplit(".", 1)[-1], getattr(settings, "PASSWORD_HASHER_PROFILE", "default")))
+            self.report("normal load", self.run(options, attack=False, throttle=True))
+            self.report("under attack, no throttle", self.run(options, attack=True, throttle=False))
+            self.report("under attack, throttled", self.run(options, attack=True, throttle=True))
+        finally:
+            user.delete()
+            login_limiter.clear()
+
+    def login(self, email, password, ip):
+        request = self.factory.post("/login/", {"email": email, "password": password}, REMOTE_ADDR=ip)
+        return self.view(request).status_code
+
+    def run(self, options, attack, throttle):
+        login_limiter.clear()
+        original = LoginView.throttle_classes
+        if not throttle:
+            LoginView.throttle_classes = []
+        stop = threading.Event()
+        attempts = {"total": 0, "rejected": 0}
+        lock = threading.Lock()
+
+        def attacker(number):
+            rng = random.Random(number)
+            ip = "10.0.0.%d" % (number % options["attacker_ips"] + 1)
+            while not stop.is_set():
+                code = self.login("victim%d@example.com" % rng.randrange(10 ** 6), "guess", ip)
+                with lock:
+                    attempts["total"] += 1
+                    attempts["rejected"] += code == 429
+
+        threads = [threading.Thread(target=attacker, args=(number,)) for number in range(options["attackers"] if attack else 0)]
+        try:
+            for thread in threads:
+                thread.start()
+            if attack:
+                time.sleep(options["warmup"])
+            timings = []
+            for number in range(options["logins"]):
+                start = time.perf_counter()
+                self.login(BENCHMARK_EMAIL, "benchmark", "192.168.0.%d" % (number + 1))
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            LoginView.throttle_classes = original
+        return sorted(timings), attempts
+
+    def report(self, label, result):
+        timings, attempts = result
+        line = "%-28s p50 %7.1f ms  p95 %7.1f ms  max %7.1f ms" % (
+            label, timings[len(timings) // 2], timings[int(len(timings) * 0.95)], timings[-1])
+        if attempts["total"]:
+            line += "  (%d attack attempts, %d rejected)" % (attempts["total"], attempts["rejected"])
+        self.stdout.write(line)
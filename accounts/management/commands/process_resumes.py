@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.models import Resume
+from accounts.resumes import expire_uploads, process_now, skill_vocabulary
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract text and skills from stored resumes left pending (e.g. by a "
+        "restart) and discard stale unfinished uploads"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retry-failed", action="store_true", help="Also retry resumes that failed before")
+        parser.add_argument("--all", action="store_true", help="Re-extract every resume, e.g. after the skill list grew")
+        parser.add_argument("--expire-hours", type=int, default=24, help="Age at which unfinished uploads are discarded")
+
+    def handle(self, *args, **options):
+        resumes = Resume.objects.all()
+        if not options["all"]:
+            resumes = resumes.filter(status__in=["pending", "failed"] if options["retry_failed"] else ["pending"])
+        vocabulary = skill_vocabulary()
+        processed = 0
+        for resume in resumes.iterator():
+            process_now(resume, vocabulary)
+            processed += 1
+
+        expired = expire_uploads(timezone.now() - timedelta(hours=options["expire_hours"]))
+        self.stdout.write(self.style.SUCCESS("Processed %d resumes, discarded %d stale uploads" % (processed, expired)))
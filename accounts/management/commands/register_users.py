@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.registration import register_users
+from jobs.importer import ImportFormatError, detect_format, iter_rows
+
+
+class Command(BaseCommand):
+    help = "Register users with their profiles from a CSV or JSONL file (email, password, role, experience, company, position)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "jsonl"])
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--processes", type=int, help="Password hashing processes, defaults to the CPU count")
+
+    def handle(self, *args, **options):
+        try:
+            fmt = detect_format(options["path"], options["format"])
+        except ImportFormatError as exc:
+            raise CommandError(str(exc))
+
+        with open(options["path"], "rb") as stream:
+            rows = [data for _, data in iter_rows(stream, fmt)]
+        report = register_users(rows, chunk_size=options["chunk_size"], processes=options["processes"])
+
+        for error in report["errors"]:
+            self.stderr.write("row %(row)s: %(errors)s" % error)
+        self.stdout.write(self.style.SUCCESS("Registered %(created)d users, %(failed)d rows failed" % report))
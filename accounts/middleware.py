@@ -0,0 +1,48 @@
+from asgiref.sync import iscoroutinefunction
+from django.utils.decorators import sync_and_async_middleware
+from django.utils.functional import SimpleLazyObject
+
+from .authentication import resolve_principal
+from .models import EmployerProfile, JobSeekerProfile
+
+
+def get_profile(request):
+    """
+    Role profile of the request's user, with its user (and company for
+    employers) loaded in the same query; None without one.
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return None
+    principal = resolve_principal(user.pk)
+    if principal is None:
+        return None
+    if principal.role == "employer" and principal.employer_id is not None:
+        return EmployerProfile.objects.select_related("user", "company").get(pk=principal.employer_id)
+    if principal.role == "job_seeker" and principal.seeker_id is not None:
+        return JobSeekerProfile.objects.select_related("user", "resume_content").get(pk=principal.seeker_id)
+    return None
+
+
+@sync_and_async_middleware
+def ProfileMiddleware(get_response):
+    """
+    Expose the caller's role profile as ``request.profile``.
+
+    Resolved lazily on first access, so requests that never touch it cost
+    nothing, and at most once per request. Evaluated after DRF has
+    authenticated the request, so token users are seen too. A missing
+    profile is falsy (``if not request.profile``).
+    """
+    def attach(request):
+        request.profile = SimpleLazyObject(lambda: get_profile(request))
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            attach(request)
+            return await get_response(request)
+    else:
+        def middleware(request):
+            attach(request)
+            return get_response(request)
+    return middleware
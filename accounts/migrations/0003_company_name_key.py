@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+def fill_name_key(apps, schema_editor):
+    # Historical models have no custom save(); same rule as company_name_key()
+    Company = apps.get_model('accounts', 'Company')
+    companies = list(Company.objects.only('id', 'name'))
+    for company in companies:
+        company.name_key = ' '.join(company.name.split()).casefold()
+    Company.objects.bulk_update(companies, ['name_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_resume_pipeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='name_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_name_key, migrations.RunPython.noop),
+    ]
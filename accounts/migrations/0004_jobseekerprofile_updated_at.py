@@ -0,0 +1,22 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_company_name_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobseekerprofile",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="jobseekerprofile",
+            index=models.Index(fields=["updated_at"], name="seeker_updated_idx"),
+        ),
+    ]
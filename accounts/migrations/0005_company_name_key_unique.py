@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+def separate_duplicates(apps, schema_editor):
+    # Companies that already share a key stay separate: the oldest keeps it
+    # and is the one registration matches, the others get their id appended
+    Company = apps.get_model("accounts", "Company")
+    duplicates = (
+        Company.objects.values("name_key").annotate(count=models.Count("id")).filter(count__gt=1)
+        .values_list("name_key", flat=True)
+    )
+    for key in list(duplicates):
+        for company in Company.objects.filter(name_key=key).order_by("id")[1:]:
+            company.name_key = "%s#%d" % (key, company.id)
+            company.save(update_fields=["name_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_jobseekerprofile_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(separate_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="company",
+            name="name_key",
+            field=models.CharField(default="", editable=False, max_length=255, unique=True),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 
@@ -14,27 +16,108 @@ EXPERIENCE_CHOICES = (
 class User(AbstractUser):
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='job_seeker')
     profile_completed = models.BooleanField(default=False)
+    # Moves with every new password but not with hash upgrades on login;
+    # refresh tokens and calendar feed URLs are bound to it (accounts.tokens)
+    credentials_version = models.PositiveIntegerField(default=0)
+
+    def save(self, *args, **kwargs):
+        # _password is only set by set_password(); check_password() clears it
+        # before saving a rehash of the same password.
+        if self._password is not None:
+            self.credentials_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'credentials_version' not in update_fields:
+                kwargs['update_fields'] = [*update_fields, 'credentials_version']
+        super().save(*args, **kwargs)
+
+
+RESUME_STATUS_CHOICES = (
+    ('pending', 'Pending'),
+    ('done', 'Done'),
+    ('failed', 'Failed'),
+)
+
+
+class Resume(models.Model):
+    """
+    A stored resume file, addressed by the SHA-256 of its content so
+    identical uploads share one file and one text extraction.
+    """
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    file = models.FileField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=100, blank=True)
+    status = models.CharField(max_length=10, choices=RESUME_STATUS_CHOICES, default='pending', db_index=True)
+    text = models.TextField(blank=True)
+    # Comma separated skill tokens found in text, in jobs.skills form
+    skills = models.TextField(blank=True)
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    extracted_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.sha256
 
 
 class JobSeekerProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     experience_level = models.CharField(max_length=20, choices=EXPERIENCE_CHOICES)
     resume = models.FileField(upload_to="resumes/", null=True, blank=True)
+    resume_content = models.ForeignKey(Resume, null=True, blank=True, on_delete=models.SET_NULL, related_name="profiles")
     skills = models.TextField(null=True, blank=True)
     education = models.TextField(null=True, blank=True)
     projects = models.TextField(null=True, blank=True)
     certifications = models.TextField(null=True, blank=True)
+    # Lets other processes' matching engines re-read changed seekers (jobs.matching)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"], name="seeker_updated_idx")]
 
     def __str__(self):
         return self.user.username
 
+    @property
+    def matching_skills(self):
+        """Listed skills plus those extracted from the resume, comma separated."""
+        resume_skills = self.resume_content.skills if self.resume_content_id else ""
+        return ",".join(filter(None, [self.skills, resume_skills]))
+
+
+class ResumeUpload(models.Model):
+    """An in-progress resumable upload; bytes accumulate in a part file."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    seeker = models.ForeignKey(JobSeekerProfile, on_delete=models.CASCADE, related_name="resume_uploads")
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+def normalize_company_name(name):
+    """Display form of a company name; its casefold() is the dedupe key."""
+    return ' '.join(name.split())
+
+def company_name_key(name):
+    return normalize_company_name(name).casefold()
 
 class Company(models.Model):
     name = models.CharField(max_length=255)
+    # company_name_key(name): matches "Acme  Inc" to "ACME Inc" with an
+    # index lookup (accounts.registration); one company per key
+    name_key = models.CharField(max_length=255, unique=True, editable=False, default='')
     industry = models.CharField(max_length=100, blank=True)
     size = models.CharField(max_length=50, blank=True)
     verified = models.BooleanField(default=False)
 
+    def save(self, *args, **kwargs):
+        self.name_key = company_name_key(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields and 'name_key' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'name_key']
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
@@ -0,0 +1,145 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+
+from .models import Company, EmployerProfile, JobSeekerProfile, User, company_name_key, normalize_company_name
+from .serializers import RegistrationSerializer
+from .signals import profiles_registered
+
+MAX_REPORTED_ERRORS = 1000
+# Below this many passwords a process pool costs more than it saves
+POOL_THRESHOLD = 64
+
+
+def _init_worker():
+    # Spawned (non-fork) workers start without configured apps
+    django.setup()
+
+
+def hash_passwords(passwords, processes=None):
+    """make_password() for every password, spread over a process pool for large batches."""
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(passwords) < POOL_THRESHOLD:
+        return [make_password(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (processes * 4))))
+
+
+def get_or_create_companies(names):
+    """
+    Map each company name to a Company, matching existing rows and each other
+    by Company.name_key: one lookup query, plus an insert and a re-fetch when
+    some are new. name_key is unique, so a company created concurrently is
+    skipped by the insert and picked up by the re-fetch.
+    """
+    wanted = {}
+    for name in names:
+        wanted.setdefault(company_name_key(name), normalize_company_name(name))
+    if not wanted:
+        return {}
+
+    companies = {}
+    for company in Company.objects.filter(name_key__in=list(wanted)).order_by("id"):
+        companies.setdefault(company.name_key, company)
+    # bulk_create() skips Company.save(), which sets name_key
+    missing = [Company(name=display, name_key=key) for key, display in wanted.items() if key not in companies]
+    if missing:
+        Company.objects.bulk_create(missing, ignore_conflicts=True)
+        for company in Company.objects.filter(name_key__in=[company.name_key for company in missing]):
+            companies[company.name_key] = company
+    return {name: companies[company_name_key(name)] for name in names}
+
+
+def _create_chunk(entries):
+    """Insert one chunk of validated entries; returns (users, seekers, employers)."""
+    # Created with the chunk, so a failed chunk leaves no orphan companies
+    companies = get_or_create_companies([data["company"] for data, _ in entries if data["role"] == "employer"])
+    # bulk_create() skips create_user(); usernames and emails come
+    # normalized from register_users()
+    users = User.objects.bulk_create([
+        User(username=data["username"], email=data["email"], password=password, role=data["role"])
+        for data, password in entries
+    ])
+    seekers, employers = [], []
+    for user, (data, _) in zip(users, entries):
+        if user.role == "job_seeker":
+            seekers.append(JobSeekerProfile(user=user, experience_level=data["experience"]))
+        else:
+            company = companies[data["company"]]
+            employers.append(EmployerProfile(user=user, company=company, position=data.get("position", "")))
+    seekers = JobSeekerProfile.objects.bulk_create(seekers)
+    employers = EmployerProfile.objects.bulk_create(employers)
+    return users, seekers, employers
+
+
+def register_users(rows, chunk_size=1000, processes=None):
+    """
+    Validate and register users with their role profiles.
+
+    Passwords are hashed in a process pool. Users and profiles are written
+    with bulk_create, one transaction per chunk, so a failing chunk leaves
+    no user without a profile. Companies are de-duplicated by normalized
+    name against existing rows and created with the chunk that needs them. Returns a report
+    in the shape of jobs.importer.import_jobs().
+    """
+    report = {"created": 0, "failed": 0, "errors": []}
+
+    def fail(number, errors):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": number, "errors": errors})
+
+    valid, seen = [], set()
+    for number, data in enumerate(rows, start=1):
+        serializer = RegistrationSerializer(data=data) if isinstance(data, dict) else None
+        if serializer is None or not serializer.is_valid():
+            fail(number, serializer.errors if serializer else {"non_field_errors": ["Invalid row"]})
+            continue
+        data = serializer.validated_data
+        # As create_user(username=email, email=email) would store them
+        data["username"] = User.normalize_username(data["email"])
+        data["email"] = User.objects.normalize_email(data["email"])
+        if data["username"] in seen:
+            fail(number, {"email": ["Duplicate in this batch."]})
+        else:
+            seen.add(data["username"])
+            valid.append((number, data))
+
+    taken = set()
+    for start in range(0, len(valid), chunk_size):
+        usernames = [data["username"] for _, data in valid[start:start + chunk_size]]
+        taken.update(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+    for number, data in valid:
+        if data["username"] in taken:
+            fail(number, {"email": ["A user with this email already exists."]})
+    valid = [(number, data) for number, data in valid if data["username"] not in taken]
+    report["errors"].sort(key=lambda error: error["row"])
+    if not valid:
+        return report
+
+    passwords = hash_passwords([data["password"] for _, data in valid], processes)
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        entries = [(data, password) for (_, data), password in zip(chunk, passwords[start:start + chunk_size])]
+        try:
+            with transaction.atomic():
+                users, seekers, employers = _create_chunk(entries)
+        except IntegrityError:
+            # An email registered concurrently; fall back to row by row
+            users, seekers, employers = [], [], []
+            for (number, data), entry in zip(chunk, entries):
+                try:
+                    with transaction.atomic():
+                        created = _create_chunk([entry])
+                except IntegrityError:
+                    fail(number, {"email": ["A user with this email already exists."]})
+                    continue
+                users += created[0]
+                seekers += created[1]
+                employers += created[2]
+        report["created"] += len(users)
+        profiles_registered.send(sender=User, seekers=seekers, employers=employers)
+    return report
@@ -0,0 +1,333 @@
+import hashlib
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from xml.etree import ElementTree
+
+import django
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import JobSeekerProfile, Resume, ResumeUpload
+from .signals import resume_processed
+
+RESUME_CONTENT_TYPES = {
+    "application/pdf": ".pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+    "text/plain": ".txt",
+}
+CHUNK_SIZE = 64 * 1024
+MAX_TEXT_LENGTH = 100000
+# Uncompressed size of a .docx body we are willing to parse; a small zip
+# can inflate to gigabytes
+MAX_DOCX_XML_SIZE = 20 * 1024 * 1024
+# Longest skill name, in words, looked up in the vocabulary
+MAX_SKILL_WORDS = 3
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_DOCX_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class ExtractionError(Exception):
+    pass
+
+
+def max_resume_size():
+    return getattr(settings, "RESUME_MAX_SIZE", 10 * 1024 * 1024)
+
+
+def upload_dir():
+    path = getattr(settings, "RESUME_UPLOAD_DIR", None) or os.path.join(tempfile.gettempdir(), "resume-uploads")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def part_path(upload):
+    return os.path.join(upload_dir(), "%s.part" % upload.pk)
+
+
+def content_address(sha256, content_type):
+    return "resumes/%s/%s%s" % (sha256[:2], sha256, RESUME_CONTENT_TYPES.get(content_type, ""))
+
+
+# Uploads
+
+def start_upload(seeker_id, filename, size, content_type):
+    if content_type not in RESUME_CONTENT_TYPES:
+        raise UploadError("Unsupported content type, expected one of: %s" % ", ".join(RESUME_CONTENT_TYPES))
+    if not 0 < size <= max_resume_size():
+        raise UploadError("Size must be between 1 and %d bytes" % max_resume_size())
+    upload = ResumeUpload.objects.create(seeker_id=seeker_id, filename=filename[:255], size=size, content_type=content_type)
+    open(part_path(upload), "wb").close()
+    return upload
+
+
+def write_chunk(upload, stream, offset, length):
+    """
+    Write up to ``length`` bytes from ``stream`` at ``offset`` of the part
+    file, reading CHUNK_SIZE at a time. Returns the new upload offset.
+
+    Chunks are written at their declared position, so a retried chunk
+    overwrites the same bytes instead of duplicating them. A client that
+    disconnects mid-chunk keeps what arrived and resumes from the offset
+    reported afterwards.
+    """
+    if offset != upload.offset:
+        raise UploadError("Upload-Offset %d does not match the server offset %d" % (offset, upload.offset), status=409)
+    if offset + length > upload.size:
+        raise UploadError("Chunk runs past the declared upload size")
+
+    written = 0
+    with open(part_path(upload), "r+b") as part:
+        part.seek(offset)
+        while written < length:
+            try:
+                chunk = stream.read(min(CHUNK_SIZE, length - written))
+            except OSError:
+                # Client went away; keep what was received
+                break
+            if not chunk:
+                break
+            part.write(chunk)
+            written += len(chunk)
+    # Compare-and-set, so a concurrent duplicate of this chunk cannot move
+    # the offset backwards.
+    ResumeUpload.objects.filter(pk=upload.pk, offset__lt=offset + written).update(offset=offset + written)
+    upload.refresh_from_db(fields=["offset"])
+    return upload.offset
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(partial(handle.read, CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def finish_upload(upload):
+    """
+    Move a complete upload into content-addressed storage and attach it to
+    the seeker's profile. Identical content is stored and extracted once;
+    new content is queued for text extraction after commit.
+    """
+    path = part_path(upload)
+    sha256 = _file_sha256(path)
+    with transaction.atomic():
+        resume = Resume.objects.filter(pk=sha256).first()
+        created = resume is None
+        if created:
+            name = content_address(sha256, upload.content_type)
+            if not default_storage.exists(name):
+                with open(path, "rb") as handle:
+                    name = default_storage.save(name, File(handle))
+            try:
+                with transaction.atomic():
+                    resume = Resume.objects.create(
+                        sha256=sha256, file=name, size=upload.size, content_type=upload.content_type)
+            except IntegrityError:
+                # The same content finished concurrently
+                resume, created = Resume.objects.get(pk=sha256), False
+        JobSeekerProfile.objects.filter(pk=upload.seeker_id).update(resume=resume.file.name, resume_content=resume)
+        upload.delete()
+        if created:
+            transaction.on_commit(partial(workers.submit, sha256))
+        elif resume.status != "pending":
+            # Extracted before; the profile takes on its skills now
+            transaction.on_commit(partial(resume_processed.send, sender=Resume, sha256=sha256))
+    os.remove(path)
+    return resume
+
+
+def discard_upload(upload):
+    try:
+        os.remove(part_path(upload))
+    except FileNotFoundError:
+        pass
+    upload.delete()
+
+
+def expire_uploads(before):
+    """Discard uploads started before ``before``; returns how many."""
+    expired = list(ResumeUpload.objects.filter(created_at__lt=before))
+    for upload in expired:
+        discard_upload(upload)
+    return len(expired)
+
+
+# Extraction
+
+def _docx_text(handle):
+    with zipfile.ZipFile(handle) as archive:
+        info = archive.getinfo("word/document.xml")
+        # file_size is only what the archive claims, so the read is capped too
+        if info.file_size > MAX_DOCX_XML_SIZE:
+            raise ExtractionError("Document too large to extract")
+        with archive.open(info) as member:
+            data = member.read(MAX_DOCX_XML_SIZE + 1)
+        if len(data) > MAX_DOCX_XML_SIZE:
+            raise ExtractionError("Document too large to extract")
+        root = ElementTree.fromstring(data)
+    paragraphs = (
+        "".join(node.text or "" for node in paragraph.iter(_DOCX_NS + "t"))
+        for paragraph in root.iter(_DOCX_NS + "p")
+    )
+    return "\n".join(paragraphs)
+
+
+def _pdf_text(handle):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ExtractionError("PDF extraction requires the pypdf package")
+    return "\n".join(page.extract_text() or "" for page in PdfReader(handle).pages)
+
+
+def extract_text(handle, content_type):
+    """Text of an open resume file."""
+    try:
+        if content_type == "application/pdf":
+            text = _pdf_text(handle)
+        elif content_type.endswith("wordprocessingml.document"):
+            text = _docx_text(handle)
+        else:
+            text = handle.read(MAX_TEXT_LENGTH * 4).decode("utf-8", errors="replace")
+    except ExtractionError:
+        raise
+    except Exception as exc:
+        raise ExtractionError("Could not read %s file: %s" % (RESUME_CONTENT_TYPES.get(content_type, "resume"), exc))
+    return text[:MAX_TEXT_LENGTH]
+
+
+def extract_skills(text, vocabulary):
+    """Vocabulary skills mentioned in ``text``, in order of first mention."""
+    words = [word.rstrip(".") for word in _WORD.findall(text.lower())]
+    found = {}
+    for size in range(1, MAX_SKILL_WORDS + 1):
+        for start in range(len(words) - size + 1):
+            phrase = " ".join(words[start:start + size])
+            if phrase in vocabulary:
+                found.setdefault(phrase, start)
+    return sorted(found, key=found.get)
+
+
+def process_resume(name, content_type, vocabulary):
+    """
+    Worker entry point: (text, skills) of the resume stored as ``name``.
+    Read through default_storage, which need not be on local disk; touches
+    no database.
+    """
+    try:
+        handle = default_storage.open(name, "rb")
+    except OSError as exc:
+        raise ExtractionError("Could not open stored resume: %s" % exc)
+    with handle:
+        text = extract_text(handle, content_type)
+    return text, extract_skills(text, vocabulary)
+
+
+def skill_vocabulary():
+    loader = getattr(settings, "RESUME_SKILL_VOCABULARY", None)
+    if not loader:
+        return frozenset()
+    names = import_string(loader)()
+    return names if isinstance(names, frozenset) else frozenset(names)
+
+
+def save_result(sha256, result=None, error=None):
+    if error is None:
+        text, skills = result
+        fields = {"status": "done", "text": text, "skills": ",".join(skills), "error": ""}
+    else:
+        fields = {"status": "failed", "error": str(error)[:255]}
+    Resume.objects.filter(pk=sha256).update(extracted_at=timezone.now(), **fields)
+    resume_processed.send(sender=Resume, sha256=sha256)
+
+
+def process_now(resume, vocabulary=None):
+    """Extract ``resume`` in the calling thread."""
+    vocabulary = skill_vocabulary() if vocabulary is None else vocabulary
+    try:
+        result = process_resume(resume.file.name, resume.content_type, vocabulary)
+    except ExtractionError as exc:
+        save_result(resume.sha256, error=exc)
+    else:
+        save_result(resume.sha256, result)
+
+
+class ResumeWorkers:
+    """
+    Local background queue for resume extraction.
+
+    RESUME_WORKER_POOL picks a "process" pool (extraction is CPU bound), a
+    "thread" pool, or "sync" to extract inline. Processes are spawned rather
+    than forked from the web worker, whose threads and open connections a
+    fork would copy. Workers only parse files; results are written back
+    from this process when each task completes. Resumes left pending by a
+    restart are picked up by ``manage.py process_resumes``.
+    """
+
+    def __init__(self):
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                kind = getattr(settings, "RESUME_WORKER_POOL", "process")
+                workers = getattr(settings, "RESUME_WORKERS", 2)
+                if kind == "process":
+                    self.executor = ProcessPoolExecutor(
+                        max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=django.setup)
+                else:
+                    self.executor = ThreadPoolExecutor(max_workers=workers)
+            return self.executor
+
+    def submit(self, sha256):
+        resume = Resume.objects.filter(pk=sha256).first()
+        if resume is None:
+            return None
+        if getattr(settings, "RESUME_WORKER_POOL", "process") == "sync":
+            process_now(resume)
+            return None
+        future = self.get_executor().submit(
+            process_resume, resume.file.name, resume.content_type, skill_vocabulary())
+        future.add_done_callback(partial(self._completed, sha256))
+        return future
+
+    @staticmethod
+    def _completed(sha256, future):
+        try:
+            try:
+                result = future.result()
+            except Exception as exc:
+                save_result(sha256, error=exc)
+            else:
+                save_result(sha256, result)
+        finally:
+            # Runs on a pool thread, which keeps no request cycle to close it
+            connections.close_all()
+
+    def shutdown(self, wait=True):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=wait)
+                self.executor = None
+
+
+workers = ResumeWorkers()
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Company, JobSeekerProfile, EmployerProfile
+from .models import Company, JobSeekerProfile, EmployerProfile, ROLE_CHOICES, EXPERIENCE_CHOICES
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -36,4 +36,23 @@ class RegisterSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         user = User.objects.create_user(**validated_data)
-        return user
\ No newline at end of file
+        return user
+
+class RegistrationSerializer(serializers.Serializer):
+    """One sign-up: the user plus what its role profile needs."""
+    email = serializers.EmailField(max_length=150)
+    password = serializers.CharField(write_only=True)
+    role = serializers.ChoiceField(choices=ROLE_CHOICES)
+    experience = serializers.ChoiceField(choices=EXPERIENCE_CHOICES, required=False)
+    company = serializers.CharField(max_length=255, required=False)
+    position = serializers.CharField(max_length=255, required=False, allow_blank=True, default="")
+
+    def validate(self, data):
+        if data["role"] == "job_seeker" and not data.get("experience"):
+            raise serializers.ValidationError({"experience": ["This field is required."]})
+        if data["role"] == "employer" and not data.get("company", "").strip():
+            raise serializers.ValidationError({"company": ["This field is required."]})
+        return data
+
+class RegistrationBatchSerializer(serializers.Serializer):
+    users = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=5000)
@@ -0,0 +1,35 @@
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .authentication import principal_cache
+from .models import EmployerProfile, JobSeekerProfile, User
+from .throttling import login_limiter
+
+# Sent after bulk registration, which bypasses post_save; receives the
+# created ``seekers`` and ``employers`` profile lists.
+profiles_registered = Signal()
+# Sent when text extraction for a stored resume finishes or fails, and when
+# a profile is given a resume extracted earlier; receives the resume's
+# ``sha256``.
+resume_processed = Signal()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_user_principal(sender, instance, **kwargs):
+    principal_cache.delete(instance.pk)
+
+
+@receiver(post_save, sender=JobSeekerProfile)
+@receiver(post_delete, sender=JobSeekerProfile)
+@receiver(post_save, sender=EmployerProfile)
+@receiver(post_delete, sender=EmployerProfile)
+def evict_profile_principal(sender, instance, **kwargs):
+    principal_cache.delete(instance.user_id)
+
+
+@receiver(setting_changed)
+def reset_login_limiter(setting, **kwargs):
+    if setting == "LOGIN_THROTTLE_RATES":
+        login_limiter.clear()
@@ -1,7 +1,26 @@
-from django.test import TestCase
-from rest_framework.test import APITestCase
+import io
+import os
+import tempfile
+import zipfile
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models.fields.files import FieldFile
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory, APITestCase
 from rest_framework import status
-from .models import User, JobSeekerProfile, EmployerProfile, Company
+from .authentication import TokenAuthentication, principal_cache
+from .hashers import Argon2PasswordHasher, BCryptSHA256PasswordHasher, PBKDF2PasswordHasher
+from .middleware import ProfileMiddleware
+from .registration import POOL_THRESHOLD, get_or_create_companies, register_users
+from .resumes import workers
+from .throttling import TokenBucketLimiter, login_limiter
+from .tokens import issue_tokens
+from .models import User, JobSeekerProfile, EmployerProfile, Company, Resume
 
 class UserModelTest(TestCase):
     def test_user_creation(self):
@@ -63,6 +82,7 @@ class RegisterViewTest(APITestCase):
 
 class LoginViewTest(APITestCase):
     def setUp(self):
+        login_limiter.clear()
         self.user = User.objects.create_user(username='test@example.com', email='test@example.com', password='pass', role='job_seeker')
 
     def test_login_success(self):
@@ -75,4 +95,440 @@ class LoginViewTest(APITestCase):
         data = {'email': 'test@example.com', 'password': 'wrong'}
         response = self.client.post('/accounts/login/', data)
         self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.data['msg'], 'Invalid credentials')
\ No newline at end of file
+        self.assertEqual(response.data['msg'], 'Invalid credentials')
+
+class TokenAuthenticationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test@example.com", email="test@example.com", password="pass", role="employer")
+        self.company = Company.objects.create(name="Test Company")
+        self.profile = EmployerProfile.objects.create(user=self.user, company=self.company, position="Manager")
+        principal_cache.clear()
+        login_limiter.clear()
+
+    def login(self):
+        response = self.client.post("/accounts/login/", {"email": "test@example.com", "password": "pass"})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION="Bearer %s" % token)
+        return TokenAuthentication().authenticate(request)
+
+    def test_login_issues_tokens(self):
+        tokens = self.login()
+        self.assertEqual(tokens["token_type"], "Bearer")
+        user, principal = self.authenticate(tokens["access"])
+        self.assertEqual(user, self.user)
+        self.assertEqual(principal.role, "employer")
+        self.assertEqual(principal.employer_id, self.profile.pk)
+        self.assertEqual(principal.company_id, self.company.pk)
+        self.assertIsNone(principal.seeker_id)
+
+    def test_principal_is_cached(self):
+        tokens = self.login()
+        self.authenticate(tokens["access"])
+        with self.assertNumQueries(0):
+            self.authenticate(tokens["access"])
+
+    def test_profile_change_evicts_principal(self):
+        tokens = self.login()
+        self.authenticate(tokens["access"])
+        other = Company.objects.create(name="Other Company")
+        self.profile.company = other
+        self.profile.save()
+        _, principal = self.authenticate(tokens["access"])
+        self.assertEqual(principal.company_id, other.pk)
+
+    def test_invalid_tokens(self):
+        tokens = self.login()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(tokens["access"] + "x")
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(tokens["refresh"])
+        with self.settings(ACCESS_TOKEN_LIFETIME=timedelta(seconds=-1)):
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate(tokens["access"])
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(tokens["access"])
+
+    def test_refresh(self):
+        tokens = self.login()
+        response = self.client.post("/accounts/token/refresh/", {"refresh": tokens["refresh"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.authenticate(response.data["access"])[0], self.user)
+
+        response = self.client.post("/accounts/token/refresh/", {"refresh": tokens["access"]})
+        self.assertEqual(response.status_code, 401)
+
+    def test_password_change_voids_refresh_token(self):
+        tokens = self.login()
+        self.user.set_password("new")
+        self.user.save()
+        response = self.client.post("/accounts/token/refresh/", {"refresh": tokens["refresh"]})
+        self.assertEqual(response.status_code, 401)
+
+
+class ProfileMiddlewareTest(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name="Test Company")
+        self.employer_user = User.objects.create_user(username="employer@example.com", email="employer@example.com", password="pass", role="employer")
+        self.employer = EmployerProfile.objects.create(user=self.employer_user, company=self.company, position="Manager")
+        self.seeker_user = User.objects.create_user(username="seeker@example.com", email="seeker@example.com", password="pass", role="job_seeker")
+        principal_cache.clear()
+
+    def request_for(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        ProfileMiddleware(lambda request: None)(request)
+        return request
+
+    def test_lazy_and_resolved_once(self):
+        request = self.request_for(self.employer_user)
+        with self.assertNumQueries(0):
+            self.request_for(self.employer_user)
+        # principal miss + profile with user and company
+        with self.assertNumQueries(2):
+            self.assertEqual(request.profile, self.employer)
+            self.assertEqual(request.profile.company.name, "Test Company")
+            self.assertEqual(request.profile.user, self.employer_user)
+
+    def test_missing_profile(self):
+        self.assertFalse(self.request_for(self.seeker_user).profile)
+        self.assertFalse(self.request_for(AnonymousUser()).profile)
+        JobSeekerProfile.objects.create(user=self.seeker_user, experience_level="fresher")
+        self.assertIsInstance(self.request_for(self.seeker_user).profile, JobSeekerProfile)
+
+
+class LoginThrottleTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="test@example.com", email="test@example.com", password="pass", role="job_seeker")
+        login_limiter.clear()
+
+    def tearDown(self):
+        login_limiter.clear()
+
+    def test_token_bucket(self):
+        limiter = TokenBucketLimiter(capacity=2, refill_rate=0.5)
+        self.assertEqual(limiter.consume("a", now=0), 0)
+        self.assertEqual(limiter.consume("a", now=0), 0)
+        self.assertEqual(limiter.consume("a", now=0), 2)
+        self.assertEqual(limiter.consume("b", now=0), 0)
+        self.assertEqual(limiter.consume("a", now=2), 0)
+
+    def test_token_bucket_bounded(self):
+        limiter = TokenBucketLimiter(capacity=1, refill_rate=1, max_keys=2)
+        for key in ("a", "b", "c"):
+            limiter.consume(key, now=0)
+        self.assertEqual(list(limiter.buckets), ["b", "c"])
+
+    @override_settings(LOGIN_THROTTLE_RATES={"ip": "100/min", "email": "3/min"})
+    def test_flood_rejected_before_hashing(self):
+        data = {"email": "test@example.com", "password": "wrong"}
+        with mock.patch("accounts.views.authenticate", return_value=None) as authenticate:
+            codes = [self.client.post("/accounts/login/", data).status_code for _ in range(5)]
+        self.assertEqual(codes, [400, 400, 400, 429, 429])
+        self.assertEqual(authenticate.call_count, 3)
+        response = self.client.post("/accounts/login/", {"email": "other@example.com", "password": "pass"})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(LOGIN_THROTTLE_RATES={"ip": "2/min"})
+    def test_ip_bucket(self):
+        for email in ("a@example.com", "b@example.com"):
+            self.client.post("/accounts/login/", {"email": email, "password": "x"})
+        response = self.client.post("/accounts/login/", {"email": "c@example.com", "password": "x"})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    @override_settings(LOGIN_THROTTLE_RATES={"ip": "2/min"})
+    def test_ip_bucket_ignores_forwarded_for(self):
+        codes = [
+            self.client.post("/accounts/login/", {"email": "%d@example.com" % i, "password": "x"}, HTTP_X_FORWARDED_FOR="10.0.0.%d" % i).status_code
+            for i in range(3)
+        ]
+        self.assertEqual(codes, [400, 400, 429])
+
+
+@override_settings(PASSWORD_HASHER_PROFILE="fast", PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class PasswordHasherProfileTest(APITestCase):
+    def setUp(self):
+        login_limiter.clear()
+
+    def test_rehash_on_login(self):
+        user = User.objects.create_user(username="test@example.com", email="test@example.com", password="pass")
+        self.assertTrue(user.password.startswith("md5$"))
+        refresh = issue_tokens(user)["refresh"]
+        with self.settings(PASSWORD_HASHERS=["accounts.hashers.PBKDF2PasswordHasher", "django.contrib.auth.hashers.MD5PasswordHasher"]):
+            response = self.client.post("/accounts/login/", {"email": "test@example.com", "password": "pass"})
+            self.assertEqual(response.status_code, 200)
+            user.refresh_from_db()
+            self.assertTrue(user.password.startswith("pbkdf2_sha256$1000$"))
+            self.assertTrue(user.check_password("pass"))
+        # An upgraded hash is not a new password: tokens issued before stay valid
+        response = self.client.post("/accounts/token/refresh/", {"refresh": refresh})
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_change_requires_update(self):
+        hasher = PBKDF2PasswordHasher()
+        encoded = hasher.encode("pass", hasher.salt())
+        self.assertFalse(hasher.must_update(encoded))
+        with self.settings(PASSWORD_HASHER_PROFILE="interactive"):
+            self.assertEqual(hasher.iterations, 1000000)
+            self.assertTrue(hasher.must_update(encoded))
+            self.assertTrue(hasher.verify("pass", encoded))
+
+    def test_stronger_hashes_are_not_downgraded(self):
+        for hasher in (PBKDF2PasswordHasher(), BCryptSHA256PasswordHasher(), Argon2PasswordHasher()):
+            with self.subTest(hasher.algorithm):
+                with self.settings(PASSWORD_HASHER_PROFILE="default"):
+                    encoded = hasher.encode("pass", hasher.salt())
+                self.assertFalse(hasher.must_update(encoded))
+                self.assertTrue(hasher.verify("pass", encoded))
+
+
+class RegistrationBatchTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin@example.com", email="admin@example.com", password="pass", is_staff=True)
+        self.existing = Company.objects.create(name="ACME Corp")
+        self.client.force_authenticate(user=self.admin)
+
+    def test_register_validation(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.post("/accounts/register/", {"email": "seeker@example.com", "password": "pass", "role": "job_seeker"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("experience", response.data)
+        response = self.client.post("/accounts/register/", {"email": "admin@example.com", "password": "pass", "role": "job_seeker", "experience": "fresher"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.data)
+
+    def test_batch_register(self):
+        users = [
+            {"email": "s1@example.com", "password": "pw1", "role": "job_seeker", "experience": "fresher"},
+            {"email": "e1@example.com", "password": "pw2", "role": "employer", "company": " acme   corp ", "position": "CTO"},
+            {"email": "e2@example.com", "password": "pw3", "role": "employer", "company": "New Co"},
+            {"email": "e3@example.com", "password": "pw4", "role": "employer", "company": "new  co"},
+            {"email": "s1@example.com", "password": "pw5", "role": "job_seeker", "experience": "fresher"},
+            {"email": "admin@example.com", "password": "pw6", "role": "job_seeker", "experience": "fresher"},
+            {"email": "bad", "password": "pw7", "role": "job_seeker", "experience": "fresher"},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/accounts/register/batch/", {"users": users}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 4)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [5, 6, 7])
+        self.assertLess(len(queries), 15)
+
+        self.assertTrue(User.objects.get(username="s1@example.com").check_password("pw1"))
+        self.assertEqual(JobSeekerProfile.objects.get(user__username="s1@example.com").experience_level, "fresher")
+        self.assertEqual(EmployerProfile.objects.get(user__username="e1@example.com").company, self.existing)
+        self.assertEqual(Company.objects.count(), 2)
+        new_co = Company.objects.get(name="New Co")
+        self.assertEqual(EmployerProfile.objects.filter(company=new_co).count(), 2)
+
+    def test_company_matching(self):
+        spaced = Company.objects.create(name="Acme  Inc")
+        report = register_users([{"email": "e1@example.com", "password": "pw", "role": "employer", "company": "ACME Inc"}])
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(EmployerProfile.objects.get(user__username="e1@example.com").company, spaced)
+
+        # A chunk that fails takes its new companies with it
+        with mock.patch.object(EmployerProfile.objects, "bulk_create", side_effect=IntegrityError):
+            report = register_users([{"email": "e2@example.com", "password": "pw", "role": "employer", "company": "Orphan Co"}])
+        self.assertEqual(report["failed"], 1)
+        self.assertFalse(Company.objects.filter(name="Orphan Co").exists())
+
+    def test_batch_users_normalized_like_create_user(self):
+        report = register_users([{"email": "Mixed@EXAMPLE.COM", "password": "pw", "role": "job_seeker", "experience": "fresher"}])
+        self.assertEqual(report["created"], 1)
+        user = User.objects.get(username="Mixed@EXAMPLE.COM")
+        reference = User.objects.create_user(username="Other@EXAMPLE.COM", email="Other@EXAMPLE.COM", password="pw")
+        self.assertEqual(user.email, "Mixed@example.com")
+        self.assertEqual(reference.email, "Other@example.com")
+        self.assertEqual(user.credentials_version, reference.credentials_version)
+
+    def test_company_created_concurrently(self):
+        lookup = Company.objects.filter
+
+        def filter(*args, **kwargs):
+            # The first lookup misses a company another batch then commits
+            if filter.calls == 0:
+                Company.objects.create(name="Race Co")
+            filter.calls += 1
+            return lookup(*args, **kwargs).exclude(name_key="race co") if filter.calls == 1 else lookup(*args, **kwargs)
+        filter.calls = 0
+
+        with mock.patch.object(Company.objects, "filter", side_effect=filter):
+            companies = get_or_create_companies(["race  CO"])
+        self.assertEqual(companies["race  CO"], Company.objects.get(name="Race Co"))
+        self.assertEqual(Company.objects.filter(name_key="race co").count(), 1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Company.objects.create(name="RACE co")
+
+    def test_batch_requires_admin(self):
+        self.client.force_authenticate(user=User.objects.create_user(username="u@example.com", password="pass"))
+        response = self.client.post("/accounts/register/batch/", {"users": [{}]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_process_pool_hashing(self):
+        rows = [
+            {"email": "s%d@example.com" % i, "password": "pw%d" % i, "role": "job_seeker", "experience": "fresher"}
+            for i in range(POOL_THRESHOLD + 6)
+        ]
+        report = register_users(rows, chunk_size=25, processes=2)
+        self.assertEqual(report["created"], len(rows))
+        self.assertEqual(JobSeekerProfile.objects.count(), len(rows))
+        self.assertTrue(User.objects.get(username="s7@example.com").check_password("pw7"))
+
+    def test_register_users_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as handle:
+            handle.write("email,password,role,experience,company\n")
+            handle.write("s1@example.com,pw,job_seeker,fresher,\n")
+            handle.write("e1@example.com,pw,employer,,Acme Corp\n")
+        self.addCleanup(os.remove, handle.name)
+        out = io.StringIO()
+        call_command("register_users", handle.name, stdout=out, stderr=io.StringIO())
+        self.assertIn("Registered 2 users, 0 rows failed", out.getvalue())
+        self.assertEqual(EmployerProfile.objects.get(user__username="e1@example.com").company, self.existing)
+
+
+def resume_vocabulary():
+    return ["python", "django", "machine learning", "c++"]
+
+
+class ResumePipelineTest(APITestCase):
+    RESUME = b"Jane Doe\nSkills: Python, Django and C++.\nInterested in machine learning.\n"
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(
+            MEDIA_ROOT=media.name, RESUME_UPLOAD_DIR=os.path.join(media.name, "uploads"),
+            RESUME_WORKER_POOL="sync", RESUME_SKILL_VOCABULARY="accounts.tests.resume_vocabulary",
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.user = User.objects.create_user(username="seeker@example.com", password="pass", role="job_seeker")
+        self.profile = JobSeekerProfile.objects.create(user=self.user, experience_level="fresher", skills="SQL")
+        self.client.force_authenticate(user=self.user)
+
+    def start(self, content=RESUME, content_type="text/plain"):
+        response = self.client.post("/accounts/resume/uploads/", {
+            "filename": "cv.txt", "size": len(content), "content_type": content_type,
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return "/accounts/resume/uploads/%s/" % response.data["id"]
+
+    def send(self, url, chunk, offset):
+        return self.client.generic("PATCH", url, chunk, content_type="application/offset+octet-stream",
+                                   HTTP_UPLOAD_OFFSET=str(offset))
+
+    def upload(self, content=RESUME, content_type="text/plain"):
+        url = self.start(content, content_type)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.send(url, content, 0)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response
+
+    def test_resumable_upload(self):
+        url = self.start()
+        response = self.send(url, self.RESUME[:20], 0)
+        self.assertEqual(response["Upload-Offset"], "20")
+        response = self.send(url, self.RESUME[20:], 10)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["offset"], 20)
+        self.assertEqual(self.client.head(url)["Upload-Offset"], "20")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.send(url, self.RESUME[20:], 20)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get("/accounts/resume/")
+        self.assertEqual(response.data["status"], "done")
+        self.assertEqual(response.data["skills"], ["python", "django", "c++", "machine learning"])
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.resume_content.file.read(), self.RESUME)
+        self.assertEqual(self.profile.matching_skills, "SQL,python,django,c++,machine learning")
+
+    def test_identical_uploads_share_storage(self):
+        first = self.upload().data["sha256"]
+        other = User.objects.create_user(username="other@example.com", password="pass", role="job_seeker")
+        other_profile = JobSeekerProfile.objects.create(user=other, experience_level="fresher")
+        self.client.force_authenticate(user=other)
+        with mock.patch("accounts.resumes.process_resume") as process:
+            self.assertEqual(self.upload().data["sha256"], first)
+        process.assert_not_called()
+        other_profile.refresh_from_db()
+        self.assertEqual(other_profile.resume_content_id, first)
+        self.assertEqual(Resume.objects.count(), 1)
+
+    def test_upload_validation(self):
+        response = self.client.post("/accounts/resume/uploads/", {
+            "filename": "cv.exe", "size": 10, "content_type": "application/x-msdownload"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with override_settings(RESUME_MAX_SIZE=10):
+            response = self.client.post("/accounts/resume/uploads/", {
+                "filename": "cv.txt", "size": 11, "content_type": "text/plain"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        url = self.start()
+        response = self.send(url, self.RESUME + b"extra", 0)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=User.objects.create_user(username="x@example.com", password="pass"))
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_docx_extraction_and_failures(self):
+        body = io.BytesIO()
+        with zipfile.ZipFile(body, "w") as archive:
+            archive.writestr("word/document.xml", (
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+                "<w:p><w:r><w:t>Machine</w:t></w:r><w:r><w:t> learning with Django</w:t></w:r></w:p>"
+                "</w:body></w:document>"))
+        docx = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        response = self.upload(body.getvalue(), docx)
+        self.assertEqual(Resume.objects.get(pk=response.data["sha256"]).skills, "machine learning,django")
+
+        response = self.upload(b"not a zip file", docx)
+        resume = Resume.objects.get(pk=response.data["sha256"])
+        self.assertEqual(resume.status, "failed")
+        self.assertTrue(resume.error)
+
+    def test_docx_inflation_capped(self):
+        body = io.BytesIO()
+        with zipfile.ZipFile(body, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("word/document.xml", "<w:document>%s</w:document>" % (" " * 5000))
+        docx = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        with mock.patch("accounts.resumes.MAX_DOCX_XML_SIZE", 1000):
+            response = self.upload(body.getvalue(), docx)
+        resume = Resume.objects.get(pk=response.data["sha256"])
+        self.assertEqual(resume.status, "failed")
+        self.assertEqual(resume.error, "Document too large to extract")
+
+    def test_worker_pool(self):
+        # Results are saved from the pool thread, which cannot see this
+        # test's uncommitted rows, so only check what it would save.
+        with override_settings(RESUME_WORKER_POOL="thread"), mock.patch("accounts.resumes.save_result") as save:
+            response = self.upload()
+            workers.shutdown()
+        save.assert_called_once_with(response.data["sha256"], (self.RESUME.decode(), ["python", "django", "c++", "machine learning"]))
+
+    def test_storage_without_local_paths(self):
+        # As with remote storages, stored files have no local path
+        with mock.patch.object(FieldFile, "path", new_callable=mock.PropertyMock, side_effect=NotImplementedError):
+            sha256 = self.upload().data["sha256"]
+        self.assertEqual(Resume.objects.get(pk=sha256).status, "done")
+
+    def test_process_pool_is_spawned(self):
+        with override_settings(RESUME_WORKER_POOL="process"):
+            executor = workers.get_executor()
+            self.addCleanup(workers.shutdown)
+        self.assertEqual(executor._mp_context.get_start_method(), "spawn")
+
+    def test_process_resumes_command(self):
+        with mock.patch("accounts.resumes.workers.submit"):
+            sha256 = self.upload().data["sha256"]
+        self.assertEqual(Resume.objects.get(pk=sha256).status, "pending")
+        out = io.StringIO()
+        call_command("process_resumes", stdout=out)
+        self.assertIn("Processed 1 resumes", out.getvalue())
+        self.assertEqual(Resume.objects.get(pk=sha256).status, "done")
@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+DEFAULT_LOGIN_THROTTLE_RATES = {"ip": "30/min", "email": "10/min"}
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """'10/min' -> (10 tokens of burst, refilled at 10/60 per second)."""
+    num, period = rate.split("/")
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+class TokenBucketLimiter:
+    """
+    In-process token buckets, one per key, each holding up to ``capacity``
+    tokens and refilling continuously at ``refill_rate`` tokens per second.
+
+    At most ``max_keys`` buckets are kept; the least recently used is
+    dropped first, which is the same as it having refilled completely.
+    """
+
+    def __init__(self, capacity, refill_rate, max_keys=100000):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _level(self, key, now):
+        tokens, updated = self.buckets.get(key, (self.capacity, now))
+        return min(self.capacity, tokens + (now - updated) * self.refill_rate)
+
+    def consume(self, key, now=None):
+        """Take one token for ``key``; returns 0 if allowed, else seconds until one is available."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            tokens = self._level(key, now)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self.buckets[key] = (tokens, now)
+            self.buckets.move_to_end(key)
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return 0 if allowed else (1 - tokens) / self.refill_rate
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class LoginLimiter:
+    """Token buckets for login attempts, keyed by client IP and by email."""
+
+    def __init__(self):
+        self.limiters = None
+        self.lock = threading.Lock()
+
+    def get_limiters(self):
+        if self.limiters is None:
+            with self.lock:
+                if self.limiters is None:
+                    rates = getattr(settings, "LOGIN_THROTTLE_RATES", DEFAULT_LOGIN_THROTTLE_RATES)
+                    self.limiters = {scope: TokenBucketLimiter(*parse_rate(rate)) for scope, rate in rates.items()}
+        return self.limiters
+
+    def consume(self, ip, email):
+        limiters = self.get_limiters()
+        waits = []
+        if "ip" in limiters and ip:
+            waits.append(limiters["ip"].consume(ip))
+        if "email" in limiters and email:
+            waits.append(limiters["email"].consume(email.strip().lower()))
+        return max(waits, default=0)
+
+    def clear(self):
+        with self.lock:
+            self.limiters = None
+
+
+login_limiter = LoginLimiter()
+
+
+class LoginRateThrottle(BaseThrottle):
+    """
+    Rejects login floods per IP and per email before the view runs, so
+    throttled attempts never reach the password hasher.
+    """
+
+    def client_ip(self, request):
+        # get_ident() trusts X-Forwarded-For unless NUM_PROXIES says how many
+        # proxies in front of us set it; a client-chosen header would give
+        # every attempt a fresh IP bucket.
+        if api_settings.NUM_PROXIES is None:
+            return request.META.get("REMOTE_ADDR")
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        self.retry_after = login_limiter.consume(self.client_ip(request), email if isinstance(email, str) else None)
+        return not self.retry_after
+
+    def wait(self):
+        return self.retry_after
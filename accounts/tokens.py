@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import salted_hmac
+
+ACCESS_TOKEN_SALT = "accounts.tokens.access"
+REFRESH_TOKEN_SALT = "accounts.tokens.refresh"
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def access_token_lifetime():
+    return getattr(settings, "ACCESS_TOKEN_LIFETIME", timedelta(minutes=15))
+
+
+def refresh_token_lifetime():
+    return getattr(settings, "REFRESH_TOKEN_LIFETIME", timedelta(days=7))
+
+
+def password_fingerprint(user):
+    # Changes whenever the password does, which voids outstanding refresh
+    # tokens. Not derived from the hash, which a rehash on login replaces.
+    return salted_hmac(REFRESH_TOKEN_SALT, "%s:%s" % (user.pk, user.credentials_version)).hexdigest()[:16]
+
+
+def issue_tokens(user):
+    """
+    Return signed access and refresh tokens for ``user``.
+
+    Both are stateless: the payload is signed with SECRET_KEY and carries the
+    issue time, so verifying one needs no database access.
+    """
+    access = signing.dumps({"u": user.pk}, salt=ACCESS_TOKEN_SALT, compress=True)
+    refresh = signing.dumps({"u": user.pk, "p": password_fingerprint(user)}, salt=REFRESH_TOKEN_SALT, compress=True)
+    return {
+        "access": access,
+        "refresh": refresh,
+        "token_type": "Bearer",
+        "expires_in": int(access_token_lifetime().total_seconds()),
+    }
+
+
+def _load(token, salt, max_age):
+    try:
+        payload = signing.loads(token, salt=salt, max_age=max_age)
+    except signing.SignatureExpired:
+        raise InvalidToken("Token expired")
+    except signing.BadSignature:
+        raise InvalidToken("Invalid token")
+    if not isinstance(payload, dict) or not isinstance(payload.get("u"), int):
+        raise InvalidToken("Invalid token")
+    return payload
+
+
+def verify_access_token(token):
+    """Return the user id an access token was issued for."""
+    return _load(token, ACCESS_TOKEN_SALT, access_token_lifetime())["u"]
+
+
+def verify_refresh_token(token):
+    """Return the (user id, password fingerprint) a refresh token was issued for."""
+    payload = _load(token, REFRESH_TOKEN_SALT, refresh_token_lifetime())
+    return payload["u"], payload.get("p")
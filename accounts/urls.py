@@ -1,7 +1,15 @@
 from django.urls import path
-from .views import RegisterView, LoginView
+from .views import (
+    RegisterView, RegisterBatchView, LoginView, TokenRefreshView,
+    ResumeView, ResumeUploadView, ResumeUploadDetailView,
+)
 
 urlpatterns = [
     path("register/", RegisterView.as_view()),
+    path("register/batch/", RegisterBatchView.as_view()),
     path("login/", LoginView.as_view()),
+    path("token/refresh/", TokenRefreshView.as_view()),
+    path("resume/", ResumeView.as_view()),
+    path("resume/uploads/", ResumeUploadView.as_view()),
+    path("resume/uploads/<uuid:pk>/", ResumeUploadDetailView.as_view()),
 ]
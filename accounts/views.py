@@ -1,30 +1,153 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from accounts.models import User, JobSeekerProfile, EmployerProfile
+from rest_framework.permissions import IsAdminUser
+from accounts.authentication import get_principal
+from accounts.models import JobSeekerProfile, ResumeUpload, User
+from accounts.registration import register_users
+from accounts.resumes import UploadError, discard_upload, finish_upload, start_upload, write_chunk
+from accounts.serializers import RegistrationBatchSerializer
+from accounts.throttling import LoginRateThrottle
+from accounts.tokens import InvalidToken, issue_tokens, password_fingerprint, verify_refresh_token
 from django.contrib.auth import authenticate
 
 class RegisterView(APIView):
     def post(self, request):
-        data = request.data
-        user = User.objects.create_user(
-            username=data["email"],
-            email=data["email"],
-            password=data["password"],
-            role=data["role"]
-        )
-        if user.role == "job_seeker":
-            JobSeekerProfile.objects.create(user=user, experience_level=data["experience"])
-        else:
-            company, created = Company.objects.get_or_create(name=data["company"])
-            EmployerProfile.objects.create(user=user, company=company, position=data.get("position", ""))
-
-        return Response({"msg": "User registered"}, status=status.HTTP_201_CREATED)
+        report = register_users([request.data], processes=1)
+        if report["created"]:
+            return Response({"msg": "User registered"}, status=status.HTTP_201_CREATED)
+        return Response(report["errors"][0]["errors"], status=status.HTTP_400_BAD_REQUEST)
+
+
+class RegisterBatchView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        serializer = RegistrationBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        report = register_users(serializer.validated_data["users"])
+        response_status = status.HTTP_201_CREATED if report["created"] else status.HTTP_400_BAD_REQUEST
+        return Response(report, status=response_status)
 
 
 class LoginView(APIView):
+    # Checked before post(), so throttled attempts never hash a password
+    throttle_classes = [LoginRateThrottle]
+
     def post(self, request):
         user = authenticate(username=request.data["email"], password=request.data["password"])
         if user:
-            return Response({"msg": "Login successful"})
+            return Response({"msg": "Login successful", **issue_tokens(user)})
         return Response({"msg": "Invalid credentials"}, status=400)
+
+
+class TokenRefreshView(APIView):
+    def post(self, request):
+        try:
+            user_id, fingerprint = verify_refresh_token(request.data.get("refresh", ""))
+        except InvalidToken as exc:
+            return Response({"msg": str(exc)}, status=status.HTTP_401_UNAUTHORIZED)
+        user = User.objects.filter(pk=user_id, is_active=True).first()
+        # A password change since the token was issued voids it
+        if user is None or fingerprint != password_fingerprint(user):
+            return Response({"msg": "Invalid token"}, status=status.HTTP_401_UNAUTHORIZED)
+        return Response(issue_tokens(user))
+
+
+def _resume_state(resume):
+    return {
+        "sha256": resume.sha256,
+        "size": resume.size,
+        "content_type": resume.content_type,
+        "status": resume.status,
+        "skills": [skill for skill in resume.skills.split(",") if skill],
+        "error": resume.error,
+    }
+
+
+def _upload_response(upload, status_code=status.HTTP_200_OK):
+    data = {"id": str(upload.pk), "filename": upload.filename, "size": upload.size, "offset": upload.offset}
+    return Response(data, status=status_code, headers={
+        "Location": "/accounts/resume/uploads/%s/" % upload.pk,
+        "Upload-Offset": str(upload.offset),
+        "Upload-Length": str(upload.size),
+    })
+
+
+class ResumeView(APIView):
+    def get(self, request):
+        seeker_id = get_principal(request).seeker_id
+        if seeker_id is None:
+            return Response({"msg": "Job seeker profile required"}, status=status.HTTP_403_FORBIDDEN)
+        seeker = JobSeekerProfile.objects.select_related("resume_content").get(pk=seeker_id)
+        if seeker.resume_content is None:
+            return Response({"msg": "No resume uploaded"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(_resume_state(seeker.resume_content))
+
+
+class ResumeUploadView(APIView):
+    """Start a resumable upload: {"filename", "size", "content_type"}."""
+
+    def post(self, request):
+        seeker_id = get_principal(request).seeker_id
+        if seeker_id is None:
+            return Response({"msg": "Job seeker profile required"}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            size = int(request.data.get("size", 0))
+        except (TypeError, ValueError):
+            return Response({"msg": "Size must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            upload = start_upload(seeker_id, str(request.data.get("filename", "")), size,
+                                  str(request.data.get("content_type", "")))
+        except UploadError as exc:
+            return Response({"msg": str(exc)}, status=exc.status)
+        return _upload_response(upload, status.HTTP_201_CREATED)
+
+
+class ResumeUploadDetailView(APIView):
+    """
+    GET/HEAD report how many bytes arrived. PATCH appends the raw request
+    body at the Upload-Offset header, streamed to disk in chunks; after an
+    interruption the client asks for the offset and continues from there.
+    The request that completes the upload returns the stored resume.
+    """
+
+    def get_upload(self, request, pk):
+        seeker_id = get_principal(request).seeker_id
+        if seeker_id is None:
+            return None
+        return ResumeUpload.objects.filter(pk=pk, seeker_id=seeker_id).first()
+
+    def get(self, request, pk):
+        upload = self.get_upload(request, pk)
+        if upload is None:
+            return Response({"msg": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        return _upload_response(upload)
+
+    def patch(self, request, pk):
+        upload = self.get_upload(request, pk)
+        if upload is None:
+            return Response({"msg": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers.get("Content-Length") or 0)
+        except (KeyError, ValueError):
+            return Response({"msg": "Upload-Offset header required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            # request.stream, not request.data: the body is never buffered whole
+            write_chunk(upload, request.stream, offset, length)
+        except UploadError as exc:
+            response = Response({"msg": str(exc), "offset": upload.offset}, status=exc.status)
+            response["Upload-Offset"] = str(upload.offset)
+            return response
+        if upload.offset < upload.size:
+            return _upload_response(upload)
+        return Response(_resume_state(finish_upload(upload)), status=status.HTTP_201_CREATED)
+
+    def delete(self, request, pk):
+        upload = self.get_upload(request, pk)
+        if upload is None:
+            return Response({"msg": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        discard_upload(upload)
+        return Response(status=status.HTTP_204_NO_CONTENT)
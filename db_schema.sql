@@ -5,25 +5,43 @@ CREATE TABLE users (
   password_hash VARCHAR(255) NOT NULL,
   role VARCHAR(20) NOT NULL, -- 'fresher' | 'experienced' | 'employer' | 'admin'
   profile_status BOOLEAN DEFAULT FALSE,
+  credentials_version INTEGER DEFAULT 0, -- refresh token / feed URL fingerprint (accounts/tokens.py)
   created_at TIMESTAMP DEFAULT NOW()
 );
 
 CREATE TABLE companies (
   id SERIAL PRIMARY KEY,
   name VARCHAR(255) NOT NULL,
+  name_key VARCHAR(255) NOT NULL DEFAULT '', -- whitespace-collapsed, casefolded name (accounts/models.py)
   industry VARCHAR(100),
   size VARCHAR(50),
   verified BOOLEAN DEFAULT FALSE,
   created_at TIMESTAMP DEFAULT NOW()
 );
 
+-- Stored resume files, keyed by content hash so identical uploads share a row
+CREATE TABLE resumes (
+  sha256 CHAR(64) PRIMARY KEY,
+  file VARCHAR(255) NOT NULL,
+  size BIGINT NOT NULL,
+  content_type VARCHAR(100),
+  status VARCHAR(10) DEFAULT 'pending', -- 'pending' 'done' 'failed'
+  text TEXT,
+  skills TEXT, -- extracted skill tokens, comma separated
+  error VARCHAR(255),
+  created_at TIMESTAMP DEFAULT NOW(),
+  extracted_at TIMESTAMP
+);
+
 CREATE TABLE job_seekers (
   id SERIAL PRIMARY KEY,
   user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
   experience_level VARCHAR(50), -- 'entry' 'mid' 'senior'
   resume_url TEXT,
+  resume_sha256 CHAR(64) REFERENCES resumes(sha256) ON DELETE SET NULL,
   skills TEXT,
-  education JSONB -- e.g. [{degree, institute, year, gpa}]
+  education JSONB, -- e.g. [{degree, institute, year, gpa}]
+  updated_at TIMESTAMP DEFAULT NOW() -- matching engine delta sync (jobs/matching.py)
 );
 
 CREATE TABLE employers (
@@ -46,7 +64,30 @@ CREATE TABLE jobs (
   experience_required VARCHAR(50),
   job_type VARCHAR(50), -- 'full-time' 'part-time' 'internship'
   posted_at TIMESTAMP DEFAULT NOW(),
-  application_deadline DATE
+  application_deadline DATE,
+  skills_required TEXT,
+  is_active BOOLEAN DEFAULT TRUE,
+  updated_at TIMESTAMP DEFAULT NOW(), -- job_detail ETag / Last-Modified (jobs/conditional.py)
+  search_vector TSVECTOR -- weighted title/requirements/description, see jobs/search.py
+);
+
+CREATE TABLE skills (
+  id SERIAL PRIMARY KEY,
+  name VARCHAR(100) UNIQUE NOT NULL -- normalized: lower-cased, whitespace collapsed
+);
+
+CREATE TABLE job_skills (
+  id SERIAL PRIMARY KEY,
+  job_id INTEGER REFERENCES jobs(id) ON DELETE CASCADE,
+  skill_id INTEGER REFERENCES skills(id) ON DELETE CASCADE,
+  UNIQUE (job_id, skill_id)
+);
+
+CREATE TABLE seeker_skills ( -- listed and resume skills of a seeker (jobs/skills.py)
+  id SERIAL PRIMARY KEY,
+  seeker_id INTEGER REFERENCES job_seekers(id) ON DELETE CASCADE,
+  skill_id INTEGER REFERENCES skills(id) ON DELETE CASCADE,
+  UNIQUE (seeker_id, skill_id)
 );
 
 CREATE TABLE applications (
@@ -54,12 +95,89 @@ CREATE TABLE applications (
   job_id INTEGER REFERENCES jobs(id),
   seeker_id INTEGER REFERENCES job_seekers(id),
   status VARCHAR(50) DEFAULT 'applied',
-  applied_date TIMESTAMP DEFAULT NOW()
+  applied_date TIMESTAMP DEFAULT NOW(),
+  CONSTRAINT unique_application UNIQUE (job_id, seeker_id)
+);
+
+-- Denormalized application counts by status (jobs/counters.py), one row
+-- per job and per company; `manage.py reconcile_application_counts` rebuilds them
+CREATE TABLE job_application_counts (
+  job_id INTEGER PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE,
+  total INTEGER DEFAULT 0,
+  applied INTEGER DEFAULT 0,
+  shortlisted INTEGER DEFAULT 0,
+  rejected INTEGER DEFAULT 0,
+  hired INTEGER DEFAULT 0
+);
+
+CREATE TABLE company_application_counts (
+  company_id INTEGER PRIMARY KEY REFERENCES companies(id) ON DELETE CASCADE,
+  total INTEGER DEFAULT 0,
+  applied INTEGER DEFAULT 0,
+  shortlisted INTEGER DEFAULT 0,
+  rejected INTEGER DEFAULT 0,
+  hired INTEGER DEFAULT 0
+);
+
+-- Change counters of list endpoints ('jobs', 'applications:seeker:<id>',
+-- 'applications:company:<id>'), bumped with every write; conditional GET
+-- validators for lists come from these rows (jobs/conditional.py)
+CREATE TABLE collection_versions (
+  name VARCHAR(100) PRIMARY KEY,
+  version BIGINT DEFAULT 0,
+  updated_at TIMESTAMP DEFAULT NOW()
 );
 
 CREATE TABLE interviews (
   id SERIAL PRIMARY KEY,
   application_id INTEGER REFERENCES applications(id),
+  interviewer_id INTEGER REFERENCES employers(id),
+  seeker_id INTEGER NOT NULL REFERENCES job_seekers(id), -- copy of the application's seeker
   schedule TIMESTAMP,
-  feedback TEXT
+  ends_at TIMESTAMP NOT NULL, -- slot is [schedule, ends_at), at most 4 hours
+  feedback TEXT,
+  updated_at TIMESTAMP DEFAULT NOW() -- calendar ETags and delta sync (jobs/ical.py)
+);
+
+-- Tombstones of deleted interviews for delta calendar sync, kept 30 days
+CREATE TABLE interview_deletions (
+  id SERIAL PRIMARY KEY,
+  interview_id BIGINT NOT NULL,
+  interviewer_id BIGINT NOT NULL,
+  seeker_id BIGINT NOT NULL,
+  deleted_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Transactional outbox of job/application/interview changes (jobs/outbox.py),
+-- read in id order by the events API and SSE stream, kept 7 days
+CREATE TABLE change_events (
+  id BIGSERIAL PRIMARY KEY,
+  entity VARCHAR(20) NOT NULL, -- 'job' 'application' 'interview'
+  entity_id BIGINT NOT NULL,
+  action VARCHAR(10) NOT NULL, -- 'created' 'updated' 'deleted'
+  data JSONB,
+  created_at TIMESTAMP DEFAULT NOW()
 );
+CREATE INDEX change_events_created_idx ON change_events (created_at);
+CREATE UNIQUE INDEX companies_name_key_idx ON companies (name_key);
+
+-- Indexes for the hot query shapes in jobs/views.py
+-- (see jobs/migrations/0004_hot_path_indexes.py and `manage.py explain_hot_queries`)
+CREATE INDEX job_active_posted_idx ON jobs (posted_at DESC, id DESC) WHERE is_active;
+CREATE INDEX job_active_type_posted_idx ON jobs (job_type, posted_at DESC, id DESC) WHERE is_active;
+CREATE INDEX job_updated_idx ON jobs (updated_at);
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX job_location_trgm_idx ON jobs USING gin (UPPER(location) gin_trgm_ops) WHERE is_active;
+CREATE INDEX jobs_search_vector_gin ON jobs USING gin (search_vector);
+CREATE INDEX job_skills_skill_job_idx ON job_skills (skill_id, job_id);
+CREATE INDEX seeker_updated_idx ON job_seekers (updated_at);
+CREATE INDEX seeker_skill_skill_idx ON seeker_skills (skill_id, seeker_id);
+CREATE INDEX application_seeker_date_idx ON applications (seeker_id, applied_date DESC, id DESC);
+CREATE INDEX application_job_status_idx ON applications (job_id, status);
+CREATE INDEX interview_application_idx ON interviews (application_id);
+CREATE INDEX interview_interviewer_idx ON interviews (interviewer_id, schedule);
+CREATE INDEX interview_seeker_idx ON interviews (seeker_id, schedule);
+CREATE INDEX interview_updated_idx ON interviews (interviewer_id, updated_at);
+CREATE INDEX interview_seeker_updated_idx ON interviews (seeker_id, updated_at);
+CREATE INDEX interview_deletion_emp_idx ON interview_deletions (interviewer_id, deleted_at);
+CREATE INDEX interview_deletion_seeker_idx ON interview_deletions (seeker_id, deleted_at);
@@ -2,6 +2,8 @@
 ASGI config for job_portal_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP goes to Django; WebSockets on NOTIFICATIONS_WEBSOCKET_PATH go to the
+notification push channel (jobs.notifications).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -9,8 +11,24 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_portal_backend.settings')
+# Serve the read endpoints with the async views (jobs.async_views)
+os.environ.setdefault('JOBS_ASYNC_VIEWS', '1')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once the app registry is ready
+from jobs.notifications import websocket_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        if scope['path'] == getattr(settings, 'NOTIFICATIONS_WEBSOCKET_PATH', '/api/notifications/ws/'):
+            return await websocket_application(scope, receive, send)
+        # No other WebSocket endpoints; reject the handshake
+        await receive()
+        return await send({'type': 'websocket.close'})
+    return await django_application(scope, receive, send)
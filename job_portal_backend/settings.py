@@ -1,3 +1,7 @@
+import os
+
+from accounts.hashers import password_hashers
+
 INSTALLED_APPS = [
     "accounts",
     "jobs",
@@ -6,3 +10,85 @@ INSTALLED_APPS = [
     "django.contrib.admin",
     "django.contrib.auth",
 ]
+
+# Work factors for password hashing, see accounts.hashers.HASHER_PROFILES.
+# Stored hashes are upgraded transparently when a user next logs in.
+PASSWORD_HASHER_PROFILE = "interactive"
+PASSWORD_HASHERS = password_hashers()
+
+# Token buckets checked before any password hashing on login: "<burst>/<period>",
+# refilled continuously at that rate (see accounts.throttling).
+LOGIN_THROTTLE_RATES = {
+    "ip": "30/min",
+    "email": "10/min",
+}
+
+# Resolves request.profile (the caller's JobSeekerProfile/EmployerProfile)
+# lazily, once per request.
+MIDDLEWARE = [
+    "accounts.middleware.ProfileMiddleware",
+]
+
+# Resume uploads (accounts.resumes): chunks accumulate under
+# RESUME_UPLOAD_DIR, finished files are stored by content hash, and text and
+# skills are extracted by a local worker pool ("process", "thread" or "sync").
+RESUME_MAX_SIZE = 10 * 1024 * 1024
+RESUME_UPLOAD_DIR = None
+RESUME_WORKER_POOL = "process"
+RESUME_WORKERS = 2
+RESUME_SKILL_VOCABULARY = "jobs.skills.skill_vocabulary"
+
+# Set "NUM_PROXIES" to the number of reverse proxies in front of the app so
+# client IPs (login throttling) come from X-Forwarded-For; unset, REMOTE_ADDR
+# is used.
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "accounts.authentication.TokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "jobs.pagination.KeysetPagination",
+    "PAGE_SIZE": 20,
+    "DEFAULT_RENDERER_CLASSES": [
+        "jobs.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
+# Serve list endpoints from values() rows via precompiled field plans
+# (jobs.fastpath) instead of per-instance ModelSerializer rendering.
+JOBS_FAST_SERIALIZATION = True
+
+# Route the job/application/interview read endpoints to the async views in
+# jobs.async_views. Only for ASGI: under WSGI every request would pay for its
+# own event loop and streamed exports would be buffered whole. asgi.py turns
+# it on through the JOBS_ASYNC_VIEWS environment variable.
+JOBS_ASYNC_VIEWS = os.environ.get("JOBS_ASYNC_VIEWS", "0") == "1"
+
+# Change event streams (jobs.outbox) poll the outbox every
+# OUTBOX_POLL_INTERVAL seconds and close after OUTBOX_STREAM_DURATION
+# seconds; EventSource clients reconnect and resume from Last-Event-ID.
+OUTBOX_POLL_INTERVAL = 1
+OUTBOX_STREAM_DURATION = 300
+
+# Push notifications (jobs.notifications): "jobs.notifications.LocalBackend"
+# fans out within one process; with several ASGI processes use
+# "jobs.notifications.OutboxBackend", which tails the outbox in each of them.
+# NOTIFICATIONS_WEBSOCKET_PATH is routed by asgi.py; SSE is served by the
+# notification_stream view.
+NOTIFICATIONS_BACKEND = "jobs.notifications.LocalBackend"
+NOTIFICATIONS_WEBSOCKET_PATH = "/api/notifications/ws/"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Public job listing/detail responses; LocMemCache evicts least recently
+    # used entries once MAX_ENTRIES is reached.
+    "job_listing": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "job-listing",
+        "TIMEOUT": 60,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
@@ -0,0 +1,203 @@
+"""
+Async versions of the read endpoints, for ASGI deployments.
+
+GET requests are served on the event loop through the async ORM; other
+methods are handed to the regular DRF view in jobs.views on a worker thread,
+so writes keep a single implementation.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.response import Response
+
+from . import views
+from .cache import cache_response, get_cached_response, job_detail_cache_key, job_list_cache_key
+from .conditional import JOBS, alist_validators, application_collections, job_validators, not_modified, set_validators
+from .exporter import astream_applications
+from .models import Job, Application, Interview
+from .notifications import aprincipal_for_token, astream_notifications, channels_for
+from .outbox import astream_events
+from .pagination import KeysetPagination
+from .search import fallback_index, uses_postgres
+from .serializers import JobSerializer, JobListSerializer, ApplicationListSerializer, InterviewListSerializer
+from accounts.authentication import ANONYMOUS, Principal, TokenAuthentication, aresolve_principal
+
+
+async def _authenticate(drf_request):
+    request = drf_request._request
+    authenticators = drf_request.authenticators
+    forced = getattr(request, '_force_auth_user', None) is not None
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    token_auth = next((auth for auth in authenticators if isinstance(auth, TokenAuthentication)), None)
+    if not forced and token_auth is not None and header.lower().startswith('bearer '):
+        # Token checks are CPU only and the principal usually comes from cache
+        result = await token_auth.aauthenticate(drf_request)
+        drf_request.user, drf_request.auth = result
+    elif (not forced and not header and hasattr(request, 'auser')
+            and any(isinstance(auth, SessionAuthentication) for auth in authenticators)):
+        # Without an Authorization header only the session can authenticate;
+        # load it through the async session API instead of a worker thread.
+        user = await request.auser()
+        drf_request.user = user if user.is_active else AnonymousUser()
+        drf_request.auth = None
+    else:
+        await sync_to_async(lambda: drf_request.user)()
+
+
+async def _aget_principal(request):
+    # Async counterpart of accounts.authentication.get_principal()
+    if isinstance(request.auth, Principal):
+        return request.auth
+    if not request.user.is_authenticated:
+        return ANONYMOUS
+    return await aresolve_principal(request.user.pk) or ANONYMOUS
+
+
+def _detach(response):
+    # Rendered here rather than left to the handler, which would render a
+    # DRF Response on the shared sync thread.
+    http_response = HttpResponse(response.rendered_content, status=response.status_code)
+    for header, value in response.items():
+        http_response[header] = value
+    # Keep .data available as on a DRF Response
+    http_response.data = response.data
+    return http_response
+
+
+def async_read_view(sync_view):
+    """
+    Serve GET with the decorated coroutine and every other method with
+    ``sync_view``. The coroutine receives an authenticated DRF Request.
+
+    Permissions, throttles, content negotiation, exception handling and
+    rendering come from the APIView class behind ``sync_view``, so both
+    versions follow the same @api_view configuration.
+    """
+    def decorator(handler):
+        @csrf_exempt
+        @wraps(handler)
+        async def view(request, *args, **kwargs):
+            if request.method != 'GET':
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+            api_view = sync_view.cls(**sync_view.initkwargs)
+            api_view.args, api_view.kwargs = args, kwargs
+            drf_request = api_view.initialize_request(request, *args, **kwargs)
+            api_view.request = drf_request
+            api_view.headers = api_view.default_response_headers
+            try:
+                await _authenticate(drf_request)
+                api_view.initial(drf_request, *args, **kwargs)
+                response = await handler(drf_request, *args, **kwargs)
+            except Exception as exc:
+                response = api_view.handle_exception(exc)
+            response = api_view.finalize_response(drf_request, response, *args, **kwargs)
+            if not isinstance(response, Response):
+                # Nothing to render, e.g. 304 Not Modified or a stream
+                return response
+            if response.accepted_renderer.format == 'api':
+                # The browsable API introspects the view and may query
+                await sync_to_async(response.render)()
+            return _detach(response)
+        return view
+    return decorator
+
+
+async def _apaginated_list(request, queryset, serializer_class, paginator):
+    queryset, render = views._list_query(request, queryset, serializer_class, paginator)
+    page = await paginator.apaginate_queryset(queryset, request)
+    return paginator.get_paginated_response(render(page))
+
+
+@async_read_view(views.jobs)
+async def jobs(request):
+    cache_key = job_list_cache_key(request)
+    cached = get_cached_response(cache_key, request)
+    if cached is not None:
+        return cached
+
+    validators = await alist_validators(request, [JOBS])
+    response = not_modified(request, *validators)
+    if response is not None:
+        return response
+    if request.query_params.get('q', '').strip() and not uses_postgres():
+        await fallback_index.aload()
+    queryset, paginator = views._job_list_query(request)
+    return cache_response(
+        cache_key, await _apaginated_list(request, queryset, JobListSerializer, paginator), validators)
+
+
+@async_read_view(views.job_detail)
+async def job_detail(request, pk):
+    cache_key = job_detail_cache_key(pk)
+    cached = get_cached_response(cache_key, request)
+    if cached is not None:
+        return cached
+
+    try:
+        job = await Job.objects.select_related('company').aget(pk=pk)
+    except Job.DoesNotExist:
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    validators = job_validators(job)
+    response = not_modified(request, *validators)
+    if response is not None:
+        return response
+    return cache_response(cache_key, Response(JobSerializer(job).data), validators)
+
+
+@async_read_view(views.applications)
+async def applications(request):
+    principal = await _aget_principal(request)
+    applications, error = views._role_scoped(principal, Application.objects.all(), 'seeker_id', 'job__company_id')
+    if error is not None:
+        return error
+    applications = views._filter_applicants(request, applications)
+    validators = await alist_validators(request, application_collections(principal))
+    response = not_modified(request, *validators, cache_control='private, no-cache')
+    if response is not None:
+        return response
+    response = await _apaginated_list(request, applications, ApplicationListSerializer, KeysetPagination('applied_date'))
+    return set_validators(response, *validators, cache_control='private, no-cache')
+
+
+@async_read_view(views.interviews)
+async def interviews(request):
+    principal = await _aget_principal(request)
+    interviews, error = views._role_scoped(
+        principal, Interview.objects.all(), 'seeker_id', 'application__job__company_id')
+    if error is not None:
+        return error
+    return await _apaginated_list(request, interviews, InterviewListSerializer, KeysetPagination('schedule'))
+
+
+@async_read_view(views.application_export)
+async def application_export(request):
+    applications, fmt, error = views._export_query(request, await _aget_principal(request))
+    if error is not None:
+        return error
+    return views._export_response(astream_applications(applications, fmt), fmt)
+
+
+@async_read_view(views.change_event_stream)
+async def change_event_stream(request):
+    params = views._event_stream_params(request)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    return views._event_stream_response(astream_events(
+        params.validated_data['after'], params.validated_data.get('entity'), params.validated_data['limit']))
+
+
+@async_read_view(views.notification_stream)
+async def notification_stream(request):
+    # Waits on the in-process hub instead of polling like the sync view
+    principal = await _aget_principal(request)
+    if principal is ANONYMOUS and request.query_params.get('token'):
+        principal = await aprincipal_for_token(request.query_params['token']) or ANONYMOUS
+    if not channels_for(principal):
+        return Response({'error': 'Job seeker or employer profile required'}, status=status.HTTP_403_FORBIDDEN)
+    return views._event_stream_response(astream_notifications(principal, views._last_event_id(request)))
+
@@ -0,0 +1,118 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from .conditional import not_modified, set_validators
+
+CACHE_ALIAS = 'job_listing'
+GENERATION_KEY = 'jobs:list:generation'
+# An empty expand= means "no nesting", which differs from leaving it out
+KEEP_EMPTY_PARAMS = ('fields', 'expand')
+
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[CACHE_ALIAS if CACHE_ALIAS in settings.CACHES else 'default']
+
+
+def _record(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def cache_stats():
+    with _stats_lock:
+        hits, misses = _stats['hits'], _stats['misses']
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_ratio': hits / total if total else 0.0}
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats['hits'] = _stats['misses'] = 0
+
+
+def _listing_generation(cache):
+    # Listing keys embed a generation so one write drops every cached page.
+    # A time based value keeps a regenerated key (e.g. after LRU eviction)
+    # from colliding with older entries.
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = time.time_ns()
+        cache.add(GENERATION_KEY, generation, None)
+        generation = cache.get(GENERATION_KEY, generation)
+    return generation
+
+
+def job_list_cache_key(request):
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+        if value != '' or key in KEEP_EMPTY_PARAMS
+    )
+    raw = '%s|%s' % (request.get_host(), '&'.join('%s=%s' % item for item in params))
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return 'jobs:list:%s:%s' % (_listing_generation(get_cache()), digest)
+
+
+def job_detail_cache_key(pk):
+    return 'jobs:detail:%s' % pk
+
+
+def get_cached_response(key, request=None):
+    """
+    The cached response for ``key``, or None. With ``request``, a cached
+    version the client already holds is answered 304 instead.
+    """
+    entry = get_cache().get(key)
+    if entry is None:
+        _record('misses')
+        return None
+    _record('hits')
+    data, validators = entry
+    response = not_modified(request, *validators) if request is not None and validators else None
+    if response is None:
+        response = Response(data)
+        if validators:
+            set_validators(response, *validators)
+    response['X-Cache'] = 'HIT'
+    return response
+
+
+def cache_response(key, response, validators=None):
+    """
+    Cache a 200 response along with its (etag, last modified) ``validators``,
+    which must have been read before the data they describe.
+    """
+    if validators:
+        set_validators(response, *validators)
+    if response.status_code == 200:
+        get_cache().set(key, (response.data, validators))
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+def _invalidate(job_id):
+    cache = get_cache()
+    cache.set(GENERATION_KEY, time.time_ns(), None)
+    if job_id is not None:
+        cache.delete(job_detail_cache_key(job_id))
+
+
+def invalidate_job(job_id=None):
+    """
+    Drop the cached detail of ``job_id`` and every cached listing page.
+
+    Runs immediately and again once the surrounding transaction commits, so
+    a reader cannot re-cache the pre-commit state in between.
+    """
+    _invalidate(job_id)
+    transaction.on_commit(lambda: _invalidate(job_id))
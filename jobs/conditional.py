@@ -0,0 +1,118 @@
+"""
+Validators for conditional GETs (ETag / Last-Modified).
+
+A job's detail is validated by Job.updated_at. Lists have no single row to
+look at, so every write to a collection bumps its CollectionVersion row in
+the same transaction, and a list's validators come from one primary key
+lookup of those rows plus the request URL. Either way a request that
+already holds the current version is answered 304 before the body is
+queried or serialized.
+"""
+import hashlib
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import CollectionVersion
+
+JOBS = 'jobs'
+# Seeker profiles; not a served list, read by the matching engine's sync
+SEEKERS = 'seekers'
+
+
+def seeker_applications(seeker_id):
+    return 'applications:seeker:%s' % seeker_id
+
+
+def company_applications(company_id):
+    return 'applications:company:%s' % company_id
+
+
+def application_collections(principal):
+    """Collections behind the caller's applications list, which nests job fields."""
+    if principal.role == 'job_seeker':
+        return [JOBS, seeker_applications(principal.seeker_id)]
+    return [JOBS, company_applications(principal.company_id)]
+
+
+def bump(names):
+    """Move the collections ``names`` to a new version. Call inside the writing transaction."""
+    # Sorted, so concurrent writers lock the rows in the same order
+    names = sorted(set(names))
+    if not names:
+        return
+    changes = {'version': F('version') + 1, 'updated_at': timezone.now()}
+    with transaction.atomic(savepoint=False):
+        rows = CollectionVersion.objects.filter(name__in=names)
+        if rows.update(**changes) < len(names):
+            existing = set(rows.values_list('name', flat=True))
+            missing = [name for name in names if name not in existing]
+            CollectionVersion.objects.bulk_create([CollectionVersion(name=name) for name in missing], ignore_conflicts=True)
+            CollectionVersion.objects.filter(name__in=missing).update(**changes)
+
+
+def applications_changed(pairs):
+    """Bump the lists holding applications of (seeker_id, company_id) pairs."""
+    names = set()
+    for seeker_id, company_id in pairs:
+        names.update((seeker_applications(seeker_id), company_applications(company_id)))
+    bump(names)
+
+
+def make_etag(*parts):
+    # Weak: the same data may be rendered as JSON or as the browsable API
+    return 'W/"%s"' % hashlib.sha1('|'.join(map(str, parts)).encode('utf-8')).hexdigest()
+
+
+def job_validators(job):
+    return make_etag('job', job.pk, job.updated_at.timestamp()), job.updated_at
+
+
+def _list_validators(request, names, rows):
+    versions = {name: (version, updated_at) for name, version, updated_at in rows}
+    parts, last_modified = [request.build_absolute_uri()], None
+    for name in names:
+        version, updated_at = versions.get(name, (0, None))
+        parts.append('%s=%s@%s' % (name, version, updated_at.timestamp() if updated_at else ''))
+        if updated_at is not None and (last_modified is None or updated_at > last_modified):
+            last_modified = updated_at
+    return make_etag(*parts), last_modified
+
+
+def _versions(names):
+    return CollectionVersion.objects.filter(name__in=names).values_list('name', 'version', 'updated_at')
+
+
+def list_validators(request, names):
+    """(etag, last modified) of a list over the collections ``names``; one query."""
+    return _list_validators(request, names, _versions(names))
+
+
+async def alist_validators(request, names):
+    return _list_validators(request, names, [row async for row in _versions(names)])
+
+
+def set_validators(response, etag, last_modified=None, cache_control='no-cache'):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Revalidate every time; Last-Modified alone would let browsers guess a
+    # freshness lifetime and skip the request.
+    response['Cache-Control'] = cache_control
+    return response
+
+
+def not_modified(request, etag, last_modified=None, cache_control='no-cache'):
+    """
+    A 304 carrying the validators if ``request`` already holds this version,
+    else None. If-Modified-Since has one second resolution, so clients
+    should prefer If-None-Match (which takes precedence when both are sent).
+    """
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified.timestamp()) if last_modified else None)
+    if response is not None:
+        set_validators(response, etag, last_modified, cache_control)
+    return response
@@ -0,0 +1,112 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import Application, CompanyApplicationCounts, Job, JobApplicationCounts
+
+STATUSES = [value for value, _ in Application.STATUS_CHOICES]
+COUNT_FIELDS = ['total'] + STATUSES
+
+
+def counts_dict(row, prefix=''):
+    """{'total': n, '<status>': n, ...} from a values() row; missing counts are 0."""
+    return {field: row.get(prefix + field) or 0 for field in COUNT_FIELDS}
+
+
+def _apply(model, key_field, deltas):
+    # Rows receiving the same change share one UPDATE ... WHERE key IN (...)
+    groups = defaultdict(list)
+    for key, counts in deltas.items():
+        change = tuple(sorted((field, delta) for field, delta in counts.items() if delta))
+        if change:
+            groups[change].append(key)
+    for change, keys in groups.items():
+        changes = {field: F(field) + delta for field, delta in change}
+        rows = model.objects.filter(**{key_field + '__in': keys})
+        if rows.update(**changes) < len(keys):
+            # First counted application for some of them
+            existing = set(rows.values_list(key_field, flat=True))
+            missing = [key for key in keys if key not in existing]
+            model.objects.bulk_create([model(**{key_field: key}) for key in missing], ignore_conflicts=True)
+            model.objects.filter(**{key_field + '__in': missing}).update(**changes)
+
+
+def apply_changes(changes):
+    """
+    Add (job_id, company_id, status, delta) changes to the job and company
+    counters with one F() UPDATE per affected row, so concurrent writers
+    never lose increments. Call inside the transaction that changed the
+    applications.
+    """
+    jobs, companies = defaultdict(Counter), defaultdict(Counter)
+    for job_id, company_id, status, delta in changes:
+        for deltas, key in ((jobs, job_id), (companies, company_id)):
+            deltas[key][status] += delta
+            deltas[key]['total'] += delta
+    with transaction.atomic(savepoint=False):
+        _apply(JobApplicationCounts, 'job_id', jobs)
+        _apply(CompanyApplicationCounts, 'company_id', companies)
+
+
+def applications_created(rows):
+    """Count new applications for (job_id, company_id, status) rows."""
+    apply_changes((job_id, company_id, status, 1) for job_id, company_id, status in rows)
+
+
+def status_changed(rows, new_status):
+    """Move (job_id, company_id, old_status) applications to ``new_status``."""
+    changes = []
+    for job_id, company_id, old_status in rows:
+        if old_status != new_status:
+            changes += [(job_id, company_id, old_status, -1), (job_id, company_id, new_status, 1)]
+    apply_changes(changes)
+
+
+def applications_deleted(applications):
+    """Uncount an Application queryset that is about to be deleted."""
+    rows = applications.values('job_id', 'job__company_id', 'status').annotate(n=Count('id')).order_by()
+    apply_changes((row['job_id'], row['job__company_id'], row['status'], -row['n']) for row in rows)
+
+
+def _expected_counts(key_field):
+    expected = defaultdict(Counter)
+    rows = Application.objects.values(key_field, 'status').annotate(n=Count('id')).order_by()
+    for row in rows.iterator():
+        expected[row[key_field]][row['status']] += row['n']
+        expected[row[key_field]]['total'] += row['n']
+    return expected
+
+
+def _reconcile(model, key_field, keys, expected, batch_size):
+    existing = {getattr(row, key_field): row for row in model.objects.all().iterator()}
+    missing, stale = [], []
+    for key in sorted(set(keys) | set(existing)):
+        counts = {field: expected.get(key, {}).get(field, 0) for field in COUNT_FIELDS}
+        row = existing.get(key)
+        if row is None:
+            missing.append(model(**{key_field: key}, **counts))
+        elif any(getattr(row, field) != value for field, value in counts.items()):
+            for field, value in counts.items():
+                setattr(row, field, value)
+            stale.append(row)
+    model.objects.bulk_create(missing, batch_size=batch_size, ignore_conflicts=True)
+    model.objects.bulk_update(stale, COUNT_FIELDS, batch_size=batch_size)
+    return len(missing) + len(stale)
+
+
+def reconcile_counts(batch_size=1000):
+    """
+    Recount every job's and company's applications with two GROUP BY
+    queries and write back only the rows that drifted. Returns
+    (job rows fixed, company rows fixed).
+    """
+    jobs = list(Job.objects.values_list('id', 'company_id'))
+    with transaction.atomic():
+        fixed_jobs = _reconcile(
+            JobApplicationCounts, 'job_id', [job_id for job_id, _ in jobs],
+            _expected_counts('job_id'), batch_size)
+        fixed_companies = _reconcile(
+            CompanyApplicationCounts, 'company_id', [company_id for _, company_id in jobs],
+            _expected_counts('job__company_id'), batch_size)
+    return fixed_jobs, fixed_companies
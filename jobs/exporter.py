@@ -0,0 +1,79 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Application
+
+# (column name, ORM lookup)
+APPLICATION_EXPORT_FIELDS = (
+    ('id', 'id'),
+    ('status', 'status'),
+    ('applied_date', 'applied_date'),
+    ('job_id', 'job_id'),
+    ('job_title', 'job__title'),
+    ('job_location', 'job__location'),
+    ('job_type', 'job__job_type'),
+    ('seeker_id', 'seeker_id'),
+    ('seeker_username', 'seeker__user__username'),
+    ('seeker_email', 'seeker__user__email'),
+    ('seeker_experience_level', 'seeker__experience_level'),
+    ('seeker_skills', 'seeker__skills'),
+)
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def iter_application_rows(queryset, chunk_size=2000):
+    lookups = [lookup for _, lookup in APPLICATION_EXPORT_FIELDS]
+    # values_list + iterator() uses a server-side cursor where supported and
+    # never materialises model instances or the full result set.
+    return queryset.order_by('id').values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+def _encoder(fmt):
+    """(header line, row -> line) for an export format."""
+    names = [name for name, _ in APPLICATION_EXPORT_FIELDS]
+    if fmt == 'csv':
+        writer = csv.writer(Echo())
+        return writer.writerow(names), writer.writerow
+    return None, lambda row: json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def stream_applications(queryset, fmt, chunk_size=2000):
+    header, encode = _encoder(fmt)
+    if header is not None:
+        yield header
+    for row in iter_application_rows(queryset, chunk_size):
+        yield encode(row)
+
+
+async def astream_applications(queryset, fmt, chunk_size=2000):
+    """
+    stream_applications() for ASGI, which reads a sync iterator whole before
+    sending it; this one holds a chunk at a time. QuerySet.aiterator() runs
+    values_list queries on the event loop, so chunks of the sync iterator
+    are fetched on the thread that owns its cursor instead.
+    """
+    header, encode = _encoder(fmt)
+    if header is not None:
+        yield header
+    rows = await sync_to_async(iter_application_rows)(queryset, chunk_size)
+    next_chunk = sync_to_async(lambda: list(islice(rows, chunk_size)))
+    while True:
+        chunk = await next_chunk()
+        if chunk:
+            yield ''.join(map(encode, chunk))
+        if len(chunk) < chunk_size:
+            return
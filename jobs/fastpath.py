@@ -0,0 +1,123 @@
+from functools import lru_cache
+
+from django.conf import settings
+from rest_framework import serializers
+
+from accounts.models import Company, EmployerProfile, JobSeekerProfile
+
+# Column holding what Model.__str__ returns, for StringRelatedField
+STRING_LOOKUPS = {
+    JobSeekerProfile: 'user__username',
+    EmployerProfile: 'company__name',
+    Company: 'name',
+}
+
+# Fields whose to_representation() is the identity for values read from the
+# database; anything else goes through the field's own to_representation().
+IDENTITY_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+    serializers.PrimaryKeyRelatedField,
+    serializers.ReadOnlyField,
+)
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+def fast_serialization_enabled():
+    return getattr(settings, 'JOBS_FAST_SERIALIZATION', False)
+
+
+class FieldPlan:
+    """
+    Precompiled read path for a serializer: which ``values()`` lookups to
+    fetch and how to turn each row dict into the serializer's output.
+    """
+
+    def __init__(self, steps, lookups):
+        # steps: (output key, lookup, converter or None, nested FieldPlan or None)
+        self.steps = steps
+        self.lookups = lookups
+
+    def values(self, queryset, extra=()):
+        lookups = list(self.lookups)
+        lookups.extend(name for name in extra if name not in lookups)
+        return queryset.values(*lookups)
+
+    def render_row(self, row):
+        out = {}
+        for key, lookup, converter, nested in self.steps:
+            value = row[lookup]
+            if value is None:
+                out[key] = None
+            elif nested is not None:
+                out[key] = nested.render_row(row)
+            elif converter is None:
+                out[key] = value
+            else:
+                out[key] = converter(value)
+        return out
+
+    def render(self, rows):
+        render_row = self.render_row
+        return [render_row(row) for row in rows]
+
+
+def _compile(serializer, prefix, lookups):
+    model = serializer.Meta.model
+    steps = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        source = field.source
+        if '.' in source or source == '*':
+            raise UnsupportedField('%s.%s' % (type(serializer).__name__, name))
+        lookup = prefix + source
+        if isinstance(field, serializers.ListSerializer):
+            raise UnsupportedField('%s.%s' % (type(serializer).__name__, name))
+        if isinstance(field, serializers.ModelSerializer):
+            nested = _compile(field, lookup + '__', lookups)
+            steps.append((name, lookup, None, nested))
+        elif isinstance(field, serializers.StringRelatedField):
+            related_model = model._meta.get_field(source).related_model
+            if related_model not in STRING_LOOKUPS:
+                raise UnsupportedField('%s.%s' % (type(serializer).__name__, name))
+            lookup = '%s__%s' % (lookup, STRING_LOOKUPS[related_model])
+            steps.append((name, lookup, None, None))
+        elif isinstance(field, IDENTITY_FIELDS):
+            steps.append((name, lookup, None, None))
+        elif isinstance(field, (serializers.RelatedField, serializers.SerializerMethodField)):
+            raise UnsupportedField('%s.%s' % (type(serializer).__name__, name))
+        else:
+            steps.append((name, lookup, field.to_representation, None))
+        if lookup not in lookups:
+            lookups.append(lookup)
+    return FieldPlan(steps, lookups)
+
+
+@lru_cache(maxsize=256)
+def _cached_plan(serializer_class, fields, expand):
+    kwargs = {}
+    if fields is not None:
+        kwargs['fields'] = list(fields)
+    if expand is not None:
+        kwargs['expand'] = list(expand)
+    return _compile(serializer_class(**kwargs), '', [])
+
+
+def compile_plan(serializer_class, fields=None, expand=None):
+    """
+    Return the FieldPlan for ``serializer_class`` with the given
+    ``fields``/``expand`` selection (see ExpandableFieldsMixin). Plans are
+    cached per selection. Raises UnsupportedField if the serializer uses a
+    field the plan cannot reproduce exactly.
+    """
+    return _cached_plan(
+        serializer_class,
+        tuple(fields) if fields is not None else None,
+        tuple(expand) if expand is not None else None,
+    )
@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core import signing
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from accounts.authentication import resolve_principal
+from accounts.tokens import password_fingerprint
+from .models import Interview, InterviewDeletion
+
+FEED_TOKEN_SALT = 'jobs.ical.feed'
+SYNC_TOKEN_SALT = 'jobs.ical.sync'
+# Past interviews kept in the feed
+FEED_HISTORY = timedelta(days=90)
+# Sync tokens, and the tombstones behind them, are honoured this long
+SYNC_RETENTION = timedelta(days=30)
+# updated_at is set before commit, so a change can become visible after a
+# later-stamped one. Each delta re-reads this much before the token; clients
+# upsert by id, so repeats are harmless.
+SYNC_OVERLAP = timedelta(seconds=10)
+
+# (output key, ORM lookup); flat values() rows instead of the nested
+# Application -> Job -> Company serializer tree. The job and company fields
+# are covered by Job.updated_at, which company saves move too (jobs.signals).
+INTERVIEW_SYNC_FIELDS = (
+    ('id', 'id'),
+    ('application', 'application_id'),
+    ('schedule', 'schedule'),
+    ('ends_at', 'ends_at'),
+    ('updated_at', 'updated_at'),
+    ('job_title', 'application__job__title'),
+    ('company', 'application__job__company__name'),
+    ('candidate', 'application__seeker__user__username'),
+    ('interviewer', 'interviewer__user__username'),
+)
+
+
+class InvalidSyncToken(Exception):
+    pass
+
+
+def party_filters(principal):
+    """
+    (interview filter, tombstone filter) for the caller's own interviews:
+    as interviewer for employers, as candidate for job seekers. None for
+    anyone else.
+    """
+    if principal.employer_id is not None:
+        return Q(interviewer_id=principal.employer_id), Q(interviewer_id=principal.employer_id)
+    if principal.seeker_id is not None:
+        return Q(seeker_id=principal.seeker_id), Q(seeker_id=principal.seeker_id)
+    return None
+
+
+def feed_token(user):
+    """Secret for a feed URL; changing the password revokes it."""
+    return signing.dumps([user.pk, password_fingerprint(user)], salt=FEED_TOKEN_SALT, compress=True)
+
+
+def feed_principal(token):
+    """Principal a feed token was issued to; None if invalid or revoked."""
+    try:
+        user_id, fingerprint = signing.loads(token, salt=FEED_TOKEN_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    principal = resolve_principal(user_id)
+    if principal is None or password_fingerprint(principal.user) != fingerprint:
+        return None
+    return principal
+
+
+def feed_etag(interview_filter, today):
+    """
+    ETag of a feed, from one aggregate over the caller's interviews (served
+    by the (interviewer, updated_at) or (seeker, updated_at) index). Any
+    edit moves the max updated_at of the interview or of its job, and any
+    delete changes the count. The feed window moves daily, so the date is
+    part of the tag too.
+    """
+    state = Interview.objects.filter(interview_filter).aggregate(
+        count=Count('id'), latest=Max('updated_at'), job_latest=Max('application__job__updated_at'))
+    latest = max(state['latest'].timestamp(), state['job_latest'].timestamp()) if state['latest'] else 0
+    return '"%s-%d-%.6f"' % (today.isoformat(), state['count'], latest)
+
+
+def _escape(text):
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def _fold(line):
+    # RFC 5545 3.1: lines of at most 75 octets, continuation lines start
+    # with a space; never split a UTF-8 sequence.
+    data = line.encode('utf-8')
+    parts, limit = [], 75
+    while len(data) > limit:
+        cut = limit
+        while data[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode('utf-8'))
+        data, limit = data[cut:], 74
+    parts.append(data.decode('utf-8'))
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _stamp(moment):
+    return moment.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def iter_calendar(rows, name):
+    """iCalendar (RFC 5545) lines for interview rows from interview_rows()."""
+    yield _fold('BEGIN:VCALENDAR')
+    yield _fold('VERSION:2.0')
+    yield _fold('PRODID:-//Job Portal//Interviews//EN')
+    yield _fold('CALSCALE:GREGORIAN')
+    yield _fold('METHOD:PUBLISH')
+    yield _fold('X-WR-CALNAME:' + _escape(name))
+    for row in rows:
+        yield _fold('BEGIN:VEVENT')
+        yield _fold('UID:interview-%d@jobportal' % row['id'])
+        yield _fold('DTSTAMP:' + _stamp(row['updated_at']))
+        yield _fold('LAST-MODIFIED:' + _stamp(row['updated_at']))
+        yield _fold('DTSTART:' + _stamp(row['schedule']))
+        yield _fold('DTEND:' + _stamp(row['ends_at']))
+        yield _fold('SUMMARY:' + _escape('Interview: %s (%s)' % (row['job_title'], row['company'])))
+        yield _fold('DESCRIPTION:' + _escape('Candidate: %s\nInterviewer: %s' % (row['candidate'], row['interviewer'])))
+        yield _fold('END:VEVENT')
+    yield _fold('END:VCALENDAR')
+
+
+def interview_rows(queryset):
+    keys = [key for key, _ in INTERVIEW_SYNC_FIELDS]
+    for values in queryset.values_list(*[lookup for _, lookup in INTERVIEW_SYNC_FIELDS]):
+        yield dict(zip(keys, values))
+
+
+def feed_rows(interview_filter, now):
+    queryset = Interview.objects.filter(interview_filter, ends_at__gte=now - FEED_HISTORY).order_by('schedule', 'id')
+    return interview_rows(queryset)
+
+
+def sync_token(user, moment):
+    return signing.dumps([user.pk, moment.timestamp()], salt=SYNC_TOKEN_SALT)
+
+
+def read_sync_token(user, token):
+    """The moment a sync token was issued; InvalidSyncToken if unusable."""
+    try:
+        user_id, stamp = signing.loads(token, salt=SYNC_TOKEN_SALT, max_age=SYNC_RETENTION)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidSyncToken('Invalid or expired sync token')
+    if user_id != user.pk:
+        raise InvalidSyncToken('Invalid or expired sync token')
+    return datetime.fromtimestamp(stamp, dt_timezone.utc)
+
+
+def interview_changes(filters, since=None):
+    """
+    (changed rows, deleted ids, new sync moment) for the caller's
+    interviews; everything current when ``since`` is None. An edit to the
+    job (or its company) re-sends the job's interviews.
+    """
+    interview_filter, deletion_filter = filters
+    now = timezone.now()
+    interviews = Interview.objects.filter(interview_filter)
+    deleted = []
+    if since is not None:
+        cutoff = since - SYNC_OVERLAP
+        interviews = interviews.filter(Q(updated_at__gt=cutoff) | Q(application__job__updated_at__gt=cutoff))
+        deleted = list(
+            InterviewDeletion.objects.filter(deletion_filter, deleted_at__gt=cutoff)
+            .values_list('interview_id', flat=True)
+        )
+    return list(interview_rows(interviews.order_by('updated_at', 'id'))), deleted, now
@@ -0,0 +1,96 @@
+import codecs
+import csv
+import json
+import os
+
+from django.db import transaction
+
+from .cache import invalidate_job
+from .conditional import JOBS, bump
+from .outbox import record_jobs
+from .matching import engine
+from .models import Job
+from .search import index_jobs
+from .serializers import JobImportSerializer
+from .skills import index_new_jobs
+
+FORMATS = ('csv', 'jsonl')
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(filename, fmt=None):
+    fmt = (fmt or os.path.splitext(filename or '')[1].lstrip('.')).lower()
+    if fmt == 'json':
+        fmt = 'jsonl'
+    if fmt not in FORMATS:
+        raise ImportFormatError('Unsupported format, expected one of: %s' % ', '.join(FORMATS))
+    return fmt
+
+
+def iter_rows(stream, fmt):
+    """Yield (row_number, data) pairs from a binary stream, one row at a time."""
+    lines = codecs.getreader('utf-8-sig')(stream)
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(lines), start=1):
+            # Empty cells mean "not provided", as they would in a form post.
+            yield number, {key: value for key, value in row.items() if key and value != ''}
+        return
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        yield number, data
+
+
+def _write_batch(jobs):
+    with transaction.atomic():
+        created = Job.objects.bulk_create(jobs)
+        index_new_jobs(created)
+        bump([JOBS])
+        record_jobs(created, 'created')
+    index_jobs(created)
+    for job in created:
+        engine.update_job(job)
+    return len(created)
+
+
+def import_jobs(stream, fmt, company_id, posted_by, batch_size=500):
+    """
+    Validate and insert jobs from a CSV/JSONL stream in batches.
+
+    Rows are validated with the same field rules as JobCreateSerializer and
+    written with bulk_create, one transaction per batch, so memory stays flat
+    regardless of file size. Returns a report with per-row errors (the first
+    MAX_REPORTED_ERRORS of them).
+    """
+    report = {'created': 0, 'failed': 0, 'errors': []}
+    batch = []
+    for number, data in iter_rows(stream, fmt):
+        if not isinstance(data, dict):
+            errors = {'non_field_errors': ['Invalid row']}
+        else:
+            serializer = JobImportSerializer(data=data)
+            if serializer.is_valid():
+                batch.append(Job(company_id=company_id, posted_by=posted_by, **serializer.validated_data))
+                if len(batch) >= batch_size:
+                    report['created'] += _write_batch(batch)
+                    batch = []
+                continue
+            errors = serializer.errors
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': number, 'errors': errors})
+    if batch:
+        report['created'] += _write_batch(batch)
+    if report['created']:
+        invalidate_job()
+    return report
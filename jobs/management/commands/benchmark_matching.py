@@ -0,0 +1,35 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.matching import MatchingEngine
+
+
+class Command(BaseCommand):
+    help = 'Time job recommendations against a synthetic in-memory skill matrix'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=200000)
+        parser.add_argument('--skills', type=int, default=5000)
+        parser.add_argument('--skills-per-job', type=int, default=8)
+        parser.add_argument('--runs', type=int, default=20)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        vocabulary = ['skill%d' % i for i in range(options['skills'])]
+        engine = MatchingEngine()
+        engine.loaded = True  # synthetic data only, never read the database
+        for job_id in range(1, options['jobs'] + 1):
+            engine.jobs.set(job_id, rng.sample(vocabulary, options['skills_per_job']), rng.randint(-1, 8))
+        engine.jobs.flush()
+
+        timings = []
+        for _ in range(options['runs']):
+            skills = ','.join(rng.sample(vocabulary, 12))
+            start = time.perf_counter()
+            engine.recommend_jobs(skills, rng.choice(['fresher', 'experienced']), k=20)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        self.stdout.write('%d jobs: median %.1f ms, max %.1f ms' % (
+            options['jobs'], timings[len(timings) // 2], timings[-1]))
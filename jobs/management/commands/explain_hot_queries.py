@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from jobs.models import Application, Interview, Job
+
+
+class Command(BaseCommand):
+    help = 'Print query plans and timings for the hot query shapes in jobs/views.py'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=20)
+
+    def hot_queries(self):
+        # Oldest active job: the keyset probe lands on the deepest page.
+        job = Job.objects.filter(is_active=True).order_by('posted_at', 'id').first()
+        application = Application.objects.order_by('-id').first()
+        interview = Interview.objects.order_by('-id').first()
+        active = Job.objects.filter(is_active=True)
+        queries = [
+            ('active jobs, first page', active.order_by('-posted_at', '-id')[:21]),
+            ('active jobs by type', active.filter(job_type='full-time').order_by('-posted_at', '-id')[:21]),
+        ]
+        if job is not None:
+            queries.append((
+                'active jobs, keyset page',
+                active.filter(posted_at__lte=job.posted_at)
+                .filter(Q(posted_at__lt=job.posted_at) | Q(posted_at=job.posted_at, id__lt=job.id))
+                .order_by('-posted_at', '-id')[:21],
+            ))
+        if application is not None:
+            queries += [
+                ('applied check', Application.objects.filter(job_id=application.job_id, seeker_id=application.seeker_id)),
+                ('seeker applications', Application.objects.filter(seeker_id=application.seeker_id).order_by('-applied_date', '-id')[:21]),
+                ('job applications by status', Application.objects.filter(job_id=application.job_id, status='applied')),
+            ]
+        if interview is not None:
+            queries.append((
+                'interviewer schedule',
+                Interview.objects.filter(interviewer_id=interview.interviewer_id).order_by('schedule')[:21],
+            ))
+        return queries
+
+    def handle(self, *args, **options):
+        for label, queryset in self.hot_queries():
+            start = time.perf_counter()
+            for _ in range(options['runs']):
+                list(queryset.all())
+            elapsed = (time.perf_counter() - start) * 1000 / options['runs']
+            self.stdout.write(self.style.MIGRATE_HEADING('%s (%.2f ms)' % (label, elapsed)))
+            self.stdout.write(queryset.explain())
+            self.stdout.write('')
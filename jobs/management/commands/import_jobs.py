@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import EmployerProfile
+from jobs.importer import ImportFormatError, detect_format, import_jobs
+
+
+class Command(BaseCommand):
+    help = 'Bulk import jobs for an employer from a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--employer', required=True, help='Username of the posting employer')
+        parser.add_argument('--format', choices=['csv', 'jsonl'])
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        try:
+            employer = EmployerProfile.objects.select_related('user', 'company').get(user__username=options['employer'])
+        except EmployerProfile.DoesNotExist:
+            raise CommandError('No employer profile for %s' % options['employer'])
+        try:
+            fmt = detect_format(options['path'], options['format'])
+        except ImportFormatError as exc:
+            raise CommandError(str(exc))
+
+        with open(options['path'], 'rb') as stream:
+            report = import_jobs(stream, fmt, company_id=employer.company_id, posted_by=employer.user, batch_size=options['batch_size'])
+
+        for error in report['errors']:
+            self.stderr.write('row %(row)s: %(errors)s' % error)
+        self.stdout.write(self.style.SUCCESS('Created %(created)d jobs, %(failed)d rows failed' % report))
@@ -0,0 +1,91 @@
+import asyncio
+import ssl
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+async def fetch(url, headers, slow_client):
+    parts = urlsplit(url)
+    secure = parts.scheme == 'https'
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    lines = ['GET %s HTTP/1.1' % path, 'Host: %s' % parts.netloc, 'Connection: close']
+    lines.extend(headers)
+    payload = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    reader, writer = await asyncio.open_connection(
+        parts.hostname, port, ssl=ssl.create_default_context() if secure else None)
+    try:
+        if slow_client:
+            # Trickle the request head in, like a client on a bad network
+            half = len(payload) // 2
+            writer.write(payload[:half])
+            await writer.drain()
+            await asyncio.sleep(slow_client)
+            payload = payload[half:]
+        writer.write(payload)
+        await writer.drain()
+        status_line = await reader.readline()
+        while await reader.read(65536):
+            pass
+    finally:
+        writer.close()
+    return int(status_line.split()[1])
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive concurrent GET requests at a running server and report throughput '
+        'and latency, e.g. to compare the WSGI and ASGI deployments'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', nargs='+', help='One or more URLs, requested round robin')
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--header', action='append', default=[], help='Extra request header, "Name: value"')
+        parser.add_argument('--slow-client', type=float, default=0.0,
+                            help='Seconds each client pauses halfway through sending its request')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError('--concurrency and --requests must be positive')
+        timings, statuses, elapsed = asyncio.run(self.run(options))
+        if not timings:
+            raise CommandError('No request completed')
+
+        timings.sort()
+        def percentile(p):
+            return timings[min(int(len(timings) * p), len(timings) - 1)] * 1000
+        failed = sum(count for code, count in statuses.items() if code != 200)
+        self.stdout.write('%d requests, concurrency %d, %.2fs' % (len(timings), options['concurrency'], elapsed))
+        self.stdout.write('throughput: %.1f req/s' % (len(timings) / elapsed))
+        self.stdout.write('latency: p50 %.1f ms, p95 %.1f ms, p99 %.1f ms, max %.1f ms' % (
+            percentile(0.50), percentile(0.95), percentile(0.99), timings[-1] * 1000))
+        self.stdout.write('status: %s' % ', '.join('%s x%d' % item for item in sorted(statuses.items(), key=str)))
+        if failed:
+            self.stderr.write('%d requests did not return 200' % failed)
+
+    async def run(self, options):
+        urls = options['url']
+        total = options['requests']
+        timings, statuses = [], {}
+        counter = iter(range(total))
+
+        async def client():
+            for number in counter:
+                start = time.perf_counter()
+                try:
+                    code = await fetch(urls[number % len(urls)], options['header'], options['slow_client'])
+                except OSError as exc:
+                    code = type(exc).__name__
+                timings.append(time.perf_counter() - start)
+                statuses[code] = statuses.get(code, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*[client() for _ in range(min(options['concurrency'], total))])
+        return timings, statuses, time.perf_counter() - start
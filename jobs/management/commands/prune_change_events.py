@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.models import ChangeEvent
+from jobs.outbox import OUTBOX_RETENTION
+
+
+class Command(BaseCommand):
+    help = 'Delete change events older than the outbox retention period'
+
+    def handle(self, *args, **options):
+        deleted, _ = ChangeEvent.objects.filter(created_at__lt=timezone.now() - OUTBOX_RETENTION).delete()
+        self.stdout.write(self.style.SUCCESS('Pruned %d change events' % deleted))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.ical import SYNC_RETENTION
+from jobs.models import InterviewDeletion
+
+
+class Command(BaseCommand):
+    help = 'Delete interview tombstones older than any sync token still accepted'
+
+    def handle(self, *args, **options):
+        deleted, _ = InterviewDeletion.objects.filter(deleted_at__lt=timezone.now() - SYNC_RETENTION).delete()
+        self.stdout.write(self.style.SUCCESS('Pruned %d interview deletions' % deleted))
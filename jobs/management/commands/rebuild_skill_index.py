@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import Job
+from jobs.skills import sync_job_skills
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the Job <-> Skill index from Job.skills_required'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        count = 0
+        jobs = Job.objects.only('id', 'skills_required').iterator(chunk_size=options['chunk_size'])
+        for job in jobs:
+            sync_job_skills(job)
+            count += 1
+        self.stdout.write(self.style.SUCCESS('Indexed skills for %d jobs' % count))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from jobs.counters import reconcile_counts
+
+
+class Command(BaseCommand):
+    help = 'Recount per-job and per-company application counters from the applications table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fixed_jobs, fixed_companies = reconcile_counts(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            'Fixed counters for %d jobs and %d companies' % (fixed_jobs, fixed_companies)))
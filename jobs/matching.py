@@ -0,0 +1,299 @@
+import re
+import threading
+from datetime import timedelta
+
+import numpy as np
+
+from accounts.models import JobSeekerProfile
+from .conditional import JOBS, SEEKERS
+from .models import CollectionVersion, Job
+from .skills import parse_skills
+
+_YEARS = re.compile(r'\d+')
+# updated_at is taken before the writing transaction commits, so rows are
+# re-read from this long before the version another process moved to.
+SYNC_OVERLAP = timedelta(seconds=10)
+
+
+def required_years(text):
+    """Leading number of years in Job.experience_required, or -1 when unknown."""
+    match = _YEARS.search(text or '')
+    return int(match.group()) if match else -1
+
+
+class SkillMatrix:
+    """
+    Sparse row x skill incidence matrix kept as COO numpy arrays.
+
+    Rows are jobs or seekers. Updates are buffered and merged on the next
+    read; replaced rows are tombstoned and the arrays are compacted once
+    dead rows make up a quarter of the matrix.
+    """
+
+    def __init__(self, vocabulary):
+        self.vocabulary = vocabulary  # normalized skill name -> column, shared
+        self.row_of = {}  # object id -> row
+        self.cols_of = {}  # object id -> list of columns
+        self.row_ids = np.zeros(0, dtype=np.int64)
+        self.alive = np.zeros(0, dtype=bool)
+        self.sizes = np.zeros(0, dtype=np.int32)
+        self.attrs = np.zeros(0, dtype=np.float32)
+        self.coo_rows = np.zeros(0, dtype=np.int32)
+        self.coo_cols = np.zeros(0, dtype=np.int32)
+        self._pending = []
+        self._dead = 0
+
+    def __len__(self):
+        return len(self.row_of)
+
+    def columns(self, names, grow=False):
+        cols = []
+        for name in names:
+            col = self.vocabulary.get(name)
+            if col is None and grow:
+                col = self.vocabulary[name] = len(self.vocabulary)
+            if col is not None:
+                cols.append(col)
+        return cols
+
+    def set(self, obj_id, names, attr):
+        self.remove(obj_id)
+        cols = self.columns(names, grow=True)
+        self.cols_of[obj_id] = cols
+        self.row_of[obj_id] = len(self.row_ids) + len(self._pending)
+        self._pending.append((obj_id, cols, attr))
+
+    def remove(self, obj_id):
+        row = self.row_of.pop(obj_id, None)
+        self.cols_of.pop(obj_id, None)
+        if row is None:
+            return
+        if row >= len(self.row_ids):
+            # Still buffered: drop it from the pending batch.
+            index = row - len(self.row_ids)
+            self._pending[index] = None
+        else:
+            self.alive[row] = False
+        self._dead += 1
+
+    def flush(self):
+        if self._pending:
+            start = len(self.row_ids)
+            ids, sizes, attrs, alive, rows, cols = [], [], [], [], [], []
+            for offset, entry in enumerate(self._pending):
+                if entry is None:
+                    ids.append(-1)
+                    sizes.append(0)
+                    attrs.append(0)
+                    alive.append(False)
+                    continue
+                obj_id, obj_cols, attr = entry
+                ids.append(obj_id)
+                sizes.append(len(obj_cols))
+                attrs.append(attr)
+                alive.append(True)
+                rows.extend([start + offset] * len(obj_cols))
+                cols.extend(obj_cols)
+            self.row_ids = np.concatenate([self.row_ids, np.array(ids, dtype=np.int64)])
+            self.sizes = np.concatenate([self.sizes, np.array(sizes, dtype=np.int32)])
+            self.attrs = np.concatenate([self.attrs, np.array(attrs, dtype=np.float32)])
+            self.alive = np.concatenate([self.alive, np.array(alive, dtype=bool)])
+            self.coo_rows = np.concatenate([self.coo_rows, np.array(rows, dtype=np.int32)])
+            self.coo_cols = np.concatenate([self.coo_cols, np.array(cols, dtype=np.int32)])
+            self._pending = []
+        if self._dead and self._dead * 4 > len(self.row_ids):
+            self.compact()
+
+    def compact(self):
+        keep = np.flatnonzero(self.alive)
+        remap = np.full(len(self.row_ids), -1, dtype=np.int32)
+        remap[keep] = np.arange(len(keep), dtype=np.int32)
+        live_entries = self.alive[self.coo_rows]
+        self.coo_rows = remap[self.coo_rows[live_entries]]
+        self.coo_cols = self.coo_cols[live_entries]
+        self.row_ids = self.row_ids[keep]
+        self.sizes = self.sizes[keep]
+        self.attrs = self.attrs[keep]
+        self.alive = np.ones(len(keep), dtype=bool)
+        self.row_of = {int(obj_id): row for row, obj_id in enumerate(self.row_ids)}
+        self._dead = 0
+
+    def hits(self, cols):
+        """Number of the given skill columns present in each row."""
+        if not cols:
+            return np.zeros(len(self.row_ids), dtype=np.int64)
+        mask = np.isin(self.coo_cols, np.asarray(cols, dtype=np.int32))
+        return np.bincount(self.coo_rows[mask], minlength=len(self.row_ids))
+
+
+def top_k(row_ids, scores, k):
+    candidates = np.flatnonzero(scores > 0)
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+    order = candidates[np.lexsort((row_ids[candidates], -scores[candidates]))]
+    return [(int(row_ids[row]), float(scores[row])) for row in order]
+
+
+class MatchingEngine:
+    """
+    Scores seekers against active jobs (and jobs against seekers) in batch.
+
+    A job's score for a seeker is the share of the job's skills the seeker
+    has, scaled down when the seeker's experience level does not fit the
+    years the job asks for.
+
+    The matrices live in each process and follow its own writes through
+    signals. Writes made by other processes are picked up by sync(), from
+    the jobs and seekers collection versions (jobs.conditional).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        vocabulary = {}
+        self.jobs = SkillMatrix(vocabulary)  # attr: required years, -1 unknown
+        self.seekers = SkillMatrix(vocabulary)  # attr: 1.0 experienced, 0.0 fresher
+        self.versions = {}  # collection -> (version, updated_at) the matrices are current with
+        self.loaded = False
+
+    @staticmethod
+    def _versions():
+        rows = CollectionVersion.objects.filter(name__in=[JOBS, SEEKERS]).values_list('name', 'version', 'updated_at')
+        return {name: (version, updated_at) for name, version, updated_at in rows}
+
+    @staticmethod
+    def _job_rows():
+        return Job.objects.values_list('id', 'is_active', 'skills_required', 'experience_required')
+
+    @staticmethod
+    def _seeker_rows():
+        return JobSeekerProfile.objects.values_list('id', 'skills', 'resume_content__skills', 'experience_level')
+
+    def _set_job(self, job_id, is_active, skills, experience):
+        if is_active:
+            self.jobs.set(job_id, parse_skills(skills), required_years(experience))
+        else:
+            self.jobs.remove(job_id)
+
+    def _set_seeker(self, seeker_id, skills, resume_skills, level):
+        skills = ','.join(filter(None, [skills, resume_skills]))
+        self.seekers.set(seeker_id, parse_skills(skills), self.seeker_attr(level))
+
+    def load(self):
+        with self.lock:
+            if self.loaded:
+                return
+            # Read first: changes made while loading move them and are synced later
+            self.versions = self._versions()
+            for row in self._job_rows().filter(is_active=True).iterator(chunk_size=5000):
+                self._set_job(*row)
+            for row in self._seeker_rows().iterator(chunk_size=5000):
+                self._set_seeker(*row)
+            self.jobs.flush()
+            self.seekers.flush()
+            self.loaded = True
+
+    def clear(self):
+        with self.lock:
+            self._reset()
+
+    @staticmethod
+    def _changed(rows, previous, current):
+        if current is None or current == previous:
+            return []
+        if previous is not None:
+            rows = rows.filter(updated_at__gte=previous[1] - SYNC_OVERLAP)
+        return list(rows)
+
+    def sync(self):
+        """
+        Re-read the jobs and seekers changed since the loaded versions of
+        their collections, for those that moved; one query otherwise. Rows
+        deleted outright leave nothing to re-read and are dropped by callers
+        through remove_job() and remove_seeker().
+        """
+        if not self.loaded:
+            return
+        current = self._versions()
+        previous = self.versions
+        if current == previous:
+            return
+        jobs = self._changed(self._job_rows(), previous.get(JOBS), current.get(JOBS))
+        seekers = self._changed(self._seeker_rows(), previous.get(SEEKERS), current.get(SEEKERS))
+        with self.lock:
+            if not self.loaded or self.versions != previous:
+                # Cleared or synced by another thread meanwhile
+                return
+            for row in jobs:
+                self._set_job(*row)
+            for row in seekers:
+                self._set_seeker(*row)
+            self.versions = current
+
+    @staticmethod
+    def seeker_attr(level):
+        return 1.0 if level == 'experienced' else 0.0
+
+    @staticmethod
+    def experience_fit(years, experienced):
+        # Unknown requirements fit everyone; freshers fit up to one year,
+        # experienced seekers fit one year and up. Broadcasts over arrays.
+        fits = (years < 0) | (years == 1) | ((years >= 1) == experienced)
+        return np.where(fits, 1.0, np.where(experienced, 0.75, 0.5))
+
+    def update_job(self, job):
+        with self.lock:
+            if self.loaded:
+                self._set_job(job.pk, job.is_active, job.skills_required, job.experience_required)
+
+    def remove_job(self, job_id):
+        with self.lock:
+            if self.loaded:
+                self.jobs.remove(job_id)
+
+    def update_seeker(self, seeker):
+        with self.lock:
+            if self.loaded:
+                skills = parse_skills(seeker.matching_skills)
+                self.seekers.set(seeker.pk, skills, self.seeker_attr(seeker.experience_level))
+
+    def remove_seeker(self, seeker_id):
+        with self.lock:
+            if self.loaded:
+                self.seekers.remove(seeker_id)
+
+    def recommend_jobs(self, skills, experience_level, k=20):
+        """Top ``k`` (job_id, score) pairs for a seeker, best first."""
+        self.load()
+        self.sync()
+        with self.lock:
+            matrix = self.jobs
+            matrix.flush()
+            hits = matrix.hits(matrix.columns(parse_skills(skills)))
+            scores = hits / np.maximum(matrix.sizes, 1)
+            scores = scores * self.experience_fit(matrix.attrs, experience_level == 'experienced')
+            scores[~matrix.alive] = 0
+            return top_k(matrix.row_ids, scores, k)
+
+    def rank_candidates(self, job_id, k=20):
+        """Top ``k`` (seeker_id, score) pairs for an active job, best first."""
+        self.load()
+        self.sync()
+        with self.lock:
+            self.jobs.flush()
+            self.seekers.flush()
+            row = self.jobs.row_of.get(job_id)
+            if row is None:
+                return []
+            cols = self.jobs.cols_of[job_id]
+            years = self.jobs.attrs[row]
+            matrix = self.seekers
+            scores = matrix.hits(cols) / max(len(cols), 1)
+            scores = scores * self.experience_fit(years, matrix.attrs == 1.0)
+            scores[~matrix.alive] = 0
+            return top_k(matrix.row_ids, scores, k)
+
+
+engine = MatchingEngine()
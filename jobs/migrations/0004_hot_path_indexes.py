@@ -0,0 +1,74 @@
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    # Keep the earliest application per (job, seeker) so the unique
+    # constraint can be created.
+    Application = apps.get_model('jobs', 'Application')
+    duplicates = (
+        Application.objects.values('job_id', 'seeker_id')
+        .annotate(first_id=Min('id'), total=Count('id'))
+        .filter(total__gt=1)
+    )
+    for row in duplicates.iterator():
+        Application.objects.filter(job_id=row['job_id'], seeker_id=row['seeker_id']).exclude(id=row['first_id']).delete()
+
+
+def create_location_trigram_index(apps, schema_editor):
+    # location__icontains compiles to UPPER(location) LIKE UPPER(%s) on
+    # PostgreSQL; a trigram GIN index on that expression serves it.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS job_location_trgm_idx "
+        "ON jobs_job USING gin (UPPER(location) gin_trgm_ops) WHERE is_active"
+    )
+
+
+def drop_location_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS job_location_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('jobs', '0003_job_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='application',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('job', 'seeker'), name='unique_application'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['seeker', '-applied_date', '-id'], name='application_seeker_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status'], name='application_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-posted_at', '-id'], name='job_active_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['job_type', '-posted_at', '-id'], name='job_active_type_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['interviewer', 'schedule'], name='interview_interviewer_idx'),
+        ),
+        migrations.RunPython(create_location_trigram_index, drop_location_trigram_index),
+    ]
@@ -0,0 +1,59 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+STATUSES = ['applied', 'shortlisted', 'rejected', 'hired']
+
+
+def populate_counts(apps, schema_editor):
+    Application = apps.get_model('jobs', 'Application')
+    for model_name, key_field, group_field in (
+        ('JobApplicationCounts', 'job_id', 'job_id'),
+        ('CompanyApplicationCounts', 'company_id', 'job__company_id'),
+    ):
+        model = apps.get_model('jobs', model_name)
+        counts = {}
+        rows = Application.objects.values(group_field, 'status').annotate(n=Count('id')).order_by()
+        for row in rows.iterator():
+            row_counts = counts.setdefault(row[group_field], dict.fromkeys(['total'] + STATUSES, 0))
+            if row['status'] in row_counts:
+                row_counts[row['status']] += row['n']
+            row_counts['total'] += row['n']
+        model.objects.bulk_create(
+            [model(**{key_field: key}, **values) for key, values in counts.items()], batch_size=1000)
+
+
+def count_fields():
+    return [(name, models.IntegerField(default=0)) for name in ['total'] + STATUSES]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_resume_pipeline'),
+        ('jobs', '0004_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobApplicationCounts',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='application_counts', serialize=False, to='jobs.job')),
+                *count_fields(),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='CompanyApplicationCounts',
+            fields=[
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='application_counts', serialize=False, to='accounts.company')),
+                *count_fields(),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(populate_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_ends_at(apps, schema_editor):
+    # Existing interviews get the default one hour slot
+    Interview = apps.get_model('jobs', 'Interview')
+    Interview.objects.filter(ends_at__isnull=True).update(ends_at=F('schedule') + timedelta(hours=1))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_application_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='ends_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(fill_ends_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='interview',
+            name='ends_at',
+            field=models.DateTimeField(),
+        ),
+    ]
@@ -0,0 +1,38 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_interview_ends_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['interviewer', 'updated_at'], name='interview_updated_idx'),
+        ),
+        migrations.CreateModel(
+            name='InterviewDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('interview_id', models.BigIntegerField()),
+                ('interviewer_id', models.BigIntegerField()),
+                ('seeker_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['interviewer_id', 'deleted_at'], name='interview_deletion_emp_idx'),
+                    models.Index(fields=['seeker_id', 'deleted_at'], name='interview_deletion_seeker_idx'),
+                ],
+            },
+        ),
+    ]
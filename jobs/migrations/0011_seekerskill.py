@@ -0,0 +1,48 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_seekers(apps, schema_editor):
+    # Same rule as jobs.skills.sync_seeker_skills(), for existing profiles
+    JobSeekerProfile = apps.get_model('accounts', 'JobSeekerProfile')
+    Skill = apps.get_model('jobs', 'Skill')
+    SeekerSkill = apps.get_model('jobs', 'SeekerSkill')
+    from jobs.skills import parse_skills
+
+    profiles = JobSeekerProfile.objects.values_list('id', 'skills', 'resume_content__skills')
+    for start in range(0, profiles.count(), 1000):
+        wanted = {
+            seeker_id: parse_skills(','.join(filter(None, [skills, resume_skills])))
+            for seeker_id, skills, resume_skills in profiles.order_by('id')[start:start + 1000]
+        }
+        names = sorted({name for seeker_names in wanted.values() for name in seeker_names})
+        Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+        skill_ids = dict(Skill.objects.filter(name__in=names).values_list('name', 'id'))
+        SeekerSkill.objects.bulk_create(
+            [SeekerSkill(seeker_id=seeker_id, skill_id=skill_ids[name]) for seeker_id, seeker_names in wanted.items() for name in seeker_names],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_resume_pipeline'),
+        ('jobs', '0010_job_updated_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeekerSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seeker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='accounts.jobseekerprofile')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seeker_links', to='jobs.skill')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['skill', 'seeker'], name='seeker_skill_skill_idx')],
+                'unique_together': {('seeker', 'skill')},
+            },
+        ),
+        migrations.RunPython(index_seekers, migrations.RunPython.noop),
+    ]
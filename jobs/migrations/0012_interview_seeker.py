@@ -0,0 +1,36 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_seeker(apps, schema_editor):
+    Application = apps.get_model('jobs', 'Application')
+    Interview = apps.get_model('jobs', 'Interview')
+    Interview.objects.update(seeker_id=Subquery(
+        Application.objects.filter(pk=OuterRef('application_id')).values('seeker_id')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_company_name_key'),
+        ('jobs', '0011_seekerskill'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='seeker',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='accounts.jobseekerprofile'),
+        ),
+        migrations.RunPython(fill_seeker, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='interview',
+            name='seeker',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, to='accounts.jobseekerprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['seeker', 'updated_at'], name='interview_seeker_updated_idx'),
+        ),
+    ]
@@ -1,4 +1,8 @@
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from accounts.models import User, Company, JobSeekerProfile, EmployerProfile
 
 class Job(models.Model):
@@ -15,8 +19,21 @@ class Job(models.Model):
     posted_by = models.ForeignKey(User, on_delete=models.CASCADE)
     is_active = models.BooleanField(default=True)
     posted_at = models.DateTimeField(auto_now_add=True)
+    # Validator for conditional GETs of job_detail (jobs.conditional)
+    updated_at = models.DateTimeField(auto_now=True)
     application_deadline = models.DateField(null=True, blank=True)
     skills_required = models.TextField(blank=True)
+    # Maintained by jobs.search; only populated on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Public listing: active jobs, newest first, optionally by type
+            models.Index(fields=['-posted_at', '-id'], condition=models.Q(is_active=True), name='job_active_posted_idx'),
+            models.Index(fields=['job_type', '-posted_at', '-id'], condition=models.Q(is_active=True), name='job_active_type_posted_idx'),
+            # Jobs changed since a point in time (MatchingEngine.sync)
+            models.Index(fields=['updated_at'], name='job_updated_idx'),
+        ]
 
 class Application(models.Model):
     STATUS_CHOICES = [
@@ -30,8 +47,143 @@ class Application(models.Model):
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='applied')
     applied_date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'seeker'], name='unique_application'),
+        ]
+        indexes = [
+            # Seeker's own applications, newest first
+            models.Index(fields=['seeker', '-applied_date', '-id'], name='application_seeker_date_idx'),
+            # Per-job status filters and counts
+            models.Index(fields=['job', 'status'], name='application_job_status_idx'),
+        ]
+
+class ApplicationCounts(models.Model):
+    """
+    Denormalized application counts, one column per Application status.
+    Maintained by jobs.counters; rebuilt by the reconcile_application_counts
+    command.
+    """
+    total = models.IntegerField(default=0)
+    applied = models.IntegerField(default=0)
+    shortlisted = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+    hired = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+class JobApplicationCounts(ApplicationCounts):
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='application_counts')
+
+class CompanyApplicationCounts(ApplicationCounts):
+    company = models.OneToOneField(Company, on_delete=models.CASCADE, primary_key=True, related_name='application_counts')
+
+class CollectionVersion(models.Model):
+    """
+    Change counter of a list endpoint, bumped in the same transaction as
+    every write to the collection. Conditional GETs of lists are validated
+    against these rows (jobs.conditional) instead of the rows being listed.
+    """
+    name = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+DEFAULT_INTERVIEW_DURATION = timedelta(hours=1)
+# Upper bound on ends_at - schedule. Overlap queries rely on it to turn
+# "starts before X and ends after Y" into a bounded range scan of the
+# (interviewer, schedule) and (seeker, schedule) indexes, see jobs.scheduling.
+MAX_INTERVIEW_DURATION = timedelta(hours=4)
+
 class Interview(models.Model):
     application = models.ForeignKey(Application, on_delete=models.CASCADE)
     interviewer = models.ForeignKey(EmployerProfile, on_delete=models.CASCADE)
+    # Copy of application.seeker, so seeker calendars get an index of their own
+    seeker = models.ForeignKey(JobSeekerProfile, on_delete=models.CASCADE, editable=False)
     schedule = models.DateTimeField()
+    # End of the slot; the interview occupies [schedule, ends_at)
+    ends_at = models.DateTimeField()
     feedback = models.TextField(blank=True)
+    # Drives calendar ETags and delta sync (jobs.ical)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def save(self, *args, **kwargs):
+        if self.ends_at is None and self.schedule is not None:
+            self.ends_at = self.schedule + DEFAULT_INTERVIEW_DURATION
+        if self.seeker_id is None and self.application_id is not None:
+            self.seeker_id = self.application.seeker_id
+        super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['interviewer', 'schedule'], name='interview_interviewer_idx'),
+            models.Index(fields=['seeker', 'schedule'], name='interview_seeker_idx'),
+            models.Index(fields=['interviewer', 'updated_at'], name='interview_updated_idx'),
+            models.Index(fields=['seeker', 'updated_at'], name='interview_seeker_updated_idx'),
+        ]
+
+
+class InterviewDeletion(models.Model):
+    """
+    Tombstone of a deleted interview so delta calendar sync can report it.
+    Plain ids: the interview, and possibly its parties, are gone.
+    """
+    interview_id = models.BigIntegerField()
+    interviewer_id = models.BigIntegerField()
+    seeker_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['interviewer_id', 'deleted_at'], name='interview_deletion_emp_idx'),
+            models.Index(fields=['seeker_id', 'deleted_at'], name='interview_deletion_seeker_idx'),
+        ]
+
+
+class Skill(models.Model):
+    # Normalized (lower-cased, whitespace-collapsed) skill token
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+class JobSkill(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_links')
+
+    class Meta:
+        unique_together = ('job', 'skill')
+        indexes = [models.Index(fields=['skill', 'job'])]
+
+class SeekerSkill(models.Model):
+    """Index of JobSeekerProfile.matching_skills, listed and resume skills alike."""
+    seeker = models.ForeignKey(JobSeekerProfile, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='seeker_links')
+
+    class Meta:
+        unique_together = ('seeker', 'skill')
+        indexes = [models.Index(fields=['skill', 'seeker'], name='seeker_skill_skill_idx')]
+
+
+class ChangeEvent(models.Model):
+    """
+    Outbox row for a job, application or interview change, inserted in the
+    transaction that made the change (jobs.outbox). The id is the cursor
+    consumers read from.
+    """
+    ENTITY_CHOICES = [
+        ('job', 'Job'),
+        ('application', 'Application'),
+        ('interview', 'Interview'),
+    ]
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    ]
+    entity = models.CharField(max_length=20, choices=ENTITY_CHOICES)
+    entity_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    # Ids and state consumers filter on; the rest is fetched from the API
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
@@ -0,0 +1,358 @@
+"""
+Push notifications for job seekers and employers: application status
+changes and new interviews, over Server-Sent Events or a WebSocket.
+
+Notifications are derived from the change events of jobs.outbox. Seekers
+are told about their own applications, employers about their company's.
+Once a transaction commits, its events go to the NOTIFICATIONS_BACKEND,
+which hands them to hub.deliver() in every process with listeners:
+
+- LocalBackend (the default) fans out in process, so it only reaches
+  clients connected to the process that made the change.
+- OutboxBackend tails the outbox table from a background thread instead,
+  so every process sees every change, for one query per
+  OUTBOX_POLL_INTERVAL per process.
+
+Other transports (e.g. Redis pub/sub) are backends with the same
+start()/publish() methods that call hub.deliver() on the receiving side.
+
+Every message carries the id of its change event. A client that
+reconnects with the last id it saw is first caught up from the outbox,
+so nothing is lost in between.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+from functools import partial
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connections
+from django.utils.module_loading import import_string
+
+from accounts.authentication import aresolve_principal, resolve_principal
+from accounts.tokens import InvalidToken, verify_access_token
+from .models import ChangeEvent
+from .outbox import KEEPALIVE_INTERVAL, MAX_BATCH_SIZE, aread_events, read_events, stream_events
+
+NOTIFIED_ENTITIES = ['application', 'interview']
+# Tells a client to refetch its applications and interviews: it fell too
+# far behind for the missed messages to be replayed
+RESYNC = {'type': 'resync'}
+# Undelivered messages a slow client may fall behind by before a resync
+MAX_PENDING = 100
+# Outbox batches read to catch up a reconnecting client, at most
+CATCH_UP_BATCHES = 5
+
+
+def channels_for(principal):
+    if principal.seeker_id is not None:
+        return {'seeker:%s' % principal.seeker_id}
+    if principal.company_id is not None:
+        return {'company:%s' % principal.company_id}
+    return set()
+
+
+def notification(event):
+    """(channels, message) for a change event the parties are told about, else None."""
+    data = event.data
+    if event.entity == 'application' and event.action == 'updated':
+        message = {'type': 'application.status', 'application': event.entity_id,
+                   'job': data['job'], 'status': data['status']}
+    elif event.entity == 'interview' and event.action == 'created':
+        message = {'type': 'interview.created', 'interview': event.entity_id, 'application': data['application'],
+                   'schedule': data['schedule'], 'ends_at': data['ends_at']}
+    else:
+        return None
+    message['id'] = event.id
+    return {'seeker:%s' % data['seeker'], 'company:%s' % data['company']}, message
+
+
+def notifications(events):
+    return [routed for routed in map(notification, events) if routed is not None]
+
+
+def _matching(events, channels):
+    return [message for routed, message in notifications(events) if routed & channels]
+
+
+class Subscription:
+    """Messages for one connected client, queued on its event loop."""
+
+    def __init__(self, channels, loop):
+        self.channels = channels
+        self.loop = loop
+        self.queue = asyncio.Queue(MAX_PENDING)
+        self.overflowed = False
+
+    def put(self, message):
+        # Runs on self.loop
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """The next message, RESYNC after an overflow, or None after ``timeout`` seconds."""
+        if self.overflowed:
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return RESYNC
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Hub:
+    """In-process fan-out of notifications to the subscriptions of their channels."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = defaultdict(set)
+
+    def __bool__(self):
+        return bool(self.subscriptions)
+
+    def subscribe(self, channels):
+        subscription = Subscription(channels, asyncio.get_running_loop())
+        with self.lock:
+            for channel in channels:
+                self.subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for channel in subscription.channels:
+                listeners = self.subscriptions.get(channel)
+                if listeners is not None:
+                    listeners.discard(subscription)
+                    if not listeners:
+                        del self.subscriptions[channel]
+
+    def deliver(self, routed):
+        """Queue (channels, message) pairs for their subscribers; safe from any thread."""
+        with self.lock:
+            deliveries = [
+                (subscription, message)
+                for channels, message in routed
+                for subscription in set().union(*(self.subscriptions.get(channel, ()) for channel in channels))
+            ]
+        for subscription, message in deliveries:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+            except RuntimeError:
+                # The client's event loop has shut down
+                pass
+
+
+hub = Hub()
+
+
+class LocalBackend:
+    """Delivers committed changes to the clients of this process."""
+
+    def start(self):
+        pass
+
+    def publish(self, events):
+        if hub:
+            hub.deliver(notifications(events))
+
+
+class OutboxBackend:
+    """
+    Delivers every process's changes by tailing the outbox from a daemon
+    thread, started when the first client connects.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='notifications-outbox', daemon=True)
+                self.thread.start()
+
+    def publish(self, events):
+        # Read back from the table by run()
+        pass
+
+    def run(self):
+        poll_interval = getattr(settings, 'OUTBOX_POLL_INTERVAL', 1)
+        cursor = None
+        while True:
+            try:
+                if cursor is None:
+                    cursor = ChangeEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+                events, after = read_events(cursor, MAX_BATCH_SIZE, NOTIFIED_ENTITIES)
+                hub.deliver(notifications(events))
+            except Exception:
+                # Keep tailing through database restarts
+                connections.close_all()
+                after = cursor
+            if after == cursor:
+                time.sleep(poll_interval)
+            cursor = after
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend():
+    path = getattr(settings, 'NOTIFICATIONS_BACKEND', 'jobs.notifications.LocalBackend')
+    with _backends_lock:
+        if path not in _backends:
+            _backends[path] = import_string(path)()
+        return _backends[path]
+
+
+def publish(events):
+    get_backend().publish(events)
+
+
+async def acatch_up(channels, after):
+    """
+    (messages, cursor) for ``channels`` after the event id ``after``, from
+    the outbox. Messages are [RESYNC] if there are too many to replay.
+    """
+    messages = []
+    for _ in range(CATCH_UP_BATCHES):
+        events, cursor = await aread_events(after, MAX_BATCH_SIZE, NOTIFIED_ENTITIES)
+        if cursor == after:
+            return messages, cursor
+        messages += _matching(events, channels)
+        after = cursor
+    return [RESYNC], after
+
+
+async def alisten(principal, after=None, keepalive=KEEPALIVE_INTERVAL):
+    """
+    Messages for ``principal``: those after event id ``after`` first, when
+    given, then live ones as they are delivered. Yields None after
+    ``keepalive`` seconds without one.
+    """
+    channels = channels_for(principal)
+    get_backend().start()
+    # Subscribed before catching up, so nothing falls in between
+    subscription = hub.subscribe(channels)
+    try:
+        seen = 0
+        if after is not None:
+            messages, seen = await acatch_up(channels, after)
+            for message in messages:
+                yield message
+        while True:
+            message = await subscription.get(keepalive)
+            if message is not None and 'id' in message and message['id'] <= seen:
+                # Already replayed while catching up
+                continue
+            yield message
+    finally:
+        hub.unsubscribe(subscription)
+
+
+def sse_frame(message):
+    if message is None:
+        return ': keepalive\n\n'
+    frame = 'event: %s\ndata: %s\n\n' % (message['type'], json.dumps(message, cls=DjangoJSONEncoder))
+    return 'id: %d\n%s' % (message['id'], frame) if 'id' in message else frame
+
+
+async def astream_notifications(principal, after=None):
+    """Server-Sent Events of alisten(); EventSource reconnects with Last-Event-ID."""
+    yield 'retry: 1000\n\n'
+    async for message in alisten(principal, after):
+        yield sse_frame(message)
+
+
+def _notification_frames(channels, events, after, cursor):
+    messages = _matching(events, channels)
+    frames = [sse_frame(message) for message in messages]
+    if cursor != after and (not messages or messages[-1]['id'] != cursor):
+        # Moves Last-Event-ID past other people's events
+        frames.append('id: %d\n\n' % cursor)
+    return frames
+
+
+def stream_notifications(principal, after=None):
+    """
+    astream_notifications() for WSGI, where a worker cannot wait on the hub:
+    polls the outbox like jobs.outbox.stream_events, and likewise ends
+    after OUTBOX_STREAM_DURATION for the client to reconnect.
+    """
+    if after is None:
+        after = ChangeEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    render = partial(_notification_frames, channels_for(principal))
+    return stream_events(after, NOTIFIED_ENTITIES, MAX_BATCH_SIZE, render=render)
+
+
+def _token_user_id(token):
+    try:
+        return verify_access_token(token)
+    except InvalidToken:
+        return None
+
+
+def principal_for_token(token):
+    """Principal of an access token, or None."""
+    user_id = _token_user_id(token)
+    return resolve_principal(user_id) if user_id is not None else None
+
+
+async def aprincipal_for_token(token):
+    user_id = _token_user_id(token)
+    return await aresolve_principal(user_id) if user_id is not None else None
+
+
+async def _until_disconnect(receive):
+    # Clients only listen; anything they send is ignored
+    while (await receive())['type'] != 'websocket.disconnect':
+        pass
+
+
+async def websocket_application(scope, receive, send):
+    """
+    ASGI application for notification WebSockets. Browsers cannot set
+    headers on a WebSocket, so the access token comes as ``?token=``;
+    ``?after=<event id>`` resumes like Last-Event-ID. Each message is sent as
+    a JSON text frame.
+    """
+    if (await receive())['type'] != 'websocket.connect':
+        return
+    params = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    await sync_to_async(close_old_connections)()
+    principal = await aprincipal_for_token(params.get('token', [''])[0])
+    if principal is None or not channels_for(principal):
+        # Closing before accepting rejects the handshake with a 403
+        await send({'type': 'websocket.close', 'code': 4403})
+        return
+    try:
+        after = int(params['after'][0]) if 'after' in params else None
+    except ValueError:
+        after = None
+    await send({'type': 'websocket.accept'})
+
+    async def forward():
+        async for message in alisten(principal, after):
+            if message is not None:
+                await send({'type': 'websocket.send', 'text': json.dumps(message, cls=DjangoJSONEncoder)})
+
+    sender = asyncio.ensure_future(forward())
+    receiver = asyncio.ensure_future(_until_disconnect(receive))
+    try:
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        if receiver not in done:
+            await send({'type': 'websocket.close', 'code': 1011})
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        await sync_to_async(close_old_connections)()
@@ -0,0 +1,176 @@
+"""
+Transactional outbox of job, application and interview changes.
+
+Events are inserted in the transaction that makes the change, so every
+committed change has its event and a rolled back one has none. Consumers
+read them in id order from a cursor, in batches (read_events, the events
+API) or as Server-Sent Events (stream_events).
+"""
+import asyncio
+import json
+import time
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import ChangeEvent
+
+ENTITIES = [value for value, _ in ChangeEvent.ENTITY_CHOICES]
+MAX_BATCH_SIZE = 1000
+# Ids are taken at insert but become visible at commit, so a reader can see
+# id n+1 before n. A gap younger than this is waited for; an older one is
+# taken to be a rolled back transaction.
+OUTBOX_SETTLE = timedelta(seconds=5)
+# Events are pruned after this long (manage.py prune_change_events)
+OUTBOX_RETENTION = timedelta(days=7)
+# Seconds between comment lines on an idle stream, so proxies keep it open
+KEEPALIVE_INTERVAL = 15
+
+# Sent with the recorded ``events`` once their transaction commits
+events_committed = Signal()
+
+
+def record(entity, action, rows):
+    """Insert one event per (entity_id, data) row, in a single INSERT."""
+    events = ChangeEvent.objects.bulk_create(
+        [ChangeEvent(entity=entity, entity_id=pk, action=action, data=data) for pk, data in rows])
+    if events:
+        transaction.on_commit(partial(events_committed.send, sender=ChangeEvent, events=events))
+
+
+def record_jobs(jobs, action):
+    record('job', action, [(job.pk, {'company': job.company_id, 'is_active': job.is_active}) for job in jobs])
+
+
+def record_applications(rows, action):
+    """Events for (id, job_id, seeker_id, company_id, status) rows."""
+    record('application', action, [
+        (pk, {'job': job_id, 'seeker': seeker_id, 'company': company_id, 'status': status})
+        for pk, job_id, seeker_id, company_id, status in rows
+    ])
+
+
+def record_interviews(rows, action):
+    """Events for (interview, seeker_id, company_id) rows."""
+    record('interview', action, [
+        (interview.pk, {'application': interview.application_id, 'interviewer': interview.interviewer_id,
+                        'seeker': seeker_id, 'company': company_id,
+                        'schedule': interview.schedule, 'ends_at': interview.ends_at})
+        for interview, seeker_id, company_id in rows
+    ])
+
+
+def _batch(after, limit):
+    return ChangeEvent.objects.filter(id__gt=after).order_by('id')[:limit]
+
+
+def _settled(events, after, entities, now):
+    # Stop at the first recent gap in the ids: the missing events may still
+    # be about to commit.
+    selected, cursor = [], after
+    for event in events:
+        if event.id != cursor + 1 and event.created_at > now - OUTBOX_SETTLE:
+            break
+        cursor = event.id
+        if not entities or event.entity in entities:
+            selected.append(event)
+    return selected, cursor
+
+
+def read_events(after=0, limit=100, entities=None):
+    """
+    Up to ``limit`` events after the cursor ``after``, in order, as
+    (events, cursor). Reading resumes from ``cursor``, which can move past
+    events left out by the ``entities`` filter.
+    """
+    now = timezone.now()
+    return _settled(_batch(after, limit), after, entities, now)
+
+
+async def aread_events(after=0, limit=100, entities=None):
+    now = timezone.now()
+    return _settled([event async for event in _batch(after, limit)], after, entities, now)
+
+
+def event_dict(event):
+    return {
+        'id': event.id,
+        'entity': event.entity,
+        'entity_id': event.entity_id,
+        'action': event.action,
+        'data': event.data,
+        'created_at': event.created_at,
+    }
+
+
+def event_frames(events, after, cursor):
+    """SSE frames for a batch read by read_events(); the default stream rendering."""
+    frames = [
+        'id: %d\nevent: %s.%s\ndata: %s\n\n' % (
+            event.id, event.entity, event.action, json.dumps(event_dict(event), cls=DjangoJSONEncoder))
+        for event in events
+    ]
+    if cursor != after and (not events or events[-1].id != cursor):
+        # A bare id moves the client's Last-Event-ID past filtered events
+        frames.append('id: %d\n\n' % cursor)
+    return frames
+
+
+def _stream_settings():
+    return getattr(settings, 'OUTBOX_POLL_INTERVAL', 1), getattr(settings, 'OUTBOX_STREAM_DURATION', 300)
+
+
+def stream_events(after=0, entities=None, batch_size=100, render=event_frames):
+    """
+    Server-Sent Events for events after ``after``, polling every
+    OUTBOX_POLL_INTERVAL seconds; ``render(events, after, cursor)`` turns
+    each batch into frames. The stream ends after OUTBOX_STREAM_DURATION
+    seconds, freeing the worker; EventSource clients reconnect with
+    Last-Event-ID and carry on from there.
+    """
+    poll_interval, duration = _stream_settings()
+    deadline = time.monotonic() + duration
+    keepalive_at = time.monotonic() + KEEPALIVE_INTERVAL
+    yield 'retry: %d\n\n' % (poll_interval * 1000)
+    while True:
+        events, cursor = read_events(after, batch_size, entities)
+        yield from render(events, after, cursor)
+        progressed, after = cursor != after, cursor
+        now = time.monotonic()
+        if now >= deadline:
+            return
+        if progressed:
+            keepalive_at = now + KEEPALIVE_INTERVAL
+            continue
+        if now >= keepalive_at:
+            yield ': keepalive\n\n'
+            keepalive_at = now + KEEPALIVE_INTERVAL
+        time.sleep(poll_interval)
+
+
+async def astream_events(after=0, entities=None, batch_size=100, render=event_frames):
+    """stream_events() for ASGI, which would buffer a sync iterator whole."""
+    poll_interval, duration = _stream_settings()
+    deadline = time.monotonic() + duration
+    keepalive_at = time.monotonic() + KEEPALIVE_INTERVAL
+    yield 'retry: %d\n\n' % (poll_interval * 1000)
+    while True:
+        events, cursor = await aread_events(after, batch_size, entities)
+        for frame in render(events, after, cursor):
+            yield frame
+        progressed, after = cursor != after, cursor
+        now = time.monotonic()
+        if now >= deadline:
+            return
+        if progressed:
+            keepalive_at = now + KEEPALIVE_INTERVAL
+            continue
+        if now >= keepalive_at:
+            yield ': keepalive\n\n'
+            keepalive_at = now + KEEPALIVE_INTERVAL
+        await asyncio.sleep(poll_interval)
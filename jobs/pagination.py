@@ -0,0 +1,145 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over (ordering_field, id).
+
+    Each page is fetched with a row comparison against the last row seen
+    instead of an OFFSET, so deep pages cost the same as the first one.
+    The cursor is an opaque token holding the boundary row and direction.
+    """
+    ordering_field = 'posted_at'
+    descending = True
+    page_size = api_settings.PAGE_SIZE or 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering_field=None, descending=None):
+        if ordering_field is not None:
+            self.ordering_field = ordering_field
+        if descending is not None:
+            self.descending = descending
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def encode_cursor(self, value, pk, reverse):
+        payload = json.dumps({'v': value.isoformat() if hasattr(value, 'isoformat') else value, 'i': pk, 'r': int(reverse)})
+        return base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii'))
+            return self.parse_cursor_value(model, payload['v']), int(payload['i']), bool(payload['r'])
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def parse_cursor_value(self, model, value):
+        return model._meta.get_field(self.ordering_field).to_python(value)
+
+    def page_queryset(self, queryset, request):
+        """Return the sliced queryset for the requested page (one row of lookahead)."""
+        self.request = request
+        self.page_size_used = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request, queryset.model)
+        reverse = bool(self.cursor and self.cursor[2])
+
+        # Walking "previous" flips the scan direction; rows are put back in
+        # display order afterwards.
+        forward_desc = self.descending != reverse
+        field = self.ordering_field
+        if self.cursor is not None:
+            value, pk = self.cursor[0], self.cursor[1]
+            op = 'lt' if forward_desc else 'gt'
+            # The redundant lte/gte bound lets the planner seek into the
+            # (field, id) index instead of scanning from its start.
+            queryset = queryset.filter(**{'%s__%se' % (field, op): value}).filter(
+                Q(**{'%s__%s' % (field, op): value}) | Q(**{field: value, 'id__%s' % op: pk})
+            )
+        prefix = '-' if forward_desc else ''
+        queryset = queryset.order_by(prefix + field, prefix + 'id')
+        return queryset[:self.page_size_used + 1]
+
+    def set_page(self, rows):
+        cursor = self.cursor
+        reverse = bool(cursor and cursor[2])
+        has_more = len(rows) > self.page_size_used
+        rows = rows[:self.page_size_used]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+        self.page = rows
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """paginate_queryset() for async views, fetching through the async ORM."""
+        return self.set_page([row async for row in self.page_queryset(queryset, request)])
+
+    @staticmethod
+    def row_value(row, name):
+        # Pages hold model instances, or dicts on the values() fast path
+        return row[name] if isinstance(row, dict) else getattr(row, name)
+
+    def row_cursor(self, row, reverse):
+        return self.encode_cursor(self.row_value(row, self.ordering_field), self.row_value(row, 'id'), reverse)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        cursor = self.row_cursor(self.page[-1], False)
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        url = self.request.build_absolute_uri()
+        if not self.page:
+            return remove_query_param(url, self.cursor_query_param)
+        cursor = self.row_cursor(self.page[0], True)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class RankPagination(KeysetPagination):
+    """Keyset pagination over a float ``rank`` annotation, best match first."""
+    ordering_field = 'rank'
+    descending = True
+
+    def parse_cursor_value(self, model, value):
+        return float(value)
@@ -0,0 +1,34 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed. Requests for
+    indented output, and installs without orjson, use the stock renderer.
+
+    Dates and times go through DRF's encoder, which writes UTC as 'Z'
+    where orjson writes '+00:00', so the output is the same either way.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=JSONEncoder().default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+class EventStreamRenderer(FastJSONRenderer):
+    """
+    Accepts text/event-stream in content negotiation for Server-Sent Event
+    views. The events themselves are streamed by the view; only error
+    responses are rendered here, as JSON.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
@@ -0,0 +1,117 @@
+from bisect import bisect_right
+from datetime import timedelta
+
+from django.db import transaction
+
+from accounts.models import EmployerProfile, JobSeekerProfile
+from .models import Interview, MAX_INTERVIEW_DURATION
+
+
+class SchedulingConflict(Exception):
+    def __init__(self, conflicts):
+        super().__init__('Interview overlaps %d other interviews' % len(conflicts))
+        self.conflicts = conflicts
+
+
+def overlapping(queryset, start, end):
+    """
+    Interviews in ``queryset`` overlapping [start, end). The schedule lower
+    bound is implied by MAX_INTERVIEW_DURATION and keeps the scan of the
+    (interviewer, schedule) or (seeker, schedule) index to a window instead
+    of all history.
+    """
+    return queryset.filter(schedule__lt=end, schedule__gt=start - MAX_INTERVIEW_DURATION, ends_at__gt=start)
+
+
+def find_conflicts(interviewer_id, seeker_id, start, end):
+    """Overlapping interviews of the interviewer or the candidate, as dicts."""
+    conflicts = []
+    for party, queryset in (
+        ('interviewer', Interview.objects.filter(interviewer_id=interviewer_id)),
+        ('candidate', Interview.objects.filter(seeker_id=seeker_id)),
+    ):
+        for row in overlapping(queryset, start, end).order_by('schedule').values('id', 'schedule', 'ends_at'):
+            conflicts.append({'party': party, **row})
+    return conflicts
+
+
+def schedule_interview(application, interviewer_id, start, duration, feedback=''):
+    """
+    Book an interview, raising SchedulingConflict if it overlaps another
+    interview of the interviewer or the candidate. The interviewer and
+    candidate rows are locked first, so concurrent bookings for either are
+    checked one after the other.
+    """
+    with transaction.atomic():
+        list(EmployerProfile.objects.select_for_update().filter(pk=interviewer_id).values_list('pk'))
+        list(JobSeekerProfile.objects.select_for_update().filter(pk=application.seeker_id).values_list('pk'))
+        conflicts = find_conflicts(interviewer_id, application.seeker_id, start, start + duration)
+        if conflicts:
+            raise SchedulingConflict(conflicts)
+        return Interview.objects.create(
+            application=application, interviewer_id=interviewer_id,
+            schedule=start, ends_at=start + duration, feedback=feedback)
+
+
+class IntervalSet:
+    """
+    Busy time as merged, sorted, half-open intervals. ``starts`` and
+    ``ends`` are both sorted, so an overlap probe is one bisect.
+    """
+
+    def __init__(self, intervals=()):
+        self.starts, self.ends = [], []
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlapping(self, start, end):
+        """Index of the busy interval overlapping [start, end), or None."""
+        i = bisect_right(self.ends, start)
+        if i < len(self.starts) and self.starts[i] < end:
+            return i
+        return None
+
+    def free_slots(self, start, end, duration, count, step):
+        """
+        First ``count`` non-overlapping free slots of ``duration`` between
+        ``start`` and ``end``, starting on ``step`` boundaries from
+        ``start``. A probe that hits a busy interval jumps past it.
+        """
+        slots = []
+        candidate = start
+        while len(slots) < count and candidate + duration <= end:
+            busy = self.overlapping(candidate, candidate + duration)
+            if busy is None:
+                slots.append((candidate, candidate + duration))
+                resume_at = candidate + duration
+            else:
+                resume_at = self.ends[busy]
+            # Round up to the next step boundary
+            candidate = start + -((start - resume_at) // step) * step
+        return slots
+
+
+def busy_intervals(interviewer_ids, start, end, seeker_id=None):
+    """
+    IntervalSet of every interview of the interviewers (and candidate)
+    overlapping [start, end), read with one bounded range query each.
+    """
+    querysets = [overlapping(Interview.objects.filter(interviewer_id__in=interviewer_ids), start, end)]
+    if seeker_id is not None:
+        querysets.append(overlapping(Interview.objects.filter(seeker_id=seeker_id), start, end))
+    intervals = []
+    for queryset in querysets:
+        intervals += queryset.values_list('schedule', 'ends_at')
+    return IntervalSet(intervals)
+
+
+def find_free_slots(interviewer_ids, start, end, duration, count=5, step=timedelta(minutes=30), seeker_id=None):
+    """First ``count`` slots where all the interviewers (and the candidate) are free."""
+    return busy_intervals(interviewer_ids, start, end, seeker_id).free_slots(start, end, duration, count, step)
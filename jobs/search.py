@@ -0,0 +1,167 @@
+import math
+import re
+import threading
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Case, F, FloatField, Value, When
+
+from .models import Job
+
+SEARCH_CONFIG = 'english'
+# (field, PostgreSQL weight, fallback weight)
+SEARCH_FIELDS = (
+    ('title', 'A', 3.0),
+    ('requirements', 'B', 2.0),
+    ('description', 'C', 1.0),
+)
+SEARCH_FIELD_NAMES = {name for name, _, _ in SEARCH_FIELDS}
+
+_TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return _TOKEN.findall((text or '').lower())
+
+
+def uses_postgres(using='default'):
+    return connections[using].vendor == 'postgresql'
+
+
+def search_vector():
+    vector = None
+    for name, weight, _ in SEARCH_FIELDS:
+        part = SearchVector(name, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+class InMemorySearchIndex:
+    """
+    Inverted index used when the database has no full-text support (SQLite
+    in development and tests). It is loaded from the database on first use
+    and then maintained incrementally from Job saves and deletes.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(dict)  # term -> {job_id: weighted term frequency}
+        self.doc_terms = {}  # job_id -> terms, for removal
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def _add(self, job_id, values):
+        self._remove(job_id)
+        weights = defaultdict(float)
+        for (name, _, weight), text in zip(SEARCH_FIELDS, values):
+            for term in tokenize(text):
+                weights[term] += weight
+        for term, weight in weights.items():
+            self.postings[term][job_id] = weight
+        self.doc_terms[job_id] = set(weights)
+
+    def _remove(self, job_id):
+        for term in self.doc_terms.pop(job_id, ()):
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(job_id, None)
+                if not docs:
+                    del self.postings[term]
+
+    def load(self, using='default'):
+        with self.lock:
+            if self.loaded:
+                return
+            fields = [name for name, _, _ in SEARCH_FIELDS]
+            rows = Job.objects.using(using).values_list('id', *fields).iterator(chunk_size=2000)
+            for row in rows:
+                self._add(row[0], row[1:])
+            self.loaded = True
+
+    async def aload(self, using='default'):
+        if not self.loaded:
+            await sync_to_async(self.load)(using)
+
+    def update(self, job):
+        with self.lock:
+            if self.loaded:
+                self._add(job.pk, [getattr(job, name) for name, _, _ in SEARCH_FIELDS])
+
+    def remove(self, job_id):
+        with self.lock:
+            if self.loaded:
+                self._remove(job_id)
+
+    def clear(self):
+        with self.lock:
+            self.postings.clear()
+            self.doc_terms.clear()
+            self.loaded = False
+
+    def search(self, query):
+        """Return {job_id: score} for jobs containing every query term (tf-idf ranked)."""
+        terms = set(tokenize(query))
+        if not terms:
+            return {}
+        with self.lock:
+            total = max(len(self.doc_terms), 1)
+            matches = [self.postings.get(term, {}) for term in terms]
+            matches.sort(key=len)
+            candidates = set(matches[0])
+            for docs in matches[1:]:
+                candidates &= docs.keys()
+            scores = {}
+            for job_id in candidates:
+                score = 0.0
+                for docs in matches:
+                    score += docs[job_id] * math.log(1 + total / len(docs))
+                scores[job_id] = round(score, 6)
+            return scores
+
+
+fallback_index = InMemorySearchIndex()
+
+
+def index_job(job):
+    """Refresh the search index entry of a single job after it was saved."""
+    using = job._state.db or 'default'
+    if uses_postgres(using):
+        Job.objects.using(using).filter(pk=job.pk).update(search_vector=search_vector())
+    else:
+        fallback_index.update(job)
+
+
+def index_jobs(jobs):
+    """Bulk variant of index_job for rows written without save() (bulk_create)."""
+    jobs = list(jobs)
+    if not jobs:
+        return
+    using = jobs[0]._state.db or 'default'
+    if uses_postgres(using):
+        Job.objects.using(using).filter(pk__in=[job.pk for job in jobs]).update(search_vector=search_vector())
+    else:
+        for job in jobs:
+            fallback_index.update(job)
+
+
+def unindex_job(job_id):
+    fallback_index.remove(job_id)
+
+
+def search_jobs(queryset, q):
+    """Filter ``queryset`` to jobs matching ``q`` and annotate each with a ``rank``."""
+    if uses_postgres(queryset.db):
+        query = SearchQuery(q, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(rank=SearchRank(F('search_vector'), query))
+
+    fallback_index.load(queryset.db)
+    scores = fallback_index.search(q)
+    if not scores:
+        return queryset.none().annotate(rank=Value(0.0, output_field=FloatField()))
+    rank = Case(
+        *[When(id=job_id, then=Value(score)) for job_id, score in scores.items()],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    return queryset.filter(id__in=list(scores)).annotate(rank=rank)
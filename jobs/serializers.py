@@ -1,19 +1,47 @@
 from rest_framework import serializers
-from .models import Job, Application, Interview
+from datetime import timedelta
+from django.utils import timezone
+from .models import Job, Application, Interview, MAX_INTERVIEW_DURATION
+from .outbox import ENTITIES, MAX_BATCH_SIZE
 from accounts.models import JobSeekerProfile, EmployerProfile, Company
 from accounts.serializers import CompanySerializer
+from .skills import sync_job_skills
 
 class JobSerializer(serializers.ModelSerializer):
     company = CompanySerializer(read_only=True)
 
     class Meta:
         model = Job
-        fields = '__all__'
+        exclude = ('search_vector',)
+
+    @staticmethod
+    def setup_eager_loading(queryset, prefix=''):
+        return queryset.select_related(prefix + 'company')
 
 class JobCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
-        fields = '__all__'
+        exclude = ('search_vector',)
+        # Set by the view from the requesting employer
+        read_only_fields = ('company', 'posted_by')
+
+    def create(self, validated_data):
+        job = super().create(validated_data)
+        sync_job_skills(job)
+        return job
+
+    def update(self, instance, validated_data):
+        job = super().update(instance, validated_data)
+        if 'skills_required' in validated_data:
+            sync_job_skills(job)
+        return job
+
+class JobImportSerializer(serializers.ModelSerializer):
+    """Row validation for bulk imports; company and poster come from the importer."""
+
+    class Meta:
+        model = Job
+        exclude = ('search_vector', 'company', 'posted_by')
 
 class ApplicationSerializer(serializers.ModelSerializer):
     job = JobSerializer(read_only=True)
@@ -23,14 +51,180 @@ class ApplicationSerializer(serializers.ModelSerializer):
         model = Application
         fields = '__all__'
 
+    @staticmethod
+    def setup_eager_loading(queryset, prefix=''):
+        # seeker is rendered through JobSeekerProfile.__str__, which reads user
+        queryset = JobSerializer.setup_eager_loading(queryset, prefix + 'job__')
+        return queryset.select_related(prefix + 'seeker__user')
+
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = '__all__'
+        # Set by the view, and every application starts as 'applied'; the
+        # unique (job, seeker) constraint is enforced by the insert itself
+        # rather than a validator query.
+        read_only_fields = ('seeker', 'status')
+
+class ApplicationBatchSerializer(serializers.Serializer):
+    jobs = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=100)
+
+class ApplicationStatusBulkSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000)
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
 
 class InterviewSerializer(serializers.ModelSerializer):
     application = ApplicationSerializer(read_only=True)
 
     class Meta:
         model = Interview
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+MAX_DURATION_MINUTES = int(MAX_INTERVIEW_DURATION.total_seconds() // 60)
+
+class InterviewCreateSerializer(serializers.ModelSerializer):
+    # Minutes; ends_at is derived from it
+    duration = serializers.IntegerField(min_value=5, max_value=MAX_DURATION_MINUTES, default=60, write_only=True)
+
+    class Meta:
+        model = Interview
+        fields = ('application', 'interviewer', 'schedule', 'duration', 'feedback')
+        # Defaults to the employer making the request
+        extra_kwargs = {'interviewer': {'required': False}}
+
+class FreeSlotsQuerySerializer(serializers.Serializer):
+    interviewers = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, max_length=20)
+    application = serializers.IntegerField(min_value=1, required=False)
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    duration = serializers.IntegerField(min_value=5, max_value=MAX_DURATION_MINUTES, default=60)
+    step = serializers.IntegerField(min_value=5, max_value=24 * 60, default=30)
+    count = serializers.IntegerField(min_value=1, max_value=50, default=5)
+
+    # Longest window searched in one request
+    max_window = timedelta(days=31)
+
+    def validate(self, data):
+        step = timedelta(minutes=data['step'])
+        if 'start' not in data:
+            # The next step boundary, counted from the top of the hour
+            now = timezone.now()
+            hour = now.replace(minute=0, second=0, microsecond=0)
+            data['start'] = hour + -((hour - now) // step) * step
+        data.setdefault('end', data['start'] + timedelta(days=14))
+        if data['end'] <= data['start']:
+            raise serializers.ValidationError({'end': 'Must be after start.'})
+        if data['end'] - data['start'] > self.max_window:
+            raise serializers.ValidationError({'end': 'Window is limited to %d days.' % self.max_window.days})
+        return data
+
+class ChangeEventQuerySerializer(serializers.Serializer):
+    after = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_BATCH_SIZE, default=100)
+    # Comma separated entity names; all of them when omitted
+    entity = serializers.CharField(required=False)
+
+    def validate_entity(self, value):
+        entities = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in entities if name not in ENTITIES]
+        if unknown:
+            raise serializers.ValidationError('Unknown entity: %s.' % ', '.join(unknown))
+        return entities
+
+class ExpandableFieldsMixin:
+    """
+    Slim list representation with client-selected output.
+
+    ``fields`` limits the output to the named fields and ``expand`` renders
+    the listed relations as nested objects instead of primary keys; dotted
+    names reach further down (``expand=job,job.company``). optimize_queryset()
+    applies the same selection to the ORM query so unrequested columns are
+    never loaded.
+    """
+    # name -> (nested field class, extra select_related paths, only() paths or None for all columns)
+    expandable_fields = {}
+    default_expand = ()
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+        expand = self.default_expand if expand is None else expand
+        for name, (field_class, _, _) in self.expandable_fields.items():
+            if name in expand:
+                nested_kwargs = {'read_only': True}
+                if issubclass(field_class, ExpandableFieldsMixin):
+                    nested_kwargs['expand'] = self.nested_expand(name, expand)
+                self.fields[name] = field_class(**nested_kwargs)
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @staticmethod
+    def nested_expand(name, expand):
+        return [item.split('.', 1)[1] for item in expand if item.startswith(name + '.')]
+
+    @classmethod
+    def load_plan(cls, fields=None, expand=None, prefix=''):
+        expand = cls.default_expand if expand is None else expand
+        model_fields = {field.name for field in cls.Meta.model._meta.concrete_fields}
+        only, related = [], []
+        for name in cls.Meta.fields:
+            if fields and name not in fields or name not in model_fields:
+                continue
+            only.append(prefix + name)
+            if name not in cls.expandable_fields or name not in expand:
+                continue
+            field_class, extra_related, extra_only = cls.expandable_fields[name]
+            path = prefix + name + '__'
+            related.append(prefix + name)
+            related.extend(path + extra for extra in extra_related)
+            if issubclass(field_class, ExpandableFieldsMixin):
+                nested_only, nested_related = field_class.load_plan(None, cls.nested_expand(name, expand), path)
+                only.extend(nested_only)
+                related.extend(nested_related)
+            elif extra_only is not None:
+                only.extend(path + extra for extra in extra_only)
+        return only, related
+
+    @classmethod
+    def optimize_queryset(cls, queryset, fields=None, expand=None, required=()):
+        only, related = cls.load_plan(fields, expand)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*only, *required)
+
+class JobListSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'company': (CompanySerializer, (), None),
+    }
+    default_expand = ('company',)
+
+    class Meta:
+        model = Job
+        # description/requirements are detail-only
+        fields = ('id', 'title', 'company', 'location', 'location_type', 'salary_min', 'salary_max',
+                  'experience_required', 'job_type', 'is_active', 'posted_at', 'application_deadline',
+                  'skills_required')
+
+class ApplicationListSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'job': (JobListSerializer, (), None),
+        # JobSeekerProfile.__str__ reads user.username
+        'seeker': (serializers.StringRelatedField, ('user',), ('user', 'user__username')),
+    }
+    default_expand = ('job', 'seeker')
+
+    class Meta:
+        model = Application
+        fields = ('id', 'job', 'seeker', 'status', 'applied_date')
+
+class InterviewListSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'application': (ApplicationListSerializer, (), None),
+    }
+    default_expand = ('application', 'application.job', 'application.seeker')
+
+    class Meta:
+        model = Interview
+        fields = ('id', 'application', 'interviewer', 'schedule', 'ends_at', 'feedback')
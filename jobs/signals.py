@@ -0,0 +1,188 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import Company, JobSeekerProfile
+from accounts.signals import profiles_registered, resume_processed
+from .cache import invalidate_job
+from .conditional import JOBS, SEEKERS, applications_changed, bump
+from .counters import applications_created, applications_deleted
+from .matching import engine
+from .models import Application, Interview, InterviewDeletion, Job
+from .notifications import publish
+from .outbox import events_committed, record_applications, record_interviews, record_jobs
+from .search import SEARCH_FIELD_NAMES, index_job, unindex_job
+from .skills import sync_seeker_skills
+
+
+@receiver(post_save, sender=Job)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCH_FIELD_NAMES.intersection(update_fields):
+        return
+    index_job(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_job(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_cache(sender, instance, **kwargs):
+    invalidate_job(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def bump_jobs_version(sender, instance, **kwargs):
+    bump([JOBS])
+
+
+@receiver(post_save, sender=Company)
+def touch_company_jobs(sender, instance, created, raw=False, **kwargs):
+    # Jobs render their company, so its changes move Job.updated_at, which
+    # job ETags and interview calendars (jobs.ical) are validated by, and
+    # the jobs version behind the job and application lists. update()
+    # sends no post_save, so none of the Job receivers run.
+    if created or raw:
+        return
+    job_ids = list(Job.objects.filter(company=instance).values_list('pk', flat=True))
+    Job.objects.filter(pk__in=job_ids).update(updated_at=timezone.now())
+    for job_id in job_ids:
+        invalidate_job(job_id)
+    if job_ids:
+        bump([JOBS])
+
+
+@receiver(post_save, sender=Job)
+def update_matching_jobs(sender, instance, **kwargs):
+    engine.update_job(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_matching_job(sender, instance, **kwargs):
+    engine.remove_job(instance.pk)
+
+
+@receiver(post_save, sender=JobSeekerProfile)
+@receiver(post_delete, sender=JobSeekerProfile)
+def bump_seekers_version(sender, instance, **kwargs):
+    bump([SEEKERS])
+
+
+@receiver(post_save, sender=JobSeekerProfile)
+def update_matching_seekers(sender, instance, **kwargs):
+    engine.update_seeker(instance)
+
+
+@receiver(profiles_registered)
+def add_registered_seekers(sender, seekers, **kwargs):
+    for seeker in seekers:
+        engine.update_seeker(seeker)
+    bump([SEEKERS])
+
+
+@receiver(post_delete, sender=JobSeekerProfile)
+def remove_matching_seeker(sender, instance, **kwargs):
+    engine.remove_seeker(instance.pk)
+
+
+@receiver(post_save, sender=JobSeekerProfile)
+def index_seeker_skills(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_seeker_skills([instance])
+
+
+@receiver(profiles_registered)
+def index_registered_seekers(sender, seekers, **kwargs):
+    sync_seeker_skills(seekers)
+
+
+@receiver(resume_processed)
+def update_resume_seekers(sender, sha256, **kwargs):
+    # Extracted skills change the profiles' matching skills in every process
+    JobSeekerProfile.objects.filter(resume_content_id=sha256).update(updated_at=timezone.now())
+    bump([SEEKERS])
+    seekers = list(JobSeekerProfile.objects.select_related('resume_content').filter(resume_content_id=sha256))
+    for seeker in seekers:
+        engine.update_seeker(seeker)
+    sync_seeker_skills(seekers)
+
+
+@receiver(post_save, sender=Application)
+def count_new_application(sender, instance, created, raw=False, **kwargs):
+    # Bulk inserts and status changes are counted where they happen
+    if created and not raw:
+        applications_created([(instance.job_id, instance.job.company_id, instance.status)])
+
+
+@receiver(pre_delete, sender=Job)
+def uncount_job_applications(sender, instance, **kwargs):
+    applications_deleted(Application.objects.filter(job_id=instance.pk))
+
+
+@receiver(pre_delete, sender=JobSeekerProfile)
+def uncount_seeker_applications(sender, instance, **kwargs):
+    applications_deleted(Application.objects.filter(seeker_id=instance.pk))
+
+
+@receiver(post_save, sender=Application)
+def bump_application_lists(sender, instance, raw=False, **kwargs):
+    # Bulk inserts and status changes bump the lists where they happen
+    if not raw:
+        applications_changed([(instance.seeker_id, instance.job.company_id)])
+
+
+@receiver(pre_delete, sender=Job)
+@receiver(pre_delete, sender=JobSeekerProfile)
+def record_deleted_applications(sender, instance, **kwargs):
+    # Cascaded application deletes send no signals of their own
+    field = 'job_id' if sender is Job else 'seeker_id'
+    rows = list(
+        Application.objects.filter(**{field: instance.pk})
+        .values_list('id', 'job_id', 'seeker_id', 'job__company_id', 'status')
+    )
+    applications_changed((seeker_id, company_id) for _, _, seeker_id, company_id, _ in rows)
+    record_applications(rows, 'deleted')
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_save, sender=Application)
+@receiver(post_save, sender=Interview)
+def record_change_event(sender, instance, created, raw=False, **kwargs):
+    # Bulk writes record their events where they happen (jobs.outbox)
+    if raw:
+        return
+    action = 'created' if created else 'updated'
+    if sender is Job:
+        record_jobs([instance], action)
+    elif sender is Application:
+        record_applications(
+            [(instance.pk, instance.job_id, instance.seeker_id, instance.job.company_id, instance.status)], action)
+    else:
+        application = instance.application
+        record_interviews([(instance, application.seeker_id, application.job.company_id)], action)
+
+
+@receiver(post_delete, sender=Job)
+def record_job_delete_event(sender, instance, **kwargs):
+    record_jobs([instance], 'deleted')
+
+
+@receiver(post_delete, sender=Interview)
+def record_interview_deletion(sender, instance, **kwargs):
+    # A tombstone lets delta calendar sync (jobs.ical) report the deletion
+    seeker_id, company_id = (
+        Application.objects.filter(pk=instance.application_id)
+        .values_list('seeker_id', 'job__company_id').first() or (None, None)
+    )
+    InterviewDeletion.objects.create(
+        interview_id=instance.pk, interviewer_id=instance.interviewer_id, seeker_id=seeker_id or 0)
+    record_interviews([(instance, seeker_id, company_id)], 'deleted')
+
+
+@receiver(events_committed)
+def publish_notifications(sender, events, **kwargs):
+    publish(events)
+
@@ -0,0 +1,141 @@
+import re
+import threading
+
+from django.db.models import Count, Max
+
+from .models import Skill, JobSkill, SeekerSkill
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_skill(token):
+    return _WHITESPACE.sub(' ', token.strip()).lower()
+
+
+def parse_skills(text):
+    """Split a comma separated skills string into unique normalized tokens, keeping order."""
+    seen = []
+    for token in (text or '').split(','):
+        name = normalize_skill(token)[:100]
+        if name and name not in seen:
+            seen.append(name)
+    return seen
+
+
+class SkillVocabulary:
+    """
+    Known skill names, kept in process. Skills are only ever added, so a
+    call reads the names past the highest id it has seen, and everything
+    only when the count shows a lower id committed late; one aggregate
+    when nothing changed.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.names = frozenset()
+        self.state = (0, 0)  # (highest id, count) the names are current with
+
+    def get(self):
+        state = Skill.objects.aggregate(last=Max('id'), count=Count('id'))
+        last_id, count = state['last'] or 0, state['count']
+        with self.lock:
+            if (last_id, count) != self.state:
+                skills = Skill.objects.filter(id__lte=last_id).values_list('name', flat=True)
+                names = self.names.union(skills.filter(id__gt=self.state[0])) if last_id >= self.state[0] else frozenset()
+                if len(names) != count:
+                    names = frozenset(skills)
+                self.names, self.state = names, (last_id, count)
+            return self.names
+
+
+vocabulary = SkillVocabulary()
+
+
+def skill_vocabulary():
+    """Known skill names, for spotting skills in free text such as resumes."""
+    return vocabulary.get()
+
+
+def get_skill_ids(names, create=False):
+    if create and names:
+        Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+    return dict(Skill.objects.filter(name__in=names).values_list('name', 'id'))
+
+
+def sync_job_skills(job):
+    """Bring the JobSkill rows of ``job`` in line with its skills_required text."""
+    wanted = set(get_skill_ids(parse_skills(job.skills_required), create=True).values())
+    current = set(JobSkill.objects.filter(job=job).values_list('skill_id', flat=True))
+    if current - wanted:
+        JobSkill.objects.filter(job=job, skill_id__in=current - wanted).delete()
+    if wanted - current:
+        JobSkill.objects.bulk_create(
+            [JobSkill(job=job, skill_id=skill_id) for skill_id in wanted - current],
+            ignore_conflicts=True,
+        )
+
+
+def index_new_jobs(jobs):
+    """Create JobSkill rows for freshly bulk-created jobs (which skip the serializer hooks)."""
+    parsed = [(job, parse_skills(job.skills_required)) for job in jobs]
+    names = sorted({name for _, job_names in parsed for name in job_names})
+    skill_ids = get_skill_ids(names, create=True)
+    JobSkill.objects.bulk_create(
+        [JobSkill(job=job, skill_id=skill_ids[name]) for job, job_names in parsed for name in job_names],
+        ignore_conflicts=True,
+    )
+
+
+def sync_seeker_skills(seekers):
+    """
+    Bring the SeekerSkill rows of ``seekers`` in line with their
+    matching_skills, with one query for the current rows of them all.
+    """
+    wanted = {seeker.pk: parse_skills(seeker.matching_skills) for seeker in seekers}
+    if not wanted:
+        return
+    skill_ids = get_skill_ids(sorted({name for names in wanted.values() for name in names}), create=True)
+    wanted = {seeker_id: {skill_ids[name] for name in names} for seeker_id, names in wanted.items()}
+    current = {seeker_id: set() for seeker_id in wanted}
+    for seeker_id, skill_id in SeekerSkill.objects.filter(seeker_id__in=list(wanted)).values_list('seeker_id', 'skill_id'):
+        current[seeker_id].add(skill_id)
+    stale = [(seeker_id, current[seeker_id] - skills) for seeker_id, skills in wanted.items() if current[seeker_id] - skills]
+    for seeker_id, skills in stale:
+        SeekerSkill.objects.filter(seeker_id=seeker_id, skill_id__in=skills).delete()
+    SeekerSkill.objects.bulk_create(
+        [SeekerSkill(seeker_id=seeker_id, skill_id=skill_id)
+         for seeker_id, skills in wanted.items() for skill_id in skills - current[seeker_id]],
+        ignore_conflicts=True,
+    )
+
+
+def _matching(links, key, names, match):
+    if match == 'any':
+        return links.values(key)
+    return links.values(key).annotate(matched=Count('skill_id')).filter(matched=len(names)).values(key)
+
+
+def filter_by_skills(queryset, skills, match='all'):
+    """
+    Restrict ``queryset`` to jobs indexed with the given skills.
+
+    ``match='all'`` keeps jobs having every skill, ``match='any'`` jobs having
+    at least one. Matching is on exact normalized tokens, so "java" does not
+    match "javascript".
+    """
+    names = parse_skills(skills)
+    if not names:
+        return queryset
+    return queryset.filter(id__in=_matching(JobSkill.objects.filter(skill__name__in=names), 'job_id', names, match))
+
+
+def filter_by_seeker_skills(queryset, skills, match='all', field='seeker_id'):
+    """filter_by_skills() for rows whose ``field`` is a seeker, on SeekerSkill."""
+    names = parse_skills(skills)
+    if not names:
+        return queryset
+    links = SeekerSkill.objects.filter(skill__name__in=names)
+    return queryset.filter(**{field + '__in': _matching(links, 'seeker_id', names, match)})
@@ -1,9 +1,42 @@
-from django.test import TestCase
-from rest_framework.test import APITestCase
+from django.conf import settings
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
 from rest_framework import status
 from django.utils import timezone
-from .models import Job, Application, Interview
-from accounts.models import User, JobSeekerProfile, EmployerProfile, Company
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import clear_url_caches, resolve
+from asgiref.sync import async_to_sync, sync_to_async
+import asyncio
+import importlib
+import inspect
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+from datetime import datetime, timedelta, timezone as dt_timezone
+from . import async_views, urls as jobs_urls, views
+from .models import Job, Application, ChangeEvent, CollectionVersion, Interview, InterviewDeletion, JobApplicationCounts
+from .serializers import JobCreateSerializer, JobSerializer, ApplicationSerializer, JobListSerializer, ApplicationListSerializer, InterviewListSerializer
+from .exporter import astream_applications
+from .fastpath import compile_plan
+from .renderers import FastJSONRenderer
+from rest_framework.renderers import JSONRenderer
+from .search import fallback_index
+from .skills import get_skill_ids, skill_vocabulary
+from .cache import cache_stats, get_cache, reset_cache_stats
+from .conditional import JOBS, SEEKERS, bump
+from .matching import engine
+from .notifications import acatch_up, alisten, channels_for, notification, websocket_application
+from .outbox import OUTBOX_SETTLE, read_events
+from .scheduling import IntervalSet, busy_intervals, find_conflicts
+from accounts.models import User, JobSeekerProfile, EmployerProfile, Company, Resume
+from accounts.resumes import save_result
+from accounts.authentication import resolve_principal
+from accounts.tokens import issue_tokens
 
 class JobModelTest(TestCase):
     def setUp(self):
@@ -53,6 +86,12 @@ class ApplicationModelTest(TestCase):
         self.assertEqual(application.seeker, self.seeker)
         self.assertEqual(application.status, 'applied')
 
+    def test_duplicate_application_rejected(self):
+        Application.objects.create(job=self.job, seeker=self.seeker)
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                Application.objects.create(job=self.job, seeker=self.seeker)
+
 class InterviewModelTest(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
@@ -101,7 +140,7 @@ class JobsViewTest(APITestCase):
         )
         response = self.client.get('/jobs/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_post_job(self):
         data = {
@@ -116,7 +155,24 @@ class JobsViewTest(APITestCase):
         }
         response = self.client.post('/jobs/', data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertTrue(Job.objects.filter(title='Developer').exists())
+        job = Job.objects.get(title='Developer')
+        self.assertEqual((job.company, job.posted_by), (self.company, self.user))
+        self.assertEqual(list(job.skill_links.values_list('skill__name', flat=True)), ['python'])
+
+    def test_post_job_ignores_company_and_poster(self):
+        other = Company.objects.create(name='Other Company')
+        response = self.client.post('/jobs/', {
+            'title': 'Developer',
+            'description': 'Job desc',
+            'requirements': 'Req',
+            'location': 'NY',
+            'location_type': 'remote',
+            'experience_required': '2 years',
+            'job_type': 'full-time',
+            'company': other.id,
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Job.objects.get(pk=response.data['id']).company, self.company)
 
     def test_post_job_unauthorized(self):
         seeker_user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
@@ -196,7 +252,7 @@ class ApplicationsViewTest(APITestCase):
         Application.objects.create(job=self.job, seeker=self.seeker)
         response = self.client.get('/jobs/applications/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_post_application(self):
         self.client.force_authenticate(user=self.seeker_user)
@@ -205,6 +261,73 @@ class ApplicationsViewTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(Application.objects.filter(job=self.job, seeker=self.seeker).exists())
 
+    def test_post_application_twice(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        self.client.post('/jobs/applications/', {'job': self.job.id})
+        response = self.client.post('/jobs/applications/', {'job': self.job.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Already applied')
+        self.assertEqual(Application.objects.filter(job=self.job, seeker=self.seeker).count(), 1)
+
+    def test_batch_apply(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        jobs = [
+            Job.objects.create(
+                company=self.company,
+                title='Developer %d' % i,
+                description='Job desc',
+                requirements='Req',
+                location='NY',
+                location_type='remote',
+                experience_required='2 years',
+                job_type='full-time',
+                posted_by=self.employer_user,
+                is_active=i < 2,
+            )
+            for i in range(3)
+        ]
+        Application.objects.create(job=self.job, seeker=self.seeker)
+        requested = [self.job.id, jobs[0].id, jobs[1].id, jobs[2].id, 999999]
+        # profile + job lookup + one multi-row insert + one counter UPDATE
+        # per table, plus select/insert/update creating the two jobs' first
+        # counter rows, one list version UPDATE, one change event INSERT and
+        # two savepoint pairs
+        with self.assertNumQueries(14):
+            response = self.client.post('/jobs/applications/batch/', {'jobs': requested}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['applied'], [jobs[0].id, jobs[1].id])
+        self.assertEqual(response.data['already_applied'], [self.job.id])
+        self.assertEqual(response.data['invalid'], [jobs[2].id, 999999])
+        self.assertEqual(Application.objects.filter(seeker=self.seeker).count(), 3)
+
+    def test_batch_apply_race(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        other_job = Job.objects.create(
+            company=self.company,
+            title='Tester',
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.employer_user,
+        )
+        create_applications = views._create_applications
+
+        def racing(seeker_id, job_ids):
+            # A concurrent submit for the first job commits in between
+            Application.objects.bulk_create([Application(job_id=job_ids[0], seeker_id=seeker_id)])
+            return create_applications(seeker_id, job_ids)
+
+        with mock.patch('jobs.views._create_applications', racing):
+            response = self.client.post('/jobs/applications/batch/', {'jobs': [self.job.id, other_job.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['applied'], [other_job.id])
+        self.assertEqual(response.data['already_applied'], [self.job.id])
+        self.assertEqual(JobApplicationCounts.objects.filter(job=self.job).values_list('applied', flat=True).first() or 0, 0)
+        self.assertEqual(ChangeEvent.objects.filter(entity='application', action='created').count(), 1)
+
 class UpdateApplicationStatusViewTest(APITestCase):
     def setUp(self):
         self.seeker_user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
@@ -234,6 +357,38 @@ class UpdateApplicationStatusViewTest(APITestCase):
         self.application.refresh_from_db()
         self.assertEqual(self.application.status, 'shortlisted')
 
+    def test_bulk_update_status(self):
+        other_company = Company.objects.create(name='Other Company')
+        other_job = Job.objects.create(
+            company=other_company,
+            title='Other',
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.employer_user,
+        )
+        foreign = Application.objects.create(job=other_job, seeker=self.seeker)
+        data = {'ids': [self.application.id, foreign.id, 999999], 'status': 'rejected'}
+        # employer profile + locked ownership/status read + one UPDATE + one
+        # counter UPDATE per table + one list version UPDATE + one change
+        # event INSERT, inside a savepoint pair
+        with self.assertNumQueries(9):
+            response = self.client.put('/jobs/applications/status/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], [self.application.id])
+        self.assertEqual(response.data['skipped'], [foreign.id, 999999])
+        self.application.refresh_from_db()
+        foreign.refresh_from_db()
+        self.assertEqual(self.application.status, 'rejected')
+        self.assertEqual(foreign.status, 'applied')
+
+    def test_bulk_update_invalid_status(self):
+        response = self.client.put('/jobs/applications/status/', {'ids': [self.application.id], 'status': 'promoted'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 class InterviewsViewTest(APITestCase):
     def setUp(self):
         self.seeker_user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
@@ -260,11 +415,1412 @@ class InterviewsViewTest(APITestCase):
         Interview.objects.create(application=self.application, interviewer=self.employer, schedule=timezone.now())
         response = self.client.get('/jobs/interviews/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_post_interview(self):
         self.client.force_authenticate(user=self.employer_user)
         data = {'application': self.application.id, 'schedule': timezone.now().isoformat()}
         response = self.client.post('/jobs/interviews/', data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertTrue(Interview.objects.filter(application=self.application).exists())
\ No newline at end of file
+        self.assertTrue(Interview.objects.filter(application=self.application).exists())
+
+class JobsPaginationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.company = Company.objects.create(name='Test Company')
+        self.employer = EmployerProfile.objects.create(user=self.user, company=self.company, position='Manager')
+        self.client.force_authenticate(user=self.user)
+        self.jobs = [
+            Job.objects.create(
+                company=self.company,
+                title='Developer %d' % i,
+                description='Job desc',
+                requirements='Req',
+                location='NY',
+                location_type='remote',
+                experience_required='2 years',
+                job_type='full-time',
+                posted_by=self.user,
+                skills_required='Python'
+            )
+            for i in range(5)
+        ]
+
+    def test_walk_pages_forward_and_back(self):
+        response = self.client.get('/jobs/', {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['previous'])
+        seen = [job['id'] for job in response.data['results']]
+        first_page = list(seen)
+        next_url = response.data['next']
+        while next_url:
+            response = self.client.get(next_url)
+            seen.extend(job['id'] for job in response.data['results'])
+            last = response
+            next_url = response.data['next']
+        self.assertEqual(seen, [job.id for job in reversed(self.jobs)])
+
+        # Walk back from the last page to the first one.
+        prev_url = last.data['previous']
+        while prev_url:
+            response = self.client.get(prev_url)
+            prev_url = response.data['previous']
+        self.assertEqual([job['id'] for job in response.data['results']], first_page)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/jobs/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ListQueryBudgetTest(APITestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name='Test Company')
+        self.employer_user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=self.employer_user, company=self.company, position='Manager')
+        for i in range(5):
+            job = Job.objects.create(
+                company=self.company,
+                title='Developer %d' % i,
+                description='Job desc',
+                requirements='Req',
+                location='NY',
+                location_type='remote',
+                experience_required='2 years',
+                job_type='full-time',
+                posted_by=self.employer_user,
+                skills_required='Python'
+            )
+            seeker_user = User.objects.create_user(username='seeker%d@example.com' % i, email='seeker%d@example.com' % i, password='pass', role='job_seeker')
+            seeker = JobSeekerProfile.objects.create(user=seeker_user, experience_level='fresher')
+            application = Application.objects.create(job=job, seeker=seeker)
+            Interview.objects.create(application=application, interviewer=self.employer, schedule=timezone.now())
+        self.client.force_authenticate(user=self.employer_user)
+
+    def test_jobs_list_queries(self):
+        # collection version + one joined page query
+        with self.assertNumQueries(2):
+            response = self.client.get('/jobs/')
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_applications_list_queries(self):
+        # profile lookup + collection versions + one joined page query
+        with self.assertNumQueries(3):
+            response = self.client.get('/jobs/applications/')
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_interviews_list_queries(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/jobs/interviews/')
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertEqual(response.data['results'][0]['application']['seeker'], 'seeker4@example.com')
+
+    def test_token_authenticated_list_queries(self):
+        self.client.force_authenticate(user=None)
+        tokens = self.client.post('/accounts/login/', {'email': 'employer@example.com', 'password': 'pass'}).data
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer %s' % tokens['access'])
+        self.client.get('/jobs/applications/')
+        # The principal is cached, leaving collection versions and the page query
+        with self.assertNumQueries(2):
+            response = self.client.get('/jobs/applications/')
+        self.assertEqual(len(response.data['results']), 5)
+        with self.assertNumQueries(1):
+            response = self.client.get('/jobs/interviews/')
+        self.assertEqual(len(response.data['results']), 5)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer invalid')
+        response = self.client.get('/jobs/applications/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer')
+
+
+class SkillIndexTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.company = Company.objects.create(name='Test Company')
+        self.employer = EmployerProfile.objects.create(user=self.user, company=self.company, position='Manager')
+        self.client.force_authenticate(user=self.user)
+        self.java = self.create_job('Java dev', 'Java, SQL')
+        self.js = self.create_job('Frontend dev', 'JavaScript,  React ')
+        self.full = self.create_job('Fullstack dev', 'java,javascript')
+
+    def create_job(self, title, skills):
+        serializer = JobCreateSerializer(data={
+            'title': title,
+            'description': 'Job desc',
+            'requirements': 'Req',
+            'location': 'NY',
+            'location_type': 'remote',
+            'experience_required': '2 years',
+            'job_type': 'full-time',
+            'skills_required': skills,
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return serializer.save(company=self.company, posted_by=self.user)
+
+    def result_ids(self, params):
+        response = self.client.get('/jobs/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {job['id'] for job in response.data['results']}
+
+    def test_index_built_on_create(self):
+        self.assertEqual(set(self.js.skill_links.values_list('skill__name', flat=True)), {'javascript', 'react'})
+
+    def test_exact_token_match(self):
+        self.assertEqual(self.result_ids({'skills': 'Java'}), {self.java.id, self.full.id})
+
+    def test_all_and_any(self):
+        self.assertEqual(self.result_ids({'skills': 'java,javascript'}), {self.full.id})
+        self.assertEqual(self.result_ids({'skills': 'sql,react', 'skills_match': 'any'}), {self.java.id, self.js.id})
+        self.assertEqual(self.result_ids({'skills': 'sql,react'}), set())
+
+    def test_index_updated_on_edit(self):
+        serializer = JobCreateSerializer(self.java, data={'skills_required': 'Go'}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        self.assertEqual(self.result_ids({'skills': 'java'}), {self.full.id})
+        self.assertEqual(self.result_ids({'skills': 'go'}), {self.java.id})
+
+
+class JobSearchTest(APITestCase):
+    def setUp(self):
+        fallback_index.clear()
+        self.user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.company = Company.objects.create(name='Test Company')
+        self.employer = EmployerProfile.objects.create(user=self.user, company=self.company, position='Manager')
+        self.client.force_authenticate(user=self.user)
+        self.backend = self.create_job('Python backend engineer', 'Build APIs in Django', 'Python, SQL')
+        self.data = self.create_job('Data analyst', 'Reporting with SQL and some Python scripting', 'SQL')
+        self.frontend = self.create_job('Frontend engineer', 'React single page apps', 'JavaScript')
+
+    def create_job(self, title, description, requirements):
+        return Job.objects.create(
+            company=self.company,
+            title=title,
+            description=description,
+            requirements=requirements,
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.user,
+        )
+
+    def search(self, q, **params):
+        params['q'] = q
+        response = self.client.get('/jobs/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [job['id'] for job in response.data['results']]
+
+    def test_ranked_by_relevance(self):
+        # title matches outrank description-only matches
+        self.assertEqual(self.search('python'), [self.backend.id, self.data.id])
+
+    def test_all_terms_required(self):
+        self.assertEqual(self.search('engineer react'), [self.frontend.id])
+        self.assertEqual(self.search('kotlin'), [])
+
+    def test_index_updated_on_save(self):
+        self.search('python')
+        self.frontend.title = 'Frontend engineer (Python tooling)'
+        self.frontend.save()
+        self.assertIn(self.frontend.id, self.search('python'))
+        self.frontend.delete()
+        self.assertNotIn(self.frontend.id, self.search('engineer'))
+
+    def test_ranked_pagination(self):
+        first = self.search('engineer', page_size=1)
+        response = self.client.get('/jobs/', {'q': 'engineer', 'page_size': 1})
+        second = self.client.get(response.data['next'])
+        self.assertEqual(len(second.data['results']), 1)
+        self.assertNotEqual(second.data['results'][0]['id'], first[0])
+        self.assertIsNone(second.data['next'])
+
+
+class JobCacheTest(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        reset_cache_stats()
+        self.user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.company = Company.objects.create(name='Test Company')
+        self.employer = EmployerProfile.objects.create(user=self.user, company=self.company, position='Manager')
+        self.job = Job.objects.create(
+            company=self.company,
+            title='Developer',
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.user,
+            skills_required='Python'
+        )
+
+    def test_listing_hit_and_miss(self):
+        self.assertEqual(self.client.get('/jobs/', {'location': 'NY'})['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get('/jobs/', {'location': 'NY', 'q': ''})
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(cache_stats()['hits'], 1)
+        self.assertEqual(cache_stats()['misses'], 1)
+
+    def test_listing_invalidated_on_create(self):
+        self.client.get('/jobs/')
+        Job.objects.create(
+            company=self.company,
+            title='Tester',
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.user,
+        )
+        response = self.client.get('/jobs/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_detail_invalidated_on_put_and_delete(self):
+        self.client.get(f'/jobs/{self.job.id}/')
+        self.assertEqual(self.client.get(f'/jobs/{self.job.id}/')['X-Cache'], 'HIT')
+        self.client.get('/jobs/')
+
+        self.client.force_authenticate(user=self.user)
+        self.client.put(f'/jobs/{self.job.id}/', {'title': 'Senior Developer'})
+        response = self.client.get(f'/jobs/{self.job.id}/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['title'], 'Senior Developer')
+
+        self.client.delete(f'/jobs/{self.job.id}/')
+        response = self.client.get('/jobs/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'], [])
+
+
+
+class ConditionalGetTest(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.company = Company.objects.create(name='Test Company')
+        self.employer = EmployerProfile.objects.create(user=self.user, company=self.company, position='Manager')
+        self.job = Job.objects.create(
+            company=self.company,
+            title='Developer',
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.user,
+        )
+        self.seeker_user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
+        self.seeker = JobSeekerProfile.objects.create(user=self.seeker_user, experience_level='fresher')
+        self.application = Application.objects.create(job=self.job, seeker=self.seeker)
+
+    def test_job_detail(self):
+        url = f'/jobs/{self.job.id}/'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+        # Answered from the cached validators, then from the job row alone
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        get_cache().clear()
+        with mock.patch.object(JobSerializer, 'to_representation') as to_representation:
+            with self.assertNumQueries(1):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        to_representation.assert_not_called()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.force_authenticate(user=self.user)
+        self.client.put(url, {'title': 'Senior Developer'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        etag = response['ETag']
+        self.client.delete(url)
+        self.assertNotEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_job_list(self):
+        etag = self.client.get('/jobs/')['ETag']
+        self.assertNotEqual(self.client.get('/jobs/', {'location': 'NY'})['ETag'], etag)
+
+        get_cache().clear()
+        with mock.patch.object(JobListSerializer, 'to_representation') as to_representation:
+            # Only the collection version is read
+            with self.assertNumQueries(1):
+                response = self.client.get('/jobs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        to_representation.assert_not_called()
+
+        self.job.delete()
+        response = self.client.get('/jobs/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+
+    def test_application_lists(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        response = self.client.get('/jobs/applications/')
+        seeker_etag = response['ETag']
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        self.assertEqual(self.client.get('/jobs/applications/', HTTP_IF_NONE_MATCH=seeker_etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.client.force_authenticate(user=self.user)
+        employer_etag = self.client.get('/jobs/applications/')['ETag']
+        self.assertNotEqual(employer_etag, seeker_etag)
+
+        # A status change is seen by both sides
+        self.client.put('/jobs/applications/status/', {'ids': [self.application.id], 'status': 'hired'}, format='json')
+        self.assertEqual(self.client.get('/jobs/applications/', HTTP_IF_NONE_MATCH=employer_etag).status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(user=self.seeker_user)
+        response = self.client.get('/jobs/applications/', HTTP_IF_NONE_MATCH=seeker_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['status'], 'hired')
+
+        # So is an edit of a listed job
+        seeker_etag = response['ETag']
+        self.job.title = 'Senior Developer'
+        self.job.save()
+        self.assertEqual(self.client.get('/jobs/applications/', HTTP_IF_NONE_MATCH=seeker_etag).status_code, status.HTTP_200_OK)
+
+    def test_company_rename(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        paths = ('/jobs/', '/jobs/%d/' % self.job.pk, '/jobs/applications/?expand=job,job.company')
+        etags = {path: self.client.get(path)['ETag'] for path in paths}
+        self.company.name = 'Renamed Company'
+        self.company.save()
+        for path in paths:
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=etags[path])
+            self.assertEqual(response.status_code, status.HTTP_200_OK, path)
+            self.assertIn(b'Renamed Company', response.content, path)
+
+class MatchingTest(APITestCase):
+    def setUp(self):
+        engine.clear()
+        self.user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.company = Company.objects.create(name='Test Company')
+        self.employer = EmployerProfile.objects.create(user=self.user, company=self.company, position='Manager')
+        self.seeker_user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
+        self.seeker = JobSeekerProfile.objects.create(user=self.seeker_user, experience_level='fresher', skills='Python, Django, SQL')
+        self.backend = self.create_job('Backend', 'python,django', '0 years')
+        self.senior = self.create_job('Senior backend', 'python,django', '5 years')
+        self.data = self.create_job('Data', 'python,sql,spark,airflow', '1 year')
+        self.frontend = self.create_job('Frontend', 'javascript', '')
+
+    def create_job(self, title, skills, experience):
+        return Job.objects.create(
+            company=self.company,
+            title=title,
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required=experience,
+            job_type='full-time',
+            posted_by=self.user,
+            skills_required=skills
+        )
+
+    def recommended(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        response = self.client.get('/jobs/recommended/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item['job']['id'], item['score']) for item in response.data['results']]
+
+    def test_recommended_ranking(self):
+        self.assertEqual(self.recommended(), [
+            (self.backend.id, 1.0),
+            (self.senior.id, 0.5),
+            (self.data.id, 0.5),
+        ])
+
+    def test_recommended_requires_seeker_profile(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/jobs/recommended/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_matrix_updated_incrementally(self):
+        self.recommended()
+        self.frontend.skills_required = 'javascript,python'
+        self.frontend.save()
+        self.backend.is_active = False
+        self.backend.save(update_fields=['is_active'])
+        ids = [job_id for job_id, _ in self.recommended()]
+        self.assertIn(self.frontend.id, ids)
+        self.assertNotIn(self.backend.id, ids)
+
+    def test_changes_from_other_processes(self):
+        self.recommended()
+        # Queryset updates send no signals, as if made by another worker
+        Job.objects.filter(pk=self.frontend.pk).update(skills_required='python', updated_at=timezone.now())
+        bump([JOBS])
+        self.assertIn((self.frontend.id, 1.0), self.recommended())
+        # Closed without a version bump: never served, and evicted
+        Job.objects.filter(pk=self.backend.pk).update(is_active=False)
+        self.assertNotIn(self.backend.id, [job_id for job_id, _ in self.recommended()])
+        self.assertNotIn(self.backend.id, [job_id for job_id, _ in engine.recommend_jobs('python,django', 'fresher')])
+
+    def test_seeker_changes_from_other_processes(self):
+        self.assertEqual(engine.rank_candidates(self.data.id), [(self.seeker.id, 0.5)])
+        # Queryset updates send no signals, as if made by another worker
+        JobSeekerProfile.objects.filter(pk=self.seeker.pk).update(skills='python,sql,spark,airflow', updated_at=timezone.now())
+        bump([SEEKERS])
+        self.assertEqual(engine.rank_candidates(self.data.id), [(self.seeker.id, 1.0)])
+        # Deleted by another worker: this process's matrix still has the row
+        seeker = JobSeekerProfile.objects.get(pk=self.seeker.pk)
+        JobSeekerProfile.objects.filter(pk=seeker.pk).delete()
+        engine.update_seeker(seeker)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/jobs/jobs/%d/candidates/' % self.data.id)
+        self.assertEqual(response.data['results'], [])
+        self.assertEqual(engine.rank_candidates(self.data.id), [])
+
+    def test_skill_vocabulary_cached(self):
+        names = skill_vocabulary()
+        self.assertIn('python', names)
+        with self.assertNumQueries(1):
+            self.assertIs(skill_vocabulary(), names)
+        get_skill_ids(['rust'], create=True)
+        self.assertEqual(skill_vocabulary(), names | {'rust'})
+
+    def test_resume_skills_count(self):
+        self.recommended()
+        resume = Resume.objects.create(sha256='a' * 64, file='resumes/aa/resume.txt', size=1)
+        JobSeekerProfile.objects.filter(pk=self.seeker.pk).update(resume_content=resume)
+        save_result(resume.sha256, ('Spark and Airflow pipelines', ['spark', 'airflow']))
+        self.assertIn((self.data.id, 1.0), self.recommended())
+
+    def test_applicant_skill_filter(self):
+        other_user = User.objects.create_user(username='other@example.com', email='other@example.com', password='pass', role='job_seeker')
+        other = JobSeekerProfile.objects.create(user=other_user, experience_level='experienced', skills='Java')
+        Application.objects.create(job=self.backend, seeker=self.seeker)
+        Application.objects.create(job=self.backend, seeker=other)
+        self.client.force_authenticate(user=self.user)
+
+        def applicants(skills, match='all'):
+            response = self.client.get('/jobs/applications/', {'skills': skills, 'skills_match': match})
+            return {application['seeker'] for application in response.data['results']}
+
+        self.assertEqual(applicants('python, SQL'), {str(self.seeker)})
+        self.assertEqual(applicants('python,java', 'any'), {str(self.seeker), str(other)})
+        # Resume skills are indexed once extracted
+        resume = Resume.objects.create(sha256='b' * 64, file='resumes/bb/resume.txt', size=1)
+        JobSeekerProfile.objects.filter(pk=other.pk).update(resume_content=resume)
+        save_result(resume.sha256, ('Spark pipelines', ['spark']))
+        self.assertEqual(applicants('spark'), {str(other)})
+        other.skills = ''
+        other.save()
+        self.assertEqual(applicants('java'), set())
+
+    def test_job_candidates(self):
+        other_user = User.objects.create_user(username='other@example.com', email='other@example.com', password='pass', role='job_seeker')
+        JobSeekerProfile.objects.create(user=other_user, experience_level='experienced', skills='python')
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(f'/jobs/{self.backend.id}/candidates/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item['name'], item['score']) for item in response.data['results']],
+            [('seeker@example.com', 1.0), ('other@example.com', 0.375)],
+        )
+
+    def test_job_candidates_requires_owner(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        response = self.client.get(f'/jobs/{self.backend.id}/candidates/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class JobImportTest(APITestCase):
+    CSV = (
+        'title,description,requirements,location,location_type,experience_required,job_type,salary_min,skills_required\n'
+        'Developer,Job desc,Req,NY,remote,2 years,full-time,,"Python, SQL"\n'
+        'Tester,Job desc,Req,NY,moon,2 years,full-time,100,QA\n'
+        'Analyst,Job desc,Req,LA,onsite,1 year,part-time,5000,SQL\n'
+    )
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.company = Company.objects.create(name='Test Company')
+        self.employer = EmployerProfile.objects.create(user=self.user, company=self.company, position='Manager')
+        self.client.force_authenticate(user=self.user)
+
+    def test_import_csv(self):
+        upload = SimpleUploadedFile('jobs.csv', self.CSV.encode('utf-8'), content_type='text/csv')
+        response = self.client.post('/jobs/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['failed'], 1)
+        self.assertEqual(response.data['errors'][0]['row'], 2)
+        self.assertIn('location_type', response.data['errors'][0]['errors'])
+        job = Job.objects.get(title='Developer')
+        self.assertEqual(job.company, self.company)
+        self.assertEqual(job.posted_by, self.user)
+        self.assertIsNone(job.salary_min)
+        self.assertEqual(set(job.skill_links.values_list('skill__name', flat=True)), {'python', 'sql'})
+
+    def test_import_requires_employer(self):
+        seeker_user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
+        self.client.force_authenticate(user=seeker_user)
+        upload = SimpleUploadedFile('jobs.csv', self.CSV.encode('utf-8'))
+        response = self.client.post('/jobs/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_import_command_jsonl(self):
+        rows = [
+            '{"title": "Developer", "description": "d", "requirements": "r", "location": "NY", "location_type": "remote", "experience_required": "2 years", "job_type": "full-time"}',
+            'not json',
+            '',
+            '{"title": "Intern", "description": "d", "requirements": "r", "location": "NY", "location_type": "hybrid", "experience_required": "0", "job_type": "internship"}',
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as handle:
+            handle.write('\n'.join(rows))
+        call_command('import_jobs', handle.name, employer='employer@example.com', batch_size=1, stdout=io.StringIO(), stderr=io.StringIO())
+        os.unlink(handle.name)
+        self.assertEqual(set(Job.objects.values_list('title', flat=True)), {'Developer', 'Intern'})
+
+
+class ApplicationExportTest(APITestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name='Test Company')
+        self.employer_user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=self.employer_user, company=self.company, position='Manager')
+        self.job = Job.objects.create(
+            company=self.company,
+            title='Developer',
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.employer_user,
+            skills_required='Python'
+        )
+        for i in range(3):
+            seeker_user = User.objects.create_user(username='seeker%d@example.com' % i, email='seeker%d@example.com' % i, password='pass', role='job_seeker')
+            seeker = JobSeekerProfile.objects.create(user=seeker_user, experience_level='fresher', skills='Python')
+            Application.objects.create(job=self.job, seeker=seeker)
+        other_company = Company.objects.create(name='Other Company')
+        other_job = Job.objects.create(
+            company=other_company,
+            title='Other',
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.employer_user,
+        )
+        Application.objects.create(job=other_job, seeker=seeker)
+        self.client.force_authenticate(user=self.employer_user)
+
+    def content(self, response):
+        if not response.is_async:
+            return b''.join(response.streaming_content).decode('utf-8')
+
+        async def read():
+            return b''.join([chunk async for chunk in response.streaming_content])
+        return async_to_sync(read)().decode('utf-8')
+
+    def test_export_csv(self):
+        response = self.client.get('/jobs/applications/export/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = self.content(response).splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['id', 'status', 'applied_date'])
+        self.assertEqual(len(lines), 4)
+        self.assertIn('seeker0@example.com', lines[1])
+
+    def test_export_jsonl(self):
+        response = self.client.get('/jobs/applications/export/', {'file_format': 'jsonl', 'job': self.job.id})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['job_title'], 'Developer')
+        self.assertEqual(rows[0]['seeker_username'], 'seeker0@example.com')
+
+    def test_sync_and_async_exports_match(self):
+        for file_format in ('csv', 'jsonl'):
+            request = APIRequestFactory().get('/jobs/applications/export/', {'file_format': file_format})
+            force_authenticate(request, user=self.employer_user)
+            expected = views.application_export(request)
+            response = async_to_sync(async_views.application_export)(request)
+            # An async iterator; ASGI would read a sync one whole
+            self.assertTrue(response.is_async)
+            self.assertEqual(self.content(response), self.content(expected))
+
+        async def export_in_chunks():
+            return ''.join([chunk async for chunk in astream_applications(Application.objects.all(), 'jsonl', chunk_size=2)])
+        self.assertEqual(len(async_to_sync(export_in_chunks)().splitlines()), 4)
+
+
+class ListFieldSelectionTest(APITestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.company = Company.objects.create(name='Test Company')
+        self.employer_user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=self.employer_user, company=self.company, position='Manager')
+        self.seeker_user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
+        self.seeker = JobSeekerProfile.objects.create(user=self.seeker_user, experience_level='fresher')
+        self.job = Job.objects.create(
+            company=self.company,
+            title='Developer',
+            description='A very long description',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.employer_user,
+            skills_required='Python'
+        )
+        self.application = Application.objects.create(job=self.job, seeker=self.seeker)
+
+    def test_job_list_is_slim(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/jobs/')
+        job = response.data['results'][0]
+        self.assertNotIn('description', job)
+        self.assertEqual(job['company']['name'], 'Test Company')
+        self.assertNotIn('description', queries[0]['sql'])
+
+    def test_fields_and_expand(self):
+        response = self.client.get('/jobs/', {'fields': 'id,title,company', 'expand': ''})
+        self.assertEqual(response.data['results'], [{'id': self.job.id, 'title': 'Developer', 'company': self.company.id}])
+
+    def test_fields_without_id_paginate(self):
+        second = Job.objects.create(
+            company=self.company,
+            title='Tester',
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.employer_user,
+        )
+        response = self.client.get('/jobs/', {'fields': 'title', 'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{'title': second.title}])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'], [{'title': 'Developer'}])
+
+    def test_nested_expand(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        response = self.client.get('/jobs/applications/', {'expand': 'job,job.company'})
+        application = response.data['results'][0]
+        self.assertEqual(application['seeker'], self.seeker.id)
+        self.assertEqual(application['job']['company']['name'], 'Test Company')
+
+        response = self.client.get('/jobs/applications/', {'fields': 'id,status'})
+        self.assertEqual(response.data['results'], [{'id': self.application.id, 'status': 'applied'}])
+
+
+class FastPathSerializationTest(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name='Test Company', industry='Tech')
+        self.employer_user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=self.employer_user, company=self.company, position='Manager')
+        self.seeker_user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
+        self.seeker = JobSeekerProfile.objects.create(user=self.seeker_user, experience_level='fresher')
+        for i in range(3):
+            job = Job.objects.create(
+                company=self.company,
+                title='Développeur %d' % i,
+                description='Job desc',
+                requirements='Req',
+                location='NY',
+                location_type='remote',
+                salary_min=1000 * i or None,
+                experience_required='2 years',
+                job_type='full-time',
+                posted_by=self.employer_user,
+                application_deadline=timezone.now().date() if i else None,
+                skills_required='Python'
+            )
+            application = Application.objects.create(job=job, seeker=self.seeker)
+            Interview.objects.create(application=application, interviewer=self.employer, schedule=timezone.now())
+
+    def assertMatches(self, serializer_class, queryset, **options):
+        plan = compile_plan(serializer_class, **options)
+        fast = plan.render(plan.values(queryset.order_by('id')))
+        expected = serializer_class(queryset.order_by('id'), many=True, **options).data
+        self.assertEqual(fast, [dict(item) for item in expected])
+        self.assertEqual(
+            json.loads(FastJSONRenderer().render(fast)),
+            json.loads(JSONRenderer().render(expected)),
+        )
+
+    def test_renderer_matches_without_orjson(self):
+        moment = datetime(2026, 3, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc)
+        data = {
+            'slots': [{'start': moment, 'end': moment.astimezone(dt_timezone(timedelta(hours=-5)))}],
+            'day': moment.date(), 'time': moment.time(), 'name': 'Zoë',
+        }
+        rendered = FastJSONRenderer().render(data)
+        with mock.patch('jobs.renderers.orjson', None):
+            self.assertEqual(rendered, FastJSONRenderer().render(data))
+        self.assertIn(b'"2026-03-01T09:30:15.123456Z"', rendered)
+
+    def test_full_serializers(self):
+        self.assertMatches(JobSerializer, Job.objects.all())
+        self.assertMatches(ApplicationSerializer, Application.objects.all())
+
+    def test_list_serializers(self):
+        self.assertMatches(JobListSerializer, Job.objects.all())
+        self.assertMatches(JobListSerializer, Job.objects.all(), fields=['id', 'title', 'company'], expand=[])
+        self.assertMatches(ApplicationListSerializer, Application.objects.all())
+        self.assertMatches(ApplicationListSerializer, Application.objects.all(), expand=['job', 'job.company'])
+        self.assertMatches(InterviewListSerializer, Interview.objects.all())
+        self.assertMatches(InterviewListSerializer, Interview.objects.all(), fields=['id', 'schedule'])
+
+    def test_single_query(self):
+        plan = compile_plan(InterviewListSerializer)
+        with self.assertNumQueries(1):
+            plan.render(plan.values(Interview.objects.all()))
+
+
+def reload_urls():
+    importlib.reload(jobs_urls)
+    # The root URLconf's include() resolvers cache the old patterns
+    importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+class AsyncReadViewsTest(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # jobs.urls picks the read views when imported; cleanups run in
+        # reverse, so the routes are rebuilt after the setting is restored
+        cls.addClassCleanup(reload_urls)
+        cls.enterClassContext(override_settings(JOBS_ASYNC_VIEWS=True))
+        reload_urls()
+
+    def setUp(self):
+        self.company = Company.objects.create(name='Test Company')
+        self.employer_user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=self.employer_user, company=self.company, position='Manager')
+        self.seeker_user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
+        self.seeker = JobSeekerProfile.objects.create(user=self.seeker_user, experience_level='fresher')
+        for i in range(3):
+            self.job = Job.objects.create(
+                company=self.company,
+                title='Developer %d' % i,
+                description='Job desc',
+                requirements='Req',
+                location='NY',
+                location_type='remote',
+                experience_required='2 years',
+                job_type='full-time',
+                posted_by=self.employer_user,
+                skills_required='Python'
+            )
+            application = Application.objects.create(job=self.job, seeker=self.seeker)
+            Interview.objects.create(application=application, interviewer=self.employer, schedule=timezone.now())
+
+    def assertSameAsSync(self, name, path, user, **kwargs):
+        factory = APIRequestFactory()
+        responses = []
+        for view in (getattr(views, name), getattr(async_views, name)):
+            get_cache().clear()
+            request = factory.get(path)
+            force_authenticate(request, user=user)
+            if inspect.iscoroutinefunction(view):
+                response = async_to_sync(view)(request, **kwargs)
+            else:
+                response = view(request, **kwargs).render()
+            responses.append((response.status_code, json.loads(response.content)))
+        self.assertEqual(responses[0], responses[1])
+
+    def test_read_routes_are_async(self):
+        for path in ('/jobs/', '/jobs/%d/' % self.job.pk, '/jobs/applications/', '/jobs/interviews/'):
+            self.assertTrue(inspect.iscoroutinefunction(resolve(path).func), path)
+
+    def test_matches_sync_views(self):
+        self.assertSameAsSync('jobs', '/jobs/?page_size=2', self.seeker_user)
+        self.assertSameAsSync('jobs', '/jobs/?q=developer', self.seeker_user)
+        self.assertSameAsSync('job_detail', '/jobs/%d/' % self.job.pk, self.seeker_user, pk=self.job.pk)
+        self.assertSameAsSync('job_detail', '/jobs/0/', self.seeker_user, pk=0)
+        self.assertSameAsSync('applications', '/applications/', self.seeker_user)
+        self.assertSameAsSync('applications', '/applications/?expand=', self.employer_user)
+        self.assertSameAsSync('interviews', '/interviews/', self.employer_user)
+
+    def test_session_authentication(self):
+        self.client.force_login(self.seeker_user)
+        response = self.client.get('/jobs/applications/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_invalid_cursor(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        response = self.client.get('/jobs/?cursor=garbage')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_writes_use_sync_view(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        response = self.client.post('/jobs/applications/', {'job': self.job.pk})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'error': 'Already applied'})
+
+
+class ApplicationCountersTest(APITestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name='Test Company')
+        self.employer_user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        EmployerProfile.objects.create(user=self.employer_user, company=self.company, position='Manager')
+        self.seekers = []
+        for i in range(3):
+            user = User.objects.create_user(username='seeker%d@example.com' % i, email='seeker%d@example.com' % i, password='pass', role='job_seeker')
+            self.seekers.append(JobSeekerProfile.objects.create(user=user, experience_level='fresher'))
+        self.backend = self.create_job('Backend')
+        self.frontend = self.create_job('Frontend')
+
+    def create_job(self, title):
+        return Job.objects.create(
+            company=self.company,
+            title=title,
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.employer_user,
+        )
+
+    def stats(self):
+        self.client.force_authenticate(user=self.employer_user)
+        response = self.client.get('/jobs/applications/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        jobs = {job['id']: job['counts'] for job in response.data['jobs']}
+        return response.data['company'], jobs
+
+    def counts(self, **counts):
+        return {'total': sum(counts.values()), 'applied': 0, 'shortlisted': 0, 'rejected': 0, 'hired': 0, **counts}
+
+    def test_counters_follow_applications(self):
+        self.client.force_authenticate(user=self.seekers[0].user)
+        self.client.post('/jobs/applications/', {'job': self.backend.id})
+        self.client.post('/jobs/applications/', {'job': self.backend.id})  # duplicate, not counted
+        self.client.force_authenticate(user=self.seekers[1].user)
+        self.client.post('/jobs/applications/batch/', {'jobs': [self.backend.id, self.frontend.id]}, format='json')
+        Application.objects.create(job=self.frontend, seeker=self.seekers[2])
+
+        company, jobs = self.stats()
+        self.assertEqual(company, self.counts(applied=4))
+        self.assertEqual(jobs[self.backend.id], self.counts(applied=2))
+
+        first = Application.objects.get(job=self.backend, seeker=self.seekers[0])
+        self.client.put(f'/jobs/applications/{first.id}/status/', {'status': 'shortlisted'})
+        self.client.put(f'/jobs/applications/{first.id}/status/', {'status': 'shortlisted'})
+        frontend_ids = list(Application.objects.filter(job=self.frontend).values_list('id', flat=True))
+        self.client.put('/jobs/applications/status/', {'ids': frontend_ids + [first.id], 'status': 'hired'}, format='json')
+
+        company, jobs = self.stats()
+        self.assertEqual(company, self.counts(applied=1, hired=3))
+        self.assertEqual(jobs[self.backend.id], self.counts(applied=1, hired=1))
+        self.assertEqual(jobs[self.frontend.id], self.counts(hired=2))
+
+        self.frontend.delete()
+        self.seekers[1].delete()
+        company, jobs = self.stats()
+        self.assertEqual(company, self.counts(hired=1))
+        self.assertEqual(list(jobs), [self.backend.id])
+
+    def test_new_applications_counted_under_their_status(self):
+        self.client.force_authenticate(user=self.seekers[0].user)
+        response = self.client.post('/jobs/applications/', {'job': self.backend.id, 'status': 'hired'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Application.objects.get(seeker=self.seekers[0]).status, 'applied')
+        Application.objects.create(job=self.frontend, seeker=self.seekers[1], status='hired')
+
+        company, jobs = self.stats()
+        self.assertEqual(company, self.counts(applied=1, hired=1))
+        self.assertEqual(jobs[self.frontend.id], self.counts(hired=1))
+
+        out = io.StringIO()
+        call_command('reconcile_application_counts', stdout=out)
+        self.assertIn('Fixed counters for 0 jobs and 0 companies', out.getvalue())
+
+    def test_stats_requires_employer(self):
+        self.client.force_authenticate(user=self.seekers[0].user)
+        response = self.client.get('/jobs/applications/stats/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_reconcile_command(self):
+        Application.objects.create(job=self.backend, seeker=self.seekers[0])
+        Application.objects.bulk_create([
+            Application(job=self.backend, seeker=self.seekers[1], status='rejected'),
+            Application(job=self.frontend, seeker=self.seekers[2]),
+        ])
+        JobApplicationCounts.objects.filter(job=self.backend).update(hired=5)
+
+        out = io.StringIO()
+        call_command('reconcile_application_counts', stdout=out)
+        self.assertIn('Fixed counters for 2 jobs and 1 companies', out.getvalue())
+        company, jobs = self.stats()
+        self.assertEqual(company, self.counts(applied=2, rejected=1))
+        self.assertEqual(jobs[self.backend.id], self.counts(applied=1, rejected=1))
+        self.assertEqual(jobs[self.frontend.id], self.counts(applied=1))
+
+        out = io.StringIO()
+        call_command('reconcile_application_counts', stdout=out)
+        self.assertIn('Fixed counters for 0 jobs and 0 companies', out.getvalue())
+
+
+class InterviewSchedulingTest(APITestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name='Test Company')
+        self.employer_user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=self.employer_user, company=self.company, position='Manager')
+        colleague = User.objects.create_user(username='colleague@example.com', email='colleague@example.com', password='pass', role='employer')
+        self.colleague = EmployerProfile.objects.create(user=colleague, company=self.company, position='Engineer')
+        self.job = Job.objects.create(
+            company=self.company,
+            title='Developer',
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.employer_user,
+        )
+        self.applications = []
+        for i in range(2):
+            user = User.objects.create_user(username='seeker%d@example.com' % i, email='seeker%d@example.com' % i, password='pass', role='job_seeker')
+            seeker = JobSeekerProfile.objects.create(user=user, experience_level='fresher')
+            self.applications.append(Application.objects.create(job=self.job, seeker=seeker))
+        self.day = timezone.now().replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        self.client.force_authenticate(user=self.employer_user)
+
+    def book(self, application, hour, minute=0, duration=60, interviewer=None):
+        data = {'application': application.id, 'schedule': (self.day + timedelta(hours=hour, minutes=minute)).isoformat(), 'duration': duration}
+        if interviewer is not None:
+            data['interviewer'] = interviewer.id
+        return self.client.post('/jobs/interviews/', data)
+
+    def test_conflicts(self):
+        response = self.book(self.applications[0], 1)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Interview.objects.get(pk=response.data['id']).ends_at, self.day + timedelta(hours=2))
+
+        # Same interviewer, overlapping
+        response = self.book(self.applications[1], 1, 30)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual([conflict['party'] for conflict in response.data['conflicts']], ['interviewer'])
+        # Same candidate with another interviewer
+        response = self.book(self.applications[0], 0, 30, interviewer=self.colleague)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual([conflict['party'] for conflict in response.data['conflicts']], ['candidate'])
+        # Back to back is fine
+        self.assertEqual(self.book(self.applications[1], 2).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.book(self.applications[1], 0, duration=60, interviewer=self.colleague).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Interview.objects.count(), 3)
+
+    def test_rejects_long_and_foreign_bookings(self):
+        self.assertEqual(self.book(self.applications[0], 1, duration=5 * 60).status_code, status.HTTP_400_BAD_REQUEST)
+        other_company = Company.objects.create(name='Other')
+        outsider = EmployerProfile.objects.create(
+            user=User.objects.create_user(username='outsider@example.com', password='pass', role='employer'), company=other_company)
+        self.assertEqual(self.book(self.applications[0], 1, interviewer=outsider).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_interval_set(self):
+        t = self.day
+        busy = IntervalSet([(t, t + timedelta(hours=1)), (t + timedelta(minutes=30), t + timedelta(hours=2)), (t + timedelta(hours=3), t + timedelta(hours=4))])
+        self.assertEqual(len(busy), 2)
+        self.assertEqual(busy.overlapping(t + timedelta(hours=2), t + timedelta(hours=3)), None)
+        self.assertEqual(busy.overlapping(t + timedelta(hours=2), t + timedelta(hours=3, minutes=1)), 1)
+        self.assertEqual(busy.overlapping(t - timedelta(hours=1), t + timedelta(minutes=1)), 0)
+        slots = busy.free_slots(t, t + timedelta(hours=6), timedelta(minutes=45), 3, timedelta(minutes=30))
+        self.assertEqual([slot_start - t for slot_start, _ in slots], [timedelta(hours=2), timedelta(hours=4), timedelta(hours=5)])
+
+    def test_free_slots(self):
+        self.book(self.applications[0], 0)
+        self.book(self.applications[1], 1, 30, interviewer=self.colleague)
+        params = {
+            'interviewers': [self.employer.id, self.colleague.id],
+            'start': self.day.isoformat(), 'end': (self.day + timedelta(hours=8)).isoformat(),
+            'duration': 60, 'count': 2,
+        }
+        response = self.client.get('/jobs/interviews/free-slots/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        starts = [slot['start'] for slot in response.data['slots']]
+        self.assertEqual(starts, [self.day + timedelta(hours=2, minutes=30), self.day + timedelta(hours=3, minutes=30)])
+
+        # The candidate's own interviews count too
+        self.book(self.applications[1], 2, 30)
+        params['application'] = self.applications[1].id
+        response = self.client.get('/jobs/interviews/free-slots/', params)
+        self.assertEqual(response.data['slots'][0]['start'], self.day + timedelta(hours=3, minutes=30))
+
+    def test_candidate_queries_skip_applications(self):
+        self.book(self.applications[0], 1)
+        seeker_id = self.applications[0].seeker_id
+        with CaptureQueriesContext(connection) as queries:
+            conflicts = find_conflicts(self.colleague.id, seeker_id, self.day, self.day + timedelta(hours=3))
+            busy = busy_intervals([self.colleague.id], self.day, self.day + timedelta(hours=3), seeker_id)
+        self.assertEqual([conflict['party'] for conflict in conflicts], ['candidate'])
+        self.assertEqual(len(busy), 1)
+        self.assertFalse([query['sql'] for query in queries if 'jobs_application' in query['sql']])
+
+    def test_free_slots_validation(self):
+        response = self.client.get('/jobs/interviews/free-slots/', {'start': self.day.isoformat(), 'end': (self.day + timedelta(days=40)).isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/jobs/interviews/free-slots/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['slots']), 5)
+        self.client.force_authenticate(user=self.applications[0].seeker.user)
+        self.assertEqual(self.client.get('/jobs/interviews/free-slots/').status_code, status.HTTP_403_FORBIDDEN)
+
+
+class InterviewCalendarTest(APITestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name='Acme, Inc.')
+        self.employer_user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=self.employer_user, company=self.company, position='Manager')
+        self.seeker_user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
+        self.seeker = JobSeekerProfile.objects.create(user=self.seeker_user, experience_level='fresher')
+        self.job = Job.objects.create(
+            company=self.company,
+            title='Developer; backend',
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.employer_user,
+        )
+        self.application = Application.objects.create(job=self.job, seeker=self.seeker)
+        start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.interviews = [
+            Interview.objects.create(application=self.application, interviewer=self.employer, schedule=start + timedelta(hours=i))
+            for i in range(2)
+        ]
+
+    def test_feed_and_etag(self):
+        self.client.force_authenticate(user=self.employer_user)
+        response = self.client.get('/jobs/interviews/calendar.ics')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        body = response.content.decode()
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertEqual(body.count('BEGIN:VEVENT'), 2)
+        self.assertIn('SUMMARY:Interview: Developer\; backend (Acme\\, Inc.)\r\n', body)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in body.split('\r\n')))
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/jobs/interviews/calendar.ics', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        etag = response['ETag']
+        self.interviews[0].delete()
+        response = self.client.get('/jobs/interviews/calendar.ics', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content.decode().count('BEGIN:VEVENT'), 1)
+
+    def test_feed_token(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        url = self.client.get('/jobs/interviews/calendar-url/').data['url']
+        self.client.force_authenticate(user=None)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content.decode().count('BEGIN:VEVENT'), 2)
+
+        self.seeker_user.set_password('changed')
+        self.seeker_user.save()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get('/jobs/interviews/calendar.ics?token=forged').status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_delta_sync(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        response = self.client.get('/jobs/interviews/sync/')
+        self.assertEqual([row['id'] for row in response.data['changed']], [interview.id for interview in self.interviews])
+        self.assertEqual(response.data['changed'][0]['company'], 'Acme, Inc.')
+        token = response.data['sync_token']
+
+        # Outside the overlap window nothing is re-sent
+        Interview.objects.update(updated_at=timezone.now() - timedelta(minutes=5))
+        Job.objects.update(updated_at=timezone.now() - timedelta(minutes=5))
+        InterviewDeletion.objects.all().delete()
+        with mock.patch('jobs.ical.SYNC_OVERLAP', timedelta(0)):
+            response = self.client.get('/jobs/interviews/sync/', {'sync_token': token})
+            self.assertEqual(response.data['changed'], [])
+            token = response.data['sync_token']
+
+            self.interviews[0].feedback = 'Strong'
+            self.interviews[0].save()
+            deleted_id = self.interviews[1].id
+            self.interviews[1].delete()
+            response = self.client.get('/jobs/interviews/sync/', {'sync_token': token})
+        self.assertEqual([row['id'] for row in response.data['changed']], [self.interviews[0].id])
+        self.assertEqual(response.data['deleted'], [deleted_id])
+        self.assertNotIn('feedback', response.data['changed'][0])
+
+    def test_job_and_company_edits_reach_calendars(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        etag = self.client.get('/jobs/interviews/calendar.ics')['ETag']
+        token = self.client.get('/jobs/interviews/sync/').data['sync_token']
+        Interview.objects.update(updated_at=timezone.now() - timedelta(minutes=5))
+        Job.objects.update(updated_at=timezone.now() - timedelta(minutes=5))
+
+        with mock.patch('jobs.ical.SYNC_OVERLAP', timedelta(0)):
+            self.company.name = 'Acme Corp'
+            self.company.save()
+            response = self.client.get('/jobs/interviews/calendar.ics', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn('(Acme Corp)', response.content.decode())
+            response = self.client.get('/jobs/interviews/sync/', {'sync_token': token})
+            self.assertEqual([row['company'] for row in response.data['changed']], ['Acme Corp', 'Acme Corp'])
+            token = response.data['sync_token']
+
+            etag = self.client.get('/jobs/interviews/calendar.ics')['ETag']
+            self.job.title = 'Developer; frontend'
+            self.job.save()
+            response = self.client.get('/jobs/interviews/calendar.ics', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response = self.client.get('/jobs/interviews/sync/', {'sync_token': token})
+            self.assertEqual([row['job_title'] for row in response.data['changed']], ['Developer; frontend'] * 2)
+
+    def test_sync_token_checks(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        token = self.client.get('/jobs/interviews/sync/').data['sync_token']
+        self.client.force_authenticate(user=self.employer_user)
+        self.assertEqual(self.client.get('/jobs/interviews/sync/', {'sync_token': token}).status_code, status.HTTP_410_GONE)
+        self.assertEqual(self.client.get('/jobs/interviews/sync/', {'sync_token': 'junk'}).status_code, status.HTTP_410_GONE)
+
+
+class ChangeEventTest(APITestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name='Test Company')
+        self.employer_user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=self.employer_user, company=self.company, position='Manager')
+        self.seeker_user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
+        self.seeker = JobSeekerProfile.objects.create(user=self.seeker_user, experience_level='fresher')
+        self.admin = User.objects.create_user(username='admin@example.com', email='admin@example.com', password='pass', is_staff=True)
+        self.jobs = [
+            Job.objects.create(
+                company=self.company,
+                title='Developer %d' % i,
+                description='Job desc',
+                requirements='Req',
+                location='NY',
+                location_type='remote',
+                experience_required='2 years',
+                job_type='full-time',
+                posted_by=self.employer_user,
+            )
+            for i in range(2)
+        ]
+
+    def changes(self, after=0):
+        return [(event.entity, event.action) for event in ChangeEvent.objects.filter(id__gt=after).order_by('id')]
+
+    def test_view_and_bulk_writes_are_recorded(self):
+        self.assertEqual(self.changes(), [('job', 'created'), ('job', 'created')])
+        start = ChangeEvent.objects.latest('id').id
+
+        self.client.force_authenticate(user=self.seeker_user)
+        self.client.post('/jobs/applications/batch/', {'jobs': [job.id for job in self.jobs]}, format='json')
+        applications = list(Application.objects.order_by('id'))
+        self.client.force_authenticate(user=self.employer_user)
+        self.client.put('/jobs/applications/status/', {'ids': [applications[0].id], 'status': 'hired'}, format='json')
+        Interview.objects.create(application=applications[0], interviewer=self.employer, schedule=timezone.now())
+        job_id = self.jobs[0].id
+        self.jobs[0].delete()
+        self.assertEqual(self.changes(start), [
+            ('application', 'created'), ('application', 'created'),
+            ('application', 'updated'),
+            ('interview', 'created'),
+            ('application', 'deleted'), ('interview', 'deleted'), ('job', 'deleted'),
+        ])
+        updated = ChangeEvent.objects.get(entity='application', action='updated')
+        self.assertEqual(updated.entity_id, applications[0].id)
+        self.assertEqual(updated.data, {
+            'job': job_id, 'seeker': self.seeker.id, 'company': self.company.id, 'status': 'hired'})
+
+    def test_unchanged_status_is_not_recorded(self):
+        application = Application.objects.create(job=self.jobs[0], seeker=self.seeker)
+        start = ChangeEvent.objects.latest('id').id
+        versions = list(CollectionVersion.objects.order_by('name').values_list('name', 'version'))
+
+        self.client.force_authenticate(user=self.employer_user)
+        response = self.client.put(f'/jobs/applications/{application.id}/status/', {'status': 'applied'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'applied')
+        self.assertEqual(self.changes(start), [])
+        self.assertEqual(list(CollectionVersion.objects.order_by('name').values_list('name', 'version')), versions)
+
+    def test_rolled_back_writes_leave_no_events(self):
+        count = ChangeEvent.objects.count()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Application.objects.create(job=self.jobs[0], seeker=self.seeker)
+            Application.objects.create(job=self.jobs[0], seeker=self.seeker)
+        self.assertEqual(ChangeEvent.objects.count(), count)
+
+    def test_consumer_api(self):
+        self.client.force_authenticate(user=self.seeker_user)
+        self.assertEqual(self.client.get('/jobs/events/').status_code, status.HTTP_403_FORBIDDEN)
+
+        Application.objects.create(job=self.jobs[0], seeker=self.seeker)
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get('/jobs/events/', {'limit': 2})
+        self.assertEqual([event['entity'] for event in response.data['events']], ['job', 'job'])
+        response = self.client.get('/jobs/events/', {'after': response.data['cursor']})
+        self.assertEqual([event['entity'] for event in response.data['events']], ['application'])
+        cursor = response.data['cursor']
+        self.assertEqual(self.client.get('/jobs/events/', {'after': cursor}).data, {'events': [], 'cursor': cursor})
+
+        # Filtered out events still move the cursor
+        response = self.client.get('/jobs/events/', {'entity': 'application,interview'})
+        self.assertEqual(len(response.data['events']), 1)
+        self.assertEqual(response.data['cursor'], cursor)
+        self.assertEqual(self.client.get('/jobs/events/', {'entity': 'company'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_recent_gap_is_waited_for(self):
+        first, second = ChangeEvent.objects.order_by('id')
+        Application.objects.create(job=self.jobs[0], seeker=self.seeker)
+        third = ChangeEvent.objects.latest('id')
+        # As if the second event's transaction had not committed yet
+        second.delete()
+        events, cursor = read_events()
+        self.assertEqual([event.id for event in events], [first.id])
+        self.assertEqual(cursor, first.id)
+        with mock.patch('jobs.outbox.timezone.now', return_value=timezone.now() + OUTBOX_SETTLE):
+            events, cursor = read_events(cursor)
+        self.assertEqual([event.id for event in events], [third.id])
+
+    @override_settings(OUTBOX_STREAM_DURATION=0)
+    def test_stream(self):
+        first = ChangeEvent.objects.order_by('id').first()
+        for view in (views.change_event_stream, async_views.change_event_stream):
+            request = APIRequestFactory().get('/jobs/events/stream/', HTTP_ACCEPT='text/event-stream', HTTP_LAST_EVENT_ID=str(first.id))
+            force_authenticate(request, user=self.admin)
+            response = async_to_sync(view)(request) if inspect.iscoroutinefunction(view) else view(request)
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            body = b''.join(response).decode()
+            self.assertTrue(body.startswith('retry: 1000\n\n'))
+            self.assertIn('id: %d\nevent: job.created\ndata: ' % (first.id + 1), body)
+            self.assertNotIn('id: %d\n' % first.id, body)
+
+
+class NotificationTest(APITestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name='Test Company')
+        self.other_company = Company.objects.create(name='Other Company')
+        self.employer_user = User.objects.create_user(username='employer@example.com', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=self.employer_user, company=self.company, position='Manager')
+        self.other_user = User.objects.create_user(username='other@example.com', email='other@example.com', password='pass', role='employer')
+        EmployerProfile.objects.create(user=self.other_user, company=self.other_company, position='Manager')
+        self.seeker_user = User.objects.create_user(username='seeker@example.com', email='seeker@example.com', password='pass', role='job_seeker')
+        self.seeker = JobSeekerProfile.objects.create(user=self.seeker_user, experience_level='fresher')
+        self.job = Job.objects.create(
+            company=self.company,
+            title='Developer',
+            description='Job desc',
+            requirements='Req',
+            location='NY',
+            location_type='remote',
+            experience_required='2 years',
+            job_type='full-time',
+            posted_by=self.employer_user,
+        )
+        self.application = Application.objects.create(job=self.job, seeker=self.seeker)
+
+    def change_status(self, new_status='shortlisted'):
+        self.client.force_authenticate(user=self.employer_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/jobs/applications/%d/status/' % self.application.id, {'status': new_status}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_routing(self):
+        self.change_status()
+        Interview.objects.create(application=self.application, interviewer=self.employer, schedule=timezone.now())
+        created, updated, interview = ChangeEvent.objects.filter(entity__in=['application', 'interview']).order_by('id')
+        self.assertIsNone(notification(created))
+        channels, message = notification(updated)
+        self.assertEqual(channels, {'seeker:%d' % self.seeker.id, 'company:%d' % self.company.id})
+        self.assertEqual(message, {
+            'type': 'application.status', 'application': self.application.id, 'job': self.job.id,
+            'status': 'shortlisted', 'id': updated.id})
+        self.assertEqual(notification(interview)[1]['type'], 'interview.created')
+        self.assertEqual(channels_for(resolve_principal(self.seeker_user.id)), {'seeker:%d' % self.seeker.id})
+
+    def test_live_and_catch_up(self):
+        start = ChangeEvent.objects.latest('id').id
+        principal = resolve_principal(self.seeker_user.id)
+
+        async def listen():
+            messages = alisten(principal, keepalive=5)
+            pending = asyncio.ensure_future(messages.__anext__())
+            # Let it subscribe
+            await asyncio.sleep(0)
+            await sync_to_async(self.change_status)()
+            message = await asyncio.wait_for(pending, 5)
+            await messages.aclose()
+            return message
+
+        message = async_to_sync(listen)()
+        self.assertEqual((message['type'], message['status']), ('application.status', 'shortlisted'))
+
+        # A reconnecting client is caught up from the outbox, for its own channels only
+        messages, cursor = async_to_sync(acatch_up)({'seeker:%d' % self.seeker.id}, start)
+        self.assertEqual(messages, [message])
+        self.assertEqual(cursor, message['id'])
+        self.assertEqual(async_to_sync(acatch_up)({'company:%d' % self.other_company.id}, start)[0], [])
+
+    @override_settings(OUTBOX_STREAM_DURATION=0)
+    def test_stream(self):
+        start = ChangeEvent.objects.latest('id').id
+        self.change_status('hired')
+        token = issue_tokens(self.seeker_user)['access']
+        request = APIRequestFactory().get('/jobs/notifications/stream/', {'token': token}, HTTP_ACCEPT='text/event-stream', HTTP_LAST_EVENT_ID=str(start))
+        response = views.notification_stream(request)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join(response).decode()
+        self.assertIn('event: application.status\ndata: ', body)
+        self.assertIn('"status": "hired"', body)
+
+        request = APIRequestFactory().get('/jobs/notifications/stream/', HTTP_LAST_EVENT_ID=str(start))
+        force_authenticate(request, user=self.other_user)
+        body = b''.join(views.notification_stream(request)).decode()
+        self.assertNotIn('application.status', body)
+        # Still moved past the event
+        self.assertIn('id: %d\n\n' % ChangeEvent.objects.latest('id').id, body)
+
+        request = APIRequestFactory().get('/jobs/notifications/stream/', {'token': 'bad'})
+        self.assertEqual(views.notification_stream(request).status_code, status.HTTP_403_FORBIDDEN)
+
+    def websocket(self, query_string):
+        sent = []
+        incoming = [{'type': 'websocket.connect'}, {'type': 'websocket.disconnect'}]
+
+        async def receive():
+            return incoming.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'websocket', 'path': '/api/notifications/ws/', 'query_string': query_string.encode()}
+        async_to_sync(websocket_application)(scope, receive, send)
+        return [message['type'] for message in sent], sent
+
+    def test_websocket(self):
+        types, sent = self.websocket('token=bad')
+        self.assertEqual(types, ['websocket.close'])
+        self.assertEqual(sent[0]['code'], 4403)
+
+        types, _ = self.websocket('token=%s' % issue_tokens(self.seeker_user)['access'])
+        self.assertEqual(types, ['websocket.accept'])
@@ -1,10 +1,29 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# The read endpoints have native async versions for ASGI deployments
+read_views = async_views if getattr(settings, 'JOBS_ASYNC_VIEWS', False) else views
 
 urlpatterns = [
-    path('jobs/', views.jobs, name='jobs'),
-    path('jobs/<int:pk>/', views.job_detail, name='job_detail'),
-    path('applications/', views.applications, name='applications'),
+    path('jobs/', read_views.jobs, name='jobs'),
+    path('jobs/<int:pk>/', read_views.job_detail, name='job_detail'),
+    path('jobs/<int:pk>/candidates/', views.job_candidates, name='job_candidates'),
+    path('jobs/import/', views.job_import, name='job_import'),
+    path('jobs/recommended/', views.recommended_jobs, name='recommended_jobs'),
+    path('jobs/cache-stats/', views.job_cache_stats, name='job_cache_stats'),
+    path('applications/', read_views.applications, name='applications'),
+    path('applications/batch/', views.application_batch, name='application_batch'),
+    path('applications/export/', read_views.application_export, name='application_export'),
+    path('applications/stats/', views.application_stats, name='application_stats'),
+    path('applications/status/', views.bulk_update_application_status, name='bulk_update_application_status'),
     path('applications/<int:pk>/status/', views.update_application_status, name='update_application_status'),
-    path('interviews/', views.interviews, name='interviews'),
+    path('interviews/', read_views.interviews, name='interviews'),
+    path('interviews/free-slots/', views.interview_free_slots, name='interview_free_slots'),
+    path('interviews/calendar.ics', views.interview_calendar, name='interview_calendar'),
+    path('interviews/calendar-url/', views.interview_calendar_url, name='interview_calendar_url'),
+    path('interviews/sync/', views.interview_sync, name='interview_sync'),
+    path('events/', views.change_events, name='change_events'),
+    path('events/stream/', read_views.change_event_stream, name='change_event_stream'),
+    path('notifications/stream/', read_views.notification_stream, name='notification_stream'),
 ]
\ No newline at end of file
@@ -1,57 +1,151 @@
+from datetime import timedelta
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
-from django.db.models import Q
-from .models import Job, Application, Interview
-from .serializers import JobSerializer, JobCreateSerializer, ApplicationSerializer, ApplicationCreateSerializer, InterviewSerializer
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from .models import Job, Application, Interview, CompanyApplicationCounts
+from .serializers import JobSerializer, JobCreateSerializer, ApplicationSerializer, ApplicationCreateSerializer, ApplicationBatchSerializer, ApplicationStatusBulkSerializer, InterviewSerializer, InterviewCreateSerializer, FreeSlotsQuerySerializer, ChangeEventQuerySerializer, JobListSerializer, ApplicationListSerializer, InterviewListSerializer
+from .cache import cache_stats, cache_response, get_cached_response, job_detail_cache_key, job_list_cache_key
+from .conditional import JOBS, application_collections, applications_changed, job_validators, list_validators, not_modified, set_validators
+from .counters import COUNT_FIELDS, applications_created, counts_dict, status_changed
+from .exporter import EXPORT_FORMATS, stream_applications
+from .fastpath import UnsupportedField, compile_plan, fast_serialization_enabled
+from .ical import InvalidSyncToken, feed_etag, feed_principal, feed_rows, feed_token, interview_changes, iter_calendar, party_filters, read_sync_token, sync_token
+from .importer import ImportFormatError, detect_format, import_jobs
+from .matching import engine
+from .notifications import channels_for, principal_for_token, stream_notifications
+from .outbox import event_dict, read_events, record_applications, stream_events
+from .pagination import KeysetPagination, RankPagination
+from .renderers import EventStreamRenderer, FastJSONRenderer
+from .scheduling import SchedulingConflict, find_free_slots, schedule_interview
+from .search import search_jobs
+from .skills import filter_by_seeker_skills, filter_by_skills
+from accounts.authentication import ANONYMOUS, get_principal
 from accounts.models import EmployerProfile, JobSeekerProfile
 
+def _list_options(request):
+    # fields=a,b limits list output; expand=x,y.z nests relations (expand= with
+    # no value returns bare ids, omitting it uses the serializer's defaults).
+    options = {}
+    for param in ('fields', 'expand'):
+        if param in request.query_params:
+            options[param] = [name.strip() for name in request.query_params[param].split(',') if name.strip()]
+    return options
+
+def _list_query(request, queryset, serializer_class, paginator):
+    """Return the queryset to paginate and a callable rendering one page of it."""
+    options = _list_options(request)
+    ordering = paginator.ordering_field
+    if fast_serialization_enabled():
+        try:
+            plan = compile_plan(serializer_class, **options)
+        except UnsupportedField:
+            plan = None
+        if plan is not None:
+            # The pagination key, whether or not fields= asked for it; only
+            # the plan's own fields are rendered
+            return plan.values(queryset, extra=[ordering, 'id']), plan.render
+
+    model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+    required = [ordering] if ordering in model_fields else []
+    queryset = serializer_class.optimize_queryset(queryset, required=required, **options)
+    return queryset, lambda page: serializer_class(page, many=True, **options).data
+
+def _paginated_list(request, queryset, serializer_class, paginator):
+    queryset, render = _list_query(request, queryset, serializer_class, paginator)
+    page = paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_response(render(page))
+
+def _role_scoped(principal, queryset, seeker_field, company_field):
+    """
+    Restrict ``queryset`` to the caller's rows: their own for job seekers, their
+    company's for employers. Returns (queryset, None) or (None, error response).
+    """
+    if principal.role == 'job_seeker':
+        if principal.seeker_id is None:
+            return None, Response([])
+        return queryset.filter(**{seeker_field: principal.seeker_id}), None
+    if principal.role == 'employer':
+        if principal.employer_id is None:
+            return None, Response([])
+        return queryset.filter(**{company_field: principal.company_id}), None
+    return None, Response({'error': 'Invalid role'}, status=status.HTTP_403_FORBIDDEN)
+
+def _job_list_query(request):
+    queryset = Job.objects.filter(is_active=True)
+    # Filtering
+    location = request.query_params.get('location')
+    job_type = request.query_params.get('job_type')
+    experience_level = request.query_params.get('experience_level')
+    skills = request.query_params.get('skills')  # comma separated
+    q = request.query_params.get('q', '').strip()
+
+    if location:
+        queryset = queryset.filter(location__icontains=location)
+    if job_type:
+        queryset = queryset.filter(job_type=job_type)
+    if experience_level:
+        queryset = queryset.filter(experience_level=experience_level)
+    if skills:
+        match = request.query_params.get('skills_match', 'all')
+        queryset = filter_by_skills(queryset, skills, match=match)
+
+    if q:
+        return search_jobs(queryset, q), RankPagination()
+    return queryset, KeysetPagination('posted_at')
+
 @api_view(['GET', 'POST'])
 def jobs(request):
     if request.method == 'GET':
-        queryset = Job.objects.filter(is_active=True)
-        # Filtering
-        location = request.query_params.get('location')
-        job_type = request.query_params.get('job_type')
-        experience_level = request.query_params.get('experience_level')
-        skills = request.query_params.get('skills')  # comma separated
-
-        if location:
-            queryset = queryset.filter(location__icontains=location)
-        if job_type:
-            queryset = queryset.filter(job_type=job_type)
-        if experience_level:
-            queryset = queryset.filter(experience_level=experience_level)
-        if skills:
-            skill_list = skills.split(',')
-            for skill in skill_list:
-                queryset = queryset.filter(skills_required__icontains=skill.strip())
-
-        serializer = JobSerializer(queryset, many=True)
-        return Response(serializer.data)
+        cache_key = job_list_cache_key(request)
+        cached = get_cached_response(cache_key, request)
+        if cached is not None:
+            return cached
+
+        validators = list_validators(request, [JOBS])
+        response = not_modified(request, *validators)
+        if response is not None:
+            return response
+        queryset, paginator = _job_list_query(request)
+        return cache_response(cache_key, _paginated_list(request, queryset, JobListSerializer, paginator), validators)
     elif request.method == 'POST':
         # Only employers can post jobs
-        try:
-            employer = EmployerProfile.objects.get(user=request.user)
-        except EmployerProfile.DoesNotExist:
+        principal = get_principal(request)
+        if principal.employer_id is None:
             return Response({'error': 'Only employers can post jobs'}, status=status.HTTP_403_FORBIDDEN)
 
         serializer = JobCreateSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(posted_by=request.user, company=employer.company)
+            serializer.save(posted_by=request.user, company_id=principal.company_id)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET', 'PUT', 'DELETE'])
 def job_detail(request, pk):
+    if request.method == 'GET':
+        cache_key = job_detail_cache_key(pk)
+        cached = get_cached_response(cache_key, request)
+        if cached is not None:
+            return cached
+
     try:
-        job = Job.objects.get(pk=pk)
+        job = Job.objects.select_related('company').get(pk=pk)
     except Job.DoesNotExist:
         return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == 'GET':
+        validators = job_validators(job)
+        response = not_modified(request, *validators)
+        if response is not None:
+            return response
         serializer = JobSerializer(job)
-        return Response(serializer.data)
+        return cache_response(cache_key, Response(serializer.data), validators)
     elif request.method in ['PUT', 'DELETE']:
         # Only the poster can edit/delete
         if job.posted_by != request.user:
@@ -65,100 +159,473 @@ def job_detail(request, pk):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         elif request.method == 'DELETE':
             job.is_active = False
-            job.save()
+            job.save(update_fields=['is_active', 'updated_at'])
             return Response({'message': 'Job deactivated'})
 
+@api_view(['POST'])
+def job_import(request):
+    principal = get_principal(request)
+    if principal.employer_id is None:
+        return Response({'error': 'Only employers can post jobs'}, status=status.HTTP_403_FORBIDDEN)
+
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        fmt = detect_format(upload.name, request.data.get('format'))
+    except ImportFormatError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    report = import_jobs(upload.file, fmt, company_id=principal.company_id, posted_by=request.user)
+    response_status = status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST
+    return Response(report, status=response_status)
+
+def _top_k(request, default=20, maximum=100):
+    try:
+        k = int(request.query_params.get('k', default))
+    except ValueError:
+        k = default
+    return min(max(k, 1), maximum)
+
+@api_view(['GET'])
+def recommended_jobs(request):
+    seeker = request.profile
+    if not isinstance(seeker, JobSeekerProfile):
+        return Response({'error': 'Job seeker profile required'}, status=status.HTTP_403_FORBIDDEN)
+
+    ranked = engine.recommend_jobs(seeker.matching_skills, seeker.experience_level, k=_top_k(request))
+    jobs_by_id = Job.objects.select_related('company').filter(is_active=True).in_bulk([job_id for job_id, _ in ranked])
+    for job_id, _ in ranked:
+        if job_id not in jobs_by_id:
+            # Deleted or closed by another process since the matrix saw it
+            engine.remove_job(job_id)
+    results = [
+        {'score': round(score, 4), 'job': JobSerializer(jobs_by_id[job_id]).data}
+        for job_id, score in ranked if job_id in jobs_by_id
+    ]
+    return Response({'results': results})
+
+@api_view(['GET'])
+def job_candidates(request, pk):
+    try:
+        job = Job.objects.get(pk=pk)
+    except Job.DoesNotExist:
+        return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+    if get_principal(request).company_id != job.company_id:
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+    ranked = engine.rank_candidates(job.pk, k=_top_k(request))
+    seekers_by_id = JobSeekerProfile.objects.select_related('user').in_bulk([seeker_id for seeker_id, _ in ranked])
+    for seeker_id, _ in ranked:
+        if seeker_id not in seekers_by_id:
+            # Deleted by another process since the matrix saw it
+            engine.remove_seeker(seeker_id)
+    results = [
+        {
+            'score': round(score, 4),
+            'seeker': seeker_id,
+            'name': str(seekers_by_id[seeker_id]),
+            'experience_level': seekers_by_id[seeker_id].experience_level,
+            'skills': seekers_by_id[seeker_id].skills,
+        }
+        for seeker_id, score in ranked if seeker_id in seekers_by_id
+    ]
+    return Response({'results': results})
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def job_cache_stats(request):
+    return Response(cache_stats())
+
+def _filter_applicants(request, applications):
+    # skills=a,b narrows an employer's applicants to those with the skills
+    # (SeekerSkill: listed and resume skills); skills_match=any as on jobs
+    skills = request.query_params.get('skills')
+    if skills:
+        applications = filter_by_seeker_skills(applications, skills, match=request.query_params.get('skills_match', 'all'))
+    return applications
+
 @api_view(['GET', 'POST'])
 def applications(request):
     if request.method == 'GET':
         # Job seekers see their applications, employers see applications for their jobs
-        if request.user.role == 'job_seeker':
-            try:
-                seeker = JobSeekerProfile.objects.get(user=request.user)
-                applications = Application.objects.filter(seeker=seeker)
-            except JobSeekerProfile.DoesNotExist:
-                return Response([])
-        elif request.user.role == 'employer':
-            try:
-                employer = EmployerProfile.objects.get(user=request.user)
-                applications = Application.objects.filter(job__company=employer.company)
-            except EmployerProfile.DoesNotExist:
-                return Response([])
-        else:
-            return Response({'error': 'Invalid role'}, status=status.HTTP_403_FORBIDDEN)
-
-        serializer = ApplicationSerializer(applications, many=True)
-        return Response(serializer.data)
+        principal = get_principal(request)
+        applications, error = _role_scoped(principal, Application.objects.all(), 'seeker_id', 'job__company_id')
+        if error is not None:
+            return error
+        applications = _filter_applicants(request, applications)
+        validators = list_validators(request, application_collections(principal))
+        response = not_modified(request, *validators, cache_control='private, no-cache')
+        if response is not None:
+            return response
+        response = _paginated_list(request, applications, ApplicationListSerializer, KeysetPagination('applied_date'))
+        return set_validators(response, *validators, cache_control='private, no-cache')
     elif request.method == 'POST':
         # Only job seekers can apply
-        try:
-            seeker = JobSeekerProfile.objects.get(user=request.user)
-        except JobSeekerProfile.DoesNotExist:
+        principal = get_principal(request)
+        if principal.seeker_id is None:
             return Response({'error': 'Job seeker profile required'}, status=status.HTTP_403_FORBIDDEN)
 
         serializer = ApplicationCreateSerializer(data=request.data)
         if serializer.is_valid():
-            # Check if already applied
-            if Application.objects.filter(job=serializer.validated_data['job'], seeker=seeker).exists():
+            # The unique (job, seeker) constraint rejects duplicates, including
+            # concurrent double submits, without a separate existence check.
+            try:
+                with transaction.atomic():
+                    serializer.save(seeker_id=principal.seeker_id)
+            except IntegrityError:
                 return Response({'error': 'Already applied'}, status=status.HTTP_400_BAD_REQUEST)
-            serializer.save(seeker=seeker)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+def _create_applications(seeker_id, job_ids):
+    """Insert applications for ``job_ids``; returns the applications actually inserted."""
+    try:
+        with transaction.atomic():
+            return Application.objects.bulk_create([Application(job_id=job_id, seeker_id=seeker_id) for job_id in job_ids])
+    except IntegrityError:
+        # A concurrent submit got some of them first; insert row by row
+        inserted = []
+        for job_id in job_ids:
+            try:
+                with transaction.atomic():
+                    inserted += Application.objects.bulk_create([Application(job_id=job_id, seeker_id=seeker_id)])
+            except IntegrityError:
+                continue
+        return inserted
+
+@api_view(['POST'])
+def application_batch(request):
+    seeker_id = get_principal(request).seeker_id
+    if seeker_id is None:
+        return Response({'error': 'Job seeker profile required'}, status=status.HTTP_403_FORBIDDEN)
+
+    serializer = ApplicationBatchSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    requested = list(dict.fromkeys(serializer.validated_data['jobs']))
+
+    # One query resolves which jobs exist, are open and were already applied to.
+    applied = Application.objects.filter(job=OuterRef('pk'), seeker_id=seeker_id)
+    open_jobs = {
+        job_id: (already_applied, company_id)
+        for job_id, already_applied, company_id in Job.objects.filter(id__in=requested, is_active=True)
+        .annotate(applied=Exists(applied))
+        .values_list('id', 'applied', 'company_id')
+    }
+    new_jobs = [job_id for job_id in requested if job_id in open_jobs and not open_jobs[job_id][0]]
+    # Single multi-row insert. bulk_create skips post_save, so the counters,
+    # list versions and change events are written here, in the same
+    # transaction.
+    with transaction.atomic():
+        inserted = [
+            (application, open_jobs[application.job_id][1])
+            for application in _create_applications(seeker_id, new_jobs)
+        ]
+        applications_created((application.job_id, company_id, application.status) for application, company_id in inserted)
+        applications_changed((seeker_id, company_id) for _, company_id in inserted)
+        record_applications([
+            (application.pk, application.job_id, seeker_id, company_id, application.status)
+            for application, company_id in inserted
+        ], 'created')
+    # Jobs a concurrent submit got to first count as already applied
+    created = {application.job_id for application, _ in inserted}
+    return Response({
+        'applied': [job_id for job_id in new_jobs if job_id in created],
+        'already_applied': [job_id for job_id in requested if job_id in open_jobs and job_id not in created],
+        'invalid': [job_id for job_id in requested if job_id not in open_jobs],
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+@api_view(['GET'])
+def application_export(request):
+    applications, fmt, error = _export_query(request, get_principal(request))
+    if error is not None:
+        return error
+    return _export_response(stream_applications(applications, fmt), fmt)
+
+def _export_query(request, principal):
+    """(applications, format, None) to export, or (None, None, error response)."""
+    company_id = principal.company_id
+    if company_id is None:
+        return None, None, Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+    # 'format' is taken by DRF's content negotiation
+    fmt = request.query_params.get('file_format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return None, None, Response({'error': 'Unsupported format'}, status=status.HTTP_400_BAD_REQUEST)
+
+    applications = Application.objects.filter(job__company_id=company_id)
+    job_id = request.query_params.get('job')
+    if job_id:
+        applications = applications.filter(job_id=job_id)
+    return applications, fmt, None
+
+def _export_response(content, fmt):
+    response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[fmt])
+    response['Content-Disposition'] = 'attachment; filename="applications.%s"' % fmt
+    return response
+
+@api_view(['GET'])
+def application_stats(request):
+    """Application counts by status for the employer's company and each of its jobs."""
+    company_id = get_principal(request).company_id
+    if company_id is None:
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+    company = CompanyApplicationCounts.objects.filter(company_id=company_id).values(*COUNT_FIELDS).first() or {}
+    jobs = Job.objects.filter(company_id=company_id)
+    job_id = request.query_params.get('job')
+    if job_id:
+        jobs = jobs.filter(pk=job_id)
+    rows = jobs.order_by('-posted_at', '-id').values(
+        'id', 'title', 'is_active', *['application_counts__' + field for field in COUNT_FIELDS])
+    return Response({
+        'company': counts_dict(company),
+        'jobs': [
+            {'id': row['id'], 'title': row['title'], 'is_active': row['is_active'],
+             'counts': counts_dict(row, 'application_counts__')}
+            for row in rows
+        ],
+    })
+
 @api_view(['PUT'])
 def update_application_status(request, pk):
     try:
-        application = Application.objects.get(pk=pk)
+        application = ApplicationSerializer.setup_eager_loading(Application.objects.all()).get(pk=pk)
     except Application.DoesNotExist:
         return Response({'error': 'Application not found'}, status=status.HTTP_404_NOT_FOUND)
 
     # Only employer of the job can update
-    try:
-        employer = EmployerProfile.objects.get(user=request.user, company=application.job.company)
-    except EmployerProfile.DoesNotExist:
+    if get_principal(request).company_id != application.job.company_id:
         return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
 
     new_status = request.data.get('status')
     if new_status in dict(Application.STATUS_CHOICES):
-        application.status = new_status
-        application.save()
+        with transaction.atomic():
+            # Locked so a concurrent change cannot be counted twice
+            old_status = Application.objects.select_for_update().values_list('status', flat=True).get(pk=pk)
+            application.status = new_status
+            # Re-sending the current status is a no-op: no save, so no
+            # change event and no list version bump
+            if old_status != new_status:
+                application.save(update_fields=['status'])
+                status_changed([(application.job_id, application.job.company_id, old_status)], new_status)
         serializer = ApplicationSerializer(application)
         return Response(serializer.data)
     return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['PUT'])
+def bulk_update_application_status(request):
+    company_id = get_principal(request).company_id
+    if company_id is None:
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+    serializer = ApplicationStatusBulkSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    ids = list(dict.fromkeys(serializer.validated_data['ids']))
+    new_status = serializer.validated_data['status']
+
+    # Ownership of every id is checked in one query, which also locks the
+    # rows and reads their current status for the counters; ids outside
+    # the employer's company are reported as skipped, not revealed.
+    with transaction.atomic():
+        rows = list(
+            Application.objects.select_for_update(of=('self',))
+            .filter(id__in=ids, job__company_id=company_id)
+            .values_list('id', 'job_id', 'seeker_id', 'status')
+        )
+        owned = {pk for pk, _, _, _ in rows}
+        changed = [pk for pk, _, _, old_status in rows if old_status != new_status]
+        if changed:
+            Application.objects.filter(id__in=changed).update(status=new_status)
+            status_changed([(job_id, company_id, old_status) for _, job_id, _, old_status in rows], new_status)
+            moved = [(pk, job_id, seeker_id) for pk, job_id, seeker_id, old_status in rows if old_status != new_status]
+            applications_changed((seeker_id, company_id) for _, _, seeker_id in moved)
+            record_applications(
+                [(pk, job_id, seeker_id, company_id, new_status) for pk, job_id, seeker_id in moved], 'updated')
+    return Response({
+        'status': new_status,
+        'updated': [pk for pk in ids if pk in owned],
+        'skipped': [pk for pk in ids if pk not in owned],
+    })
+
 @api_view(['GET', 'POST'])
 def interviews(request):
     if request.method == 'GET':
         # Similar to applications
-        if request.user.role == 'job_seeker':
-            try:
-                seeker = JobSeekerProfile.objects.get(user=request.user)
-                interviews = Interview.objects.filter(application__seeker=seeker)
-            except JobSeekerProfile.DoesNotExist:
-                return Response([])
-        elif request.user.role == 'employer':
-            try:
-                employer = EmployerProfile.objects.get(user=request.user)
-                interviews = Interview.objects.filter(application__job__company=employer.company)
-            except EmployerProfile.DoesNotExist:
-                return Response([])
-        else:
-            return Response({'error': 'Invalid role'}, status=status.HTTP_403_FORBIDDEN)
-
-        serializer = InterviewSerializer(interviews, many=True)
-        return Response(serializer.data)
+        interviews, error = _role_scoped(
+            get_principal(request), Interview.objects.all(), 'seeker_id', 'application__job__company_id')
+        if error is not None:
+            return error
+        return _paginated_list(request, interviews, InterviewListSerializer, KeysetPagination('schedule'))
     elif request.method == 'POST':
         # Only employers can schedule interviews
-        try:
-            employer = EmployerProfile.objects.get(user=request.user)
-        except EmployerProfile.DoesNotExist:
+        principal = get_principal(request)
+        if principal.employer_id is None:
             return Response({'error': 'Only employers can schedule interviews'}, status=status.HTTP_403_FORBIDDEN)
 
-        serializer = InterviewSerializer(data=request.data)
+        serializer = InterviewCreateSerializer(data=request.data)
         if serializer.is_valid():
-            # Check if application belongs to employer's company
-            if serializer.validated_data['application'].job.company != employer.company:
+            data = serializer.validated_data
+            # Check if application belongs to employer's company, and the
+            # interviewer (default: the caller) works there
+            interviewer = data.get('interviewer')
+            if data['application'].job.company_id != principal.company_id or (
+                    interviewer is not None and interviewer.company_id != principal.company_id):
                 return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
-            serializer.save(interviewer=employer)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            try:
+                interview = schedule_interview(
+                    data['application'], interviewer.pk if interviewer else principal.employer_id,
+                    data['schedule'], timedelta(minutes=data['duration']), data.get('feedback', ''))
+            except SchedulingConflict as exc:
+                return Response({'error': 'Scheduling conflict', 'conflicts': exc.conflicts}, status=status.HTTP_409_CONFLICT)
+            return Response(InterviewSerializer(interview).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+def interview_free_slots(request):
+    """
+    First ``count`` slots of ``duration`` minutes in [start, end) when all
+    ``interviewers`` (default: the caller) and, given ``application``, the
+    candidate are free.
+    """
+    principal = get_principal(request)
+    if principal.employer_id is None:
+        return Response({'error': 'Only employers can schedule interviews'}, status=status.HTTP_403_FORBIDDEN)
+    serializer = FreeSlotsQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    params = serializer.validated_data
+
+    interviewer_ids = list(dict.fromkeys(params.get('interviewers') or [principal.employer_id]))
+    if EmployerProfile.objects.filter(pk__in=interviewer_ids, company_id=principal.company_id).count() != len(interviewer_ids):
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+    seeker_id = None
+    if 'application' in params:
+        seeker_id = Application.objects.filter(
+            pk=params['application'], job__company_id=principal.company_id).values_list('seeker_id', flat=True).first()
+        if seeker_id is None:
+            return Response({'error': 'Application not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    slots = find_free_slots(
+        interviewer_ids, params['start'], params['end'], timedelta(minutes=params['duration']),
+        count=params['count'], step=timedelta(minutes=params['step']), seeker_id=seeker_id)
+    return Response({'slots': [{'start': slot_start, 'end': slot_end} for slot_start, slot_end in slots]})
+
+@api_view(['GET'])
+def interview_calendar_url(request):
+    """Private iCalendar feed URL for the caller, for calendar apps that cannot send credentials."""
+    principal = get_principal(request)
+    if party_filters(principal) is None:
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+    url = request.build_absolute_uri(reverse('interview_calendar'))
+    return Response({'url': '%s?token=%s' % (url, feed_token(principal.user))})
+
+@api_view(['GET'])
+def interview_calendar(request):
+    """
+    The caller's interviews as an iCalendar feed, authenticated normally or
+    by the ``token`` from interview_calendar_url. An unchanged feed is
+    answered 304 from If-None-Match after a single aggregate query.
+    """
+    token = request.query_params.get('token')
+    principal = get_principal(request) if token is None else feed_principal(token) or ANONYMOUS
+    filters = party_filters(principal)
+    if filters is None:
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+    now = timezone.now()
+    etag = feed_etag(filters[0], now.date())
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        return not_modified
+    body = ''.join(iter_calendar(feed_rows(filters[0], now), 'Interviews - %s' % principal.user.username))
+    response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+@api_view(['GET'])
+def interview_sync(request):
+    """
+    Delta sync of the caller's interviews. Without ``sync_token`` every
+    interview is returned; with one, only those changed or deleted since
+    it was issued (plus a short overlap, so clients should upsert by id).
+    A token that is too old or invalid gets 410: start over without one.
+    """
+    principal = get_principal(request)
+    filters = party_filters(principal)
+    if filters is None:
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+    since = None
+    if request.query_params.get('sync_token'):
+        try:
+            since = read_sync_token(principal.user, request.query_params['sync_token'])
+        except InvalidSyncToken as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_410_GONE)
+    changed, deleted, moment = interview_changes(filters, since)
+    return Response({'changed': changed, 'deleted': deleted, 'sync_token': sync_token(principal.user, moment)})
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def change_events(request):
+    """
+    A batch of change events after the ``after`` cursor, oldest first.
+    Consumers keep the returned ``cursor`` and pass it as the next ``after``.
+    """
+    params = ChangeEventQuerySerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    events, cursor = read_events(params.validated_data['after'], params.validated_data['limit'],
+                                 params.validated_data.get('entity'))
+    return Response({'events': [event_dict(event) for event in events], 'cursor': cursor})
+
+def _event_stream_params(request):
+    # A reconnecting EventSource resumes from its Last-Event-ID
+    data = request.query_params.copy()
+    if request.META.get('HTTP_LAST_EVENT_ID'):
+        data['after'] = request.META['HTTP_LAST_EVENT_ID']
+    return ChangeEventQuerySerializer(data=data)
+
+def _event_stream_response(content):
+    response = StreamingHttpResponse(content, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stops nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@renderer_classes([FastJSONRenderer, EventStreamRenderer])
+def change_event_stream(request):
+    """Change events as Server-Sent Events, see jobs.outbox.stream_events."""
+    params = _event_stream_params(request)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    return _event_stream_response(stream_events(
+        params.validated_data['after'], params.validated_data.get('entity'), params.validated_data['limit']))
+
+def _last_event_id(request):
+    value = request.META.get('HTTP_LAST_EVENT_ID') or request.query_params.get('after')
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+@api_view(['GET'])
+@renderer_classes([FastJSONRenderer, EventStreamRenderer])
+def notification_stream(request):
+    """
+    The caller's application status changes and new interviews as
+    Server-Sent Events (jobs.notifications). EventSource cannot send an
+    Authorization header, so an access token may also come as ``token``.
+    """
+    principal = get_principal(request)
+    if principal is ANONYMOUS and request.query_params.get('token'):
+        principal = principal_for_token(request.query_params['token']) or ANONYMOUS
+    if not channels_for(principal):
+        return Response({'error': 'Job seeker or employer profile required'}, status=status.HTTP_403_FORBIDDEN)
+    return _event_stream_response(stream_notifications(principal, _last_event_id(request)))
+